@@ -0,0 +1,43 @@
+"""per-organization deal stats rollup"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0004"
+down_revision = "20261018_0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "deal_stats",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("organization_id", sa.Integer(), sa.ForeignKey("organizations.id"), nullable=False),
+        sa.Column(
+            "status",
+            postgresql.ENUM("new", "in_progress", "won", "lost", name="dealstatus", create_type=False),
+            nullable=False,
+        ),
+        sa.Column(
+            "stage",
+            postgresql.ENUM("qualification", "proposal", "negotiation", "closed", name="dealstage", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("deal_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("amount_total", sa.DECIMAL(18, 2), nullable=False, server_default="0"),
+        sa.UniqueConstraint("organization_id", "status", "stage", name="uq_deal_stats_bucket"),
+    )
+    op.execute(
+        "INSERT INTO deal_stats (organization_id, status, stage, deal_count, amount_total) "
+        "SELECT organization_id, status, stage, count(*), coalesce(sum(amount), 0) "
+        "FROM deals GROUP BY organization_id, status, stage"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("deal_stats")
@@ -0,0 +1,30 @@
+"""hourly deal timeseries rollup"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0005"
+down_revision = "20261018_0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # заполняется командой mini-crm rebuild-deal-timeseries: закрытия восстанавливаются по активностям
+    op.create_table(
+        "deal_hourly_stats",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("organization_id", sa.Integer(), sa.ForeignKey("organizations.id"), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(), nullable=False),
+        sa.Column("created_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("won_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("lost_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.UniqueConstraint("organization_id", "bucket_start", name="uq_deal_hourly_stats_bucket"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("deal_hourly_stats")
@@ -0,0 +1,30 @@
+"""funnel velocity checkpoints"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0006"
+down_revision = "20261018_0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "funnel_checkpoints",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "organization_id", sa.Integer(), sa.ForeignKey("organizations.id"), nullable=False, unique=True
+        ),
+        sa.Column("last_activity_id", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_deal_id", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("state", sa.JSON(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("funnel_checkpoints")
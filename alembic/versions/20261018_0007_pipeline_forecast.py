@@ -0,0 +1,53 @@
+"""expected close date, stage probabilities and pipeline totals"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0007"
+down_revision = "20261018_0006"
+branch_labels = None
+depends_on = None
+
+STAGES = ("qualification", "proposal", "negotiation", "closed")
+
+
+def upgrade() -> None:
+    op.add_column("deals", sa.Column("expected_close_date", sa.Date(), nullable=True))
+    op.create_table(
+        "stage_probabilities",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("organization_id", sa.Integer(), sa.ForeignKey("organizations.id"), nullable=False),
+        sa.Column("stage", postgresql.ENUM(*STAGES, name="dealstage", create_type=False), nullable=False),
+        sa.Column("probability", sa.DECIMAL(5, 4), nullable=False),
+        sa.UniqueConstraint("organization_id", "stage", name="uq_stage_probability"),
+    )
+    op.create_table(
+        "pipeline_totals",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("organization_id", sa.Integer(), sa.ForeignKey("organizations.id"), nullable=False),
+        sa.Column("owner_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("stage", postgresql.ENUM(*STAGES, name="dealstage", create_type=False), nullable=False),
+        sa.Column("close_month", sa.Date(), nullable=False),
+        sa.Column("deal_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("amount_total", sa.DECIMAL(18, 2), nullable=False, server_default="0"),
+        sa.UniqueConstraint(
+            "organization_id", "owner_id", "stage", "close_month", name="uq_pipeline_totals_bucket"
+        ),
+    )
+    # у существующих сделок даты закрытия нет, все они попадают в корзину без месяца
+    unscheduled = "DATE '1970-01-01'" if op.get_bind().dialect.name == "postgresql" else "'1970-01-01'"
+    op.execute(
+        "INSERT INTO pipeline_totals (organization_id, owner_id, stage, close_month, deal_count, amount_total) "
+        f"SELECT organization_id, owner_id, stage, {unscheduled}, count(*), coalesce(sum(amount), 0) "
+        "FROM deals WHERE status IN ('new', 'in_progress') GROUP BY organization_id, owner_id, stage"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("pipeline_totals")
+    op.drop_table("stage_probabilities")
+    op.drop_column("deals", "expected_close_date")
@@ -0,0 +1,31 @@
+"""monthly analytics sketches"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0008"
+down_revision = "20261018_0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # заполняется командой mini-crm rebuild-sketches: скетчи строятся в Python
+    op.create_table(
+        "analytics_sketches",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("organization_id", sa.Integer(), sa.ForeignKey("organizations.id"), nullable=False),
+        sa.Column("kind", sa.Enum("active_contacts", "deal_amounts", name="sketchkind"), nullable=False),
+        sa.Column("bucket_start", sa.Date(), nullable=False),
+        sa.Column("payload", sa.LargeBinary(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.UniqueConstraint("organization_id", "kind", "bucket_start", name="uq_analytics_sketches_bucket"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("analytics_sketches")
+    sa.Enum(name="sketchkind").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,58 @@
+"""background report jobs"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0009"
+down_revision = "20261018_0008"
+branch_labels = None
+depends_on = None
+
+ACTIVE = sa.text("status IN ('pending', 'running')")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "report_jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("organization_id", sa.Integer(), sa.ForeignKey("organizations.id"), nullable=False),
+        sa.Column("requested_by_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column(
+            "kind",
+            sa.Enum("cohort_conversion", "owner_leaderboard", "year_over_year", name="reportkind"),
+            nullable=False,
+        ),
+        sa.Column("params", sa.JSON(), nullable=False),
+        sa.Column("params_hash", sa.String(length=64), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum("pending", "running", "done", "failed", name="reportstatus"),
+            nullable=False,
+        ),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("error", sa.String(length=500), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.Column("expires_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index(
+        "uq_report_jobs_active",
+        "report_jobs",
+        ["organization_id", "kind", "params_hash"],
+        unique=True,
+        postgresql_where=ACTIVE,
+        sqlite_where=ACTIVE,
+    )
+    op.create_index("ix_report_jobs_expires_at", "report_jobs", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_report_jobs_expires_at", table_name="report_jobs")
+    op.drop_index("uq_report_jobs_active", table_name="report_jobs")
+    op.drop_table("report_jobs")
+    sa.Enum(name="reportstatus").drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name="reportkind").drop(op.get_bind(), checkfirst=True)
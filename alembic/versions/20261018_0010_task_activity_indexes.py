@@ -0,0 +1,31 @@
+"""composite indexes for task and activity lists"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0010"
+down_revision = "20261018_0009"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = (
+    ("ix_activities_deal_created", "activities", ["deal_id", "created_at", "id"]),
+    ("ix_tasks_deal_due_date", "tasks", ["deal_id", "due_date"]),
+    ("ix_tasks_owner_open_due_date", "tasks", ["owner_id", "is_done", "due_date"]),
+)
+
+
+def upgrade() -> None:
+    # CONCURRENTLY не блокирует запись в таблицы, но не может идти внутри транзакции
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
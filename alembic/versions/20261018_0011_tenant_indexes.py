@@ -0,0 +1,35 @@
+"""tenant composite indexes on deals and contacts"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0011"
+down_revision = "20261018_0010"
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ("ix_deals_org_created", "deals", ["organization_id", "created_at", "id"]),
+    ("ix_deals_org_status", "deals", ["organization_id", "status"]),
+    ("ix_deals_org_stage", "deals", ["organization_id", "stage"]),
+    ("ix_deals_org_owner", "deals", ["organization_id", "owner_id"]),
+    ("ix_deals_contact_id", "deals", ["contact_id"]),
+    ("ix_contacts_org_created", "contacts", ["organization_id", "created_at", "id"]),
+    ("ix_contacts_org_owner", "contacts", ["organization_id", "owner_id"]),
+)
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY не блокирует запись в таблицы, но не может идти внутри транзакции.
+    # Прерванная сборка оставляет невалидный индекс: его нужно удалить и повторить миграцию.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
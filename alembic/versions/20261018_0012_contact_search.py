@@ -0,0 +1,83 @@
+"""contact search: pg_trgm/tsvector on PostgreSQL, FTS5 on SQLite"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0012"
+down_revision = "20261018_0011"
+branch_labels = None
+depends_on = None
+
+TRIGRAM_INDEXES = (
+    ("ix_contacts_name_trgm", "name"),
+    ("ix_contacts_email_trgm", "email"),
+    ("ix_contacts_phone_trgm", "phone"),
+)
+
+SQLITE_FTS = (
+    "CREATE VIRTUAL TABLE contacts_fts USING fts5("
+    "name, email, phone, content='contacts', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER contacts_fts_insert AFTER INSERT ON contacts BEGIN"
+    " INSERT INTO contacts_fts(rowid, name, email, phone) VALUES (new.id, new.name, new.email, new.phone);"
+    " END",
+    "CREATE TRIGGER contacts_fts_delete AFTER DELETE ON contacts BEGIN"
+    " INSERT INTO contacts_fts(contacts_fts, rowid, name, email, phone)"
+    " VALUES ('delete', old.id, old.name, old.email, old.phone);"
+    " END",
+    "CREATE TRIGGER contacts_fts_update AFTER UPDATE ON contacts BEGIN"
+    " INSERT INTO contacts_fts(contacts_fts, rowid, name, email, phone)"
+    " VALUES ('delete', old.id, old.name, old.email, old.phone);"
+    " INSERT INTO contacts_fts(rowid, name, email, phone) VALUES (new.id, new.name, new.email, new.phone);"
+    " END",
+    # индексируем уже существующие контакты
+    "INSERT INTO contacts_fts(contacts_fts) VALUES ('rebuild')",
+)
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for statement in SQLITE_FTS:
+            op.execute(statement)
+        return
+    if dialect != "postgresql":
+        return
+    # расширение ставится один раз на базу и требует соответствующих прав у роли миграций
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        for name, column in TRIGRAM_INDEXES:
+            op.create_index(
+                name,
+                "contacts",
+                [column],
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        op.create_index(
+            "ix_contacts_search_document",
+            "contacts",
+            [sa.text("to_tsvector('simple', name)")],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for trigger in ("contacts_fts_update", "contacts_fts_delete", "contacts_fts_insert"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS contacts_fts")
+        return
+    if dialect != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        for name in ("ix_contacts_search_document", *(name for name, _ in reversed(TRIGRAM_INDEXES))):
+            op.drop_index(name, table_name="contacts", postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,47 @@
+"""append-only observations for monthly analytics sketches"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0013"
+down_revision = "20261018_0012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # гистограммы с корзиной 0 для значений меньше 1 пересобираются: mini-crm rebuild-sketches
+    op.create_table(
+        "analytics_sketch_observations",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "organization_id", sa.Integer(), sa.ForeignKey("organizations.id"), nullable=False
+        ),
+        sa.Column(
+            "kind",
+            postgresql.ENUM(
+                "active_contacts", "deal_amounts", name="sketchkind", create_type=False
+            ),
+            nullable=False,
+        ),
+        sa.Column("bucket_start", sa.Date(), nullable=False),
+        sa.Column("value", sa.Numeric(14, 2), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+    )
+    op.create_index(
+        "ix_analytics_sketch_observations_bucket",
+        "analytics_sketch_observations",
+        ["organization_id", "kind", "bucket_start"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_analytics_sketch_observations_bucket", table_name="analytics_sketch_observations"
+    )
+    op.drop_table("analytics_sketch_observations")
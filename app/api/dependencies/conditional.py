@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Awaitable, Callable
+
+from fastapi import Depends, Header, HTTPException, Request, Response, status
+
+from app.api.dependencies.auth import get_current_user, get_organization_context
+from app.dependencies.repositories import get_organization_revision_repository
+from app.models.organization_revision import RevisionEntity
+from app.repositories.organization_revision import OrganizationRevisionRepository
+from app.services.organizations import OrganizationContext
+from app.services.principals import CurrentUser
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    candidates = {value.strip() for value in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates or etag.removeprefix("W/") in candidates
+
+
+def conditional_get(
+    entity: RevisionEntity, *, time_bucket_seconds: int | None = None
+) -> Callable[..., Awaitable[None]]:
+    """ETag по счётчику изменений организации: при совпадении отвечаем 304 до запроса строк.
+
+    Валидатор — номер ревизии сущности в организации плюс хэш URL-параметров и
+    того, от чьего имени выполняется запрос. Для ответов, зависящих от текущего
+    времени, добавляется номер интервала ``time_bucket_seconds``.
+    """
+
+    async def dependency(
+        request: Request,
+        response: Response,
+        if_none_match: str | None = Header(None),
+        current_user: CurrentUser = Depends(get_current_user),
+        org_context: OrganizationContext = Depends(get_organization_context),
+        revision_repo: OrganizationRevisionRepository = Depends(get_organization_revision_repository),
+    ) -> None:
+        revision = await revision_repo.current(org_context.organization_id, entity)
+        variant = hashlib.sha1(  # noqa: S324 - не криптографическое использование
+            f"{request.url.path}?{request.url.query}|{current_user.id}|{org_context.role.value}".encode(),
+            usedforsecurity=False,
+        ).hexdigest()[:16]
+        bucket = f"-{int(time.time() // time_bucket_seconds)}" if time_bucket_seconds else ""
+        etag = f'W/"{entity.value}-{org_context.organization_id}-{revision}{bucket}-{variant}"'
+        if if_none_match and _matches(if_none_match, etag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+
+    return dependency
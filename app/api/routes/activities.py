@@ -1,14 +1,15 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 
 from app.api.dependencies.auth import get_current_user, get_organization_context
+from app.core.config import settings
 from app.dependencies.services import get_activity_service
 from app.models.activity import ActivityType
-from app.models.user import User
 from app.schemas.activity import ActivityCreate, ActivityOut
 from app.services.activities import ActivityService
 from app.services.organizations import OrganizationContext
+from app.services.principals import CurrentUser
 
 router = APIRouter()
 
@@ -16,20 +17,33 @@ router = APIRouter()
 @router.get("", response_model=list[ActivityOut])
 async def list_activities(
     deal_id: int,
+    response: Response,
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    limit: int = Query(settings.list_default_limit, ge=1, le=settings.list_max_limit),
+    cursor: str | None = Query(None, max_length=512),
     org_context: OrganizationContext = Depends(get_organization_context),
     service: ActivityService = Depends(get_activity_service),
 ) -> list[ActivityOut]:
     try:
-        return await service.list_for_deal(deal_id=deal_id, organization_id=org_context.organization.id)
+        result = await service.list_for_deal(
+            deal_id=deal_id,
+            organization_id=org_context.organization_id,
+            order=order,
+            limit=limit,
+            cursor=cursor,
+        )
     except Exception as exc:
         raise HTTPException(status_code=getattr(exc, "status_code", 400), detail=str(exc)) from exc
+    if result.next_cursor:
+        response.headers["X-Next-Cursor"] = result.next_cursor
+    return result.items
 
 
 @router.post("", response_model=ActivityOut, status_code=status.HTTP_201_CREATED)
 async def add_activity(
     deal_id: int,
     payload: ActivityCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     org_context: OrganizationContext = Depends(get_organization_context),
     service: ActivityService = Depends(get_activity_service),
 ) -> ActivityOut:
@@ -38,7 +52,7 @@ async def add_activity(
     try:
         return await service.add_comment(
             deal_id=deal_id,
-            organization_id=org_context.organization.id,
+            organization_id=org_context.organization_id,
             author_id=current_user.id,
             payload=payload.payload,
         )
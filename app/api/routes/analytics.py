@@ -1,37 +1,274 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date
 
-from app.api.dependencies.auth import get_organization_context
-from app.dependencies.services import get_analytics_service
-from app.schemas.analytics import DealsFunnelOut, DealsSummaryOut
-from app.services.analytics import AnalyticsService
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.api.dependencies.auth import get_current_user, get_organization_context
+from app.api.dependencies.conditional import conditional_get
+from app.core.config import settings
+from app.dependencies.services import (
+    get_amount_distribution_service,
+    get_analytics_service,
+    get_dashboard_service,
+    get_forecast_service,
+    get_funnel_velocity_service,
+    get_sketch_analytics_service,
+)
+from app.models.deal import DealStage, DealStatus
+from app.models.organization_revision import RevisionEntity
+from app.schemas.analytics import (
+    ActiveContactsOut,
+    AmountQuantilesOut,
+    DealsAmountDistributionOut,
+    DealsDashboardOut,
+    DealsForecastOut,
+    DealsFunnelOut,
+    DealsSummaryOut,
+    DealsTimeseriesOut,
+    DealsTimeseriesPointOut,
+    DealsVelocityOut,
+    MonthForecastOut,
+    MonthlyActiveContactsOut,
+    OrganizationDealsSummaryOut,
+    OwnerAmountsOut,
+    OwnerForecastOut,
+    StageProbabilitiesIn,
+    StageProbabilitiesOut,
+    StageVelocityOut,
+)
+from app.services.amount_distribution import AmountDistributionService
+from app.services.analytics import AnalyticsService, TimeseriesInterval
+from app.services.dashboard import DashboardService
+from app.services.forecast import ForecastService
+from app.services.funnel_velocity import FunnelVelocityService
 from app.services.organizations import OrganizationContext
+from app.services.principals import CurrentUser
+from app.services.sketches import SketchAnalyticsService
 
 router = APIRouter()
 
 
-@router.get("/deals/summary", response_model=DealsSummaryOut)
+@router.get(
+    "/deals/summary",
+    response_model=DealsSummaryOut,
+    # new_deals_last_n_days зависит от текущего времени, поэтому ETag живёт не дольше TTL кэша
+    dependencies=[
+        Depends(conditional_get(RevisionEntity.deals, time_bucket_seconds=settings.cache_ttl_seconds))
+    ],
+)
 async def deals_summary(
     org_context: OrganizationContext = Depends(get_organization_context),
     service: AnalyticsService = Depends(get_analytics_service),
 ) -> DealsSummaryOut:
     try:
-        summary = await service.deals_summary(org_context.organization.id)
+        summary = await service.deals_summary(org_context.organization_id)
         return DealsSummaryOut(**summary.__dict__)
     except Exception as exc:
         raise HTTPException(status_code=getattr(exc, "status_code", 400), detail=str(exc)) from exc
 
 
-@router.get("/deals/funnel", response_model=DealsFunnelOut)
+# X-Organization-Id не нужен: сводка строится по всем организациям пользователя
+@router.get("/deals/summary/organizations", response_model=DealsDashboardOut)
+async def deals_summary_by_organization(
+    current_user: CurrentUser = Depends(get_current_user),
+    service: DashboardService = Depends(get_dashboard_service),
+) -> DealsDashboardOut:
+    dashboard = await service.deals_summary(current_user.id)
+    return DealsDashboardOut(
+        organizations=[
+            OrganizationDealsSummaryOut(
+                **{
+                    **entry.__dict__,
+                    "status": entry.status.value,
+                    "summary": DealsSummaryOut(**entry.summary.__dict__) if entry.summary else None,
+                }
+            )
+            for entry in dashboard.organizations
+        ],
+        complete=dashboard.complete,
+    )
+
+
+@router.get(
+    "/deals/funnel",
+    response_model=DealsFunnelOut,
+    dependencies=[Depends(conditional_get(RevisionEntity.deals))],
+)
 async def deals_funnel(
     org_context: OrganizationContext = Depends(get_organization_context),
     service: AnalyticsService = Depends(get_analytics_service),
 ) -> DealsFunnelOut:
     try:
-        funnel = await service.deals_funnel(org_context.organization.id)
+        funnel = await service.deals_funnel(org_context.organization_id)
         return DealsFunnelOut(funnel=funnel)
     except Exception as exc:
         raise HTTPException(status_code=getattr(exc, "status_code", 400), detail=str(exc)) from exc
 
 
+@router.get(
+    "/deals/timeseries",
+    response_model=DealsTimeseriesOut,
+    # без явного date_to окно заканчивается «сегодня», поэтому ETag тоже ограничен TTL кэша
+    dependencies=[
+        Depends(conditional_get(RevisionEntity.deals, time_bucket_seconds=settings.cache_ttl_seconds))
+    ],
+)
+async def deals_timeseries(
+    interval: TimeseriesInterval = TimeseriesInterval.day,
+    tz: str = Query("UTC", max_length=64, description="IANA-имя часового пояса, например Europe/Moscow"),
+    date_from: date | None = None,
+    date_to: date | None = None,
+    org_context: OrganizationContext = Depends(get_organization_context),
+    service: AnalyticsService = Depends(get_analytics_service),
+) -> DealsTimeseriesOut:
+    try:
+        points = await service.deals_timeseries(
+            org_context.organization_id,
+            interval=interval,
+            tz=tz,
+            date_from=date_from,
+            date_to=date_to,
+        )
+        return DealsTimeseriesOut(
+            interval=interval.value,
+            timezone=tz,
+            points=[DealsTimeseriesPointOut(**point.__dict__) for point in points],
+        )
+    except Exception as exc:
+        raise HTTPException(status_code=getattr(exc, "status_code", 400), detail=str(exc)) from exc
+
+
+@router.get(
+    "/deals/velocity",
+    response_model=DealsVelocityOut,
+    # свежие активности учитываются с задержкой settle_seconds, поэтому ETag тоже ограничен по времени
+    dependencies=[
+        Depends(conditional_get(RevisionEntity.deals, time_bucket_seconds=settings.cache_ttl_seconds))
+    ],
+)
+async def deals_velocity(
+    org_context: OrganizationContext = Depends(get_organization_context),
+    service: FunnelVelocityService = Depends(get_funnel_velocity_service),
+) -> DealsVelocityOut:
+    try:
+        velocity = await service.velocity(org_context.organization_id)
+        return DealsVelocityOut(
+            stages=[StageVelocityOut(**stage.__dict__) for stage in velocity.stages],
+            transitions=velocity.transitions,
+            processed_through_activity_id=velocity.processed_through_activity_id,
+        )
+    except Exception as exc:
+        raise HTTPException(status_code=getattr(exc, "status_code", 400), detail=str(exc)) from exc
+
+
+@router.get(
+    "/deals/amounts",
+    response_model=DealsAmountDistributionOut,
+    dependencies=[Depends(conditional_get(RevisionEntity.deals))],
+)
+async def deals_amounts(
+    status: list[DealStatus] | None = Query(None),
+    stage: DealStage | None = None,
+    created_from: date | None = None,
+    created_to: date | None = None,
+    bins: int = Query(20, ge=1, le=200),
+    org_context: OrganizationContext = Depends(get_organization_context),
+    service: AmountDistributionService = Depends(get_amount_distribution_service),
+) -> DealsAmountDistributionOut:
+    try:
+        distribution = await service.distribution(
+            org_context.organization_id,
+            status=status,
+            stage=stage,
+            created_from=created_from,
+            created_to=created_to,
+            bins=bins,
+        )
+        by_owner = [OwnerAmountsOut(**owner.__dict__) for owner in distribution.by_owner]
+        return DealsAmountDistributionOut(**{**distribution.__dict__, "by_owner": by_owner})
+    except Exception as exc:
+        raise HTTPException(status_code=getattr(exc, "status_code", 400), detail=str(exc)) from exc
+
+
+@router.get(
+    "/deals/forecast",
+    response_model=DealsForecastOut,
+    dependencies=[Depends(conditional_get(RevisionEntity.deals))],
+)
+async def deals_forecast(
+    org_context: OrganizationContext = Depends(get_organization_context),
+    service: ForecastService = Depends(get_forecast_service),
+) -> DealsForecastOut:
+    try:
+        forecast = await service.forecast(org_context.organization_id)
+        return DealsForecastOut(
+            **{
+                **forecast.__dict__,
+                "by_owner": [OwnerForecastOut(**owner.__dict__) for owner in forecast.by_owner],
+                "by_month": [MonthForecastOut(**month.__dict__) for month in forecast.by_month],
+            }
+        )
+    except Exception as exc:
+        raise HTTPException(status_code=getattr(exc, "status_code", 400), detail=str(exc)) from exc
+
+
+@router.put("/deals/forecast/probabilities", response_model=StageProbabilitiesOut)
+async def set_stage_probabilities(
+    payload: StageProbabilitiesIn,
+    org_context: OrganizationContext = Depends(get_organization_context),
+    service: ForecastService = Depends(get_forecast_service),
+) -> StageProbabilitiesOut:
+    try:
+        probabilities = await service.set_probabilities(
+            organization_id=org_context.organization_id,
+            role=org_context.role,
+            probabilities=payload.probabilities,
+        )
+        return StageProbabilitiesOut(
+            probabilities={stage.value: float(value) for stage, value in probabilities.items()}
+        )
+    except Exception as exc:
+        raise HTTPException(status_code=getattr(exc, "status_code", 400), detail=str(exc)) from exc
+
+
+# комментарии не меняют ревизию сделок, поэтому без ETag: ответ читает не больше сотни строк
+@router.get("/contacts/active", response_model=ActiveContactsOut)
+async def active_contacts(
+    month_from: date | None = None,
+    month_to: date | None = None,
+    org_context: OrganizationContext = Depends(get_organization_context),
+    service: SketchAnalyticsService = Depends(get_sketch_analytics_service),
+) -> ActiveContactsOut:
+    try:
+        estimate = await service.active_contacts(
+            org_context.organization_id, month_from=month_from, month_to=month_to
+        )
+        months = [MonthlyActiveContactsOut(**month.__dict__) for month in estimate.months]
+        return ActiveContactsOut(**{**estimate.__dict__, "months": months})
+    except Exception as exc:
+        raise HTTPException(status_code=getattr(exc, "status_code", 400), detail=str(exc)) from exc
+
+
+@router.get(
+    "/deals/amount-quantiles",
+    response_model=AmountQuantilesOut,
+    # без month_to окно заканчивается текущим месяцем
+    dependencies=[
+        Depends(conditional_get(RevisionEntity.deals, time_bucket_seconds=settings.cache_ttl_seconds))
+    ],
+)
+async def deals_amount_quantiles(
+    q: list[float] = Query([0.5, 0.9, 0.99], max_length=20),
+    month_from: date | None = None,
+    month_to: date | None = None,
+    org_context: OrganizationContext = Depends(get_organization_context),
+    service: SketchAnalyticsService = Depends(get_sketch_analytics_service),
+) -> AmountQuantilesOut:
+    try:
+        quantiles = await service.amount_quantiles(
+            org_context.organization_id, quantiles=q, month_from=month_from, month_to=month_to
+        )
+        return AmountQuantilesOut(**quantiles.__dict__)
+    except Exception as exc:
+        raise HTTPException(status_code=getattr(exc, "status_code", 400), detail=str(exc)) from exc
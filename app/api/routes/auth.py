@@ -3,7 +3,7 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from app.dependencies.services import get_auth_service
-from app.schemas.auth import LoginRequest, RegisterRequest, TokenPair
+from app.schemas.auth import LoginRequest, RefreshRequest, RegisterRequest, TokenPair
 from app.services.auth import AuthService
 
 router = APIRouter()
@@ -37,3 +37,15 @@ async def login(
     return TokenPair(access_token=tokens.access_token, refresh_token=tokens.refresh_token)
 
 
+@router.post("/refresh", response_model=TokenPair)
+async def refresh(
+    payload: RefreshRequest,
+    service: AuthService = Depends(get_auth_service),
+) -> TokenPair:
+    try:
+        tokens = await service.refresh(refresh_token=payload.refresh_token)
+    except Exception as exc:
+        status_code = getattr(exc, "status_code", status.HTTP_400_BAD_REQUEST)
+        raise HTTPException(status_code=status_code, detail=str(exc)) from exc
+
+    return TokenPair(access_token=tokens.access_token, refresh_token=tokens.refresh_token)
@@ -1,53 +1,85 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 
 from app.api.dependencies.auth import get_current_user, get_organization_context
+from app.api.dependencies.conditional import conditional_get
 from app.dependencies.services import get_contact_service
 from app.models.organization_member import OrganizationRole
-from app.models.user import User
+from app.models.organization_revision import RevisionEntity
+from app.repositories.base import CountMode
+from app.schemas.common import PaginatedResult
 from app.schemas.contact import ContactCreate, ContactOut
 from app.services.contacts import ContactService
 from app.services.organizations import OrganizationContext
+from app.services.principals import CurrentUser
 
 router = APIRouter()
 
 
-@router.get("", response_model=list[ContactOut])
+@router.get(
+    "",
+    response_model=list[ContactOut] | PaginatedResult[ContactOut],
+    dependencies=[Depends(conditional_get(RevisionEntity.contacts))],
+)
 async def list_contacts(
+    response: Response,
     search: str | None = None,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, le=100),
     owner_id: int | None = None,
-    current_user: User = Depends(get_current_user),
+    order_by: str = "created_at",
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    cursor: str | None = Query(None, max_length=512),
+    count: CountMode | None = None,
+    current_user: CurrentUser = Depends(get_current_user),
     org_context: OrganizationContext = Depends(get_organization_context),
     service: ContactService = Depends(get_contact_service),
-) -> list[ContactOut]:
+) -> list[ContactOut] | PaginatedResult[ContactOut]:
     if org_context.role == OrganizationRole.member:
         owner_id = current_user.id
     try:
-        return await service.list_contacts(
-            organization_id=org_context.organization.id,
+        result = await service.list_contacts(
+            organization_id=org_context.organization_id,
             role=org_context.role,
             owner_id=owner_id,
             search=search,
             page=page,
             page_size=page_size,
+            order_by=order_by,
+            order=order,
+            cursor=cursor,
+            count=count or CountMode.none,
         )
     except Exception as exc:
         raise HTTPException(status_code=getattr(exc, "status_code", 400), detail=str(exc)) from exc
+    if result.next_cursor:
+        response.headers["X-Next-Cursor"] = result.next_cursor
+    items = [ContactOut.model_validate(contact) for contact in result.items]
+    if count is None:
+        return items
+    # с count ответ оборачивается в конверт с итогом и признаком следующей страницы
+    return PaginatedResult[ContactOut](
+        items=items,
+        page=page,
+        page_size=page_size,
+        total=result.total,
+        total_estimated=result.total_estimated,
+        has_more=result.has_more,
+        next_cursor=result.next_cursor,
+    )
 
 
 @router.post("", response_model=ContactOut, status_code=status.HTTP_201_CREATED)
 async def create_contact(
     payload: ContactCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     org_context: OrganizationContext = Depends(get_organization_context),
     service: ContactService = Depends(get_contact_service),
 ) -> ContactOut:
     try:
         return await service.create_contact(
-            organization_id=org_context.organization.id,
+            organization_id=org_context.organization_id,
             owner_id=current_user.id,
             **payload.model_dump(),
         )
@@ -58,14 +90,14 @@ async def create_contact(
 @router.delete("/{contact_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_contact(
     contact_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     org_context: OrganizationContext = Depends(get_organization_context),
     service: ContactService = Depends(get_contact_service),
 ) -> None:
     try:
         await service.delete_contact(
             contact_id=contact_id,
-            organization_id=org_context.organization.id,
+            organization_id=org_context.organization_id,
             requesting_user_id=current_user.id,
             role=org_context.role,
         )
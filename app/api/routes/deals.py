@@ -2,22 +2,31 @@ from __future__ import annotations
 
 from decimal import Decimal
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 
 from app.api.dependencies.auth import get_current_user, get_organization_context
+from app.api.dependencies.conditional import conditional_get
 from app.dependencies.services import get_deal_service
 from app.models.deal import DealStage, DealStatus
 from app.models.organization_member import OrganizationRole
-from app.models.user import User
-from app.schemas.deal import DealCreate, DealOut, DealUpdate
+from app.models.organization_revision import RevisionEntity
+from app.repositories.base import CountMode
+from app.schemas.common import PaginatedResult
+from app.schemas.deal import DealBoardColumnOut, DealBoardOut, DealCreate, DealOut, DealUpdate
 from app.services.deals import DealService
 from app.services.organizations import OrganizationContext
+from app.services.principals import CurrentUser
 
 router = APIRouter()
 
 
-@router.get("", response_model=list[DealOut])
+@router.get(
+    "",
+    response_model=list[DealOut] | PaginatedResult[DealOut],
+    dependencies=[Depends(conditional_get(RevisionEntity.deals))],
+)
 async def list_deals(
+    response: Response,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, le=100),
     status: list[DealStatus] | None = Query(None),
@@ -27,15 +36,17 @@ async def list_deals(
     owner_id: int | None = None,
     order_by: str = "created_at",
     order: str = Query("desc", pattern="^(asc|desc)$"),
-    current_user: User = Depends(get_current_user),
+    cursor: str | None = Query(None, max_length=512),
+    count: CountMode | None = None,
+    current_user: CurrentUser = Depends(get_current_user),
     org_context: OrganizationContext = Depends(get_organization_context),
     service: DealService = Depends(get_deal_service),
-) -> list[DealOut]:
+) -> list[DealOut] | PaginatedResult[DealOut]:
     if org_context.role == OrganizationRole.member:
         owner_id = current_user.id
     try:
-        return await service.list_deals(
-            organization_id=org_context.organization.id,
+        result = await service.list_deals(
+            organization_id=org_context.organization_id,
             status=status,
             min_amount=min_amount,
             max_amount=max_amount,
@@ -45,6 +56,60 @@ async def list_deals(
             order=order,
             limit=page_size,
             offset=(page - 1) * page_size,
+            cursor=cursor,
+            count=count or CountMode.none,
+        )
+    except Exception as exc:
+        raise HTTPException(status_code=getattr(exc, "status_code", 400), detail=str(exc)) from exc
+    if result.next_cursor:
+        response.headers["X-Next-Cursor"] = result.next_cursor
+    items = [DealOut.model_validate(deal) for deal in result.items]
+    if count is None:
+        return items
+    # с count ответ оборачивается в конверт с итогом и признаком следующей страницы
+    return PaginatedResult[DealOut](
+        items=items,
+        page=page,
+        page_size=page_size,
+        total=result.total,
+        total_estimated=result.total_estimated,
+        has_more=result.has_more,
+        next_cursor=result.next_cursor,
+    )
+
+
+@router.get(
+    "/board",
+    response_model=DealBoardOut,
+    dependencies=[Depends(conditional_get(RevisionEntity.deals))],
+)
+async def deals_board(
+    limit: int = Query(20, ge=1, le=100),
+    status: list[DealStatus] | None = Query(None),
+    owner_id: int | None = None,
+    order_by: str = "created_at",
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    cursor: str | None = Query(None, max_length=512),
+    current_user: CurrentUser = Depends(get_current_user),
+    org_context: OrganizationContext = Depends(get_organization_context),
+    service: DealService = Depends(get_deal_service),
+) -> DealBoardOut:
+    if org_context.role == OrganizationRole.member:
+        owner_id = current_user.id
+    try:
+        columns = await service.board(
+            organization_id=org_context.organization_id,
+            status=status,
+            owner_id=owner_id,
+            order_by=order_by,
+            order=order,
+            limit=limit,
+            cursor=cursor,
+        )
+        return DealBoardOut(
+            columns=[
+                DealBoardColumnOut.model_validate(column, from_attributes=True) for column in columns
+            ]
         )
     except Exception as exc:
         raise HTTPException(status_code=getattr(exc, "status_code", 400), detail=str(exc)) from exc
@@ -53,7 +118,7 @@ async def list_deals(
 @router.post("", response_model=DealOut, status_code=status.HTTP_201_CREATED)
 async def create_deal(
     payload: DealCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     org_context: OrganizationContext = Depends(get_organization_context),
     service: DealService = Depends(get_deal_service),
 ) -> DealOut:
@@ -62,7 +127,7 @@ async def create_deal(
         owner_id = current_user.id
     try:
         return await service.create_deal(
-            organization_id=org_context.organization.id,
+            organization_id=org_context.organization_id,
             contact_id=payload.contact_id,
             owner_id=owner_id,
             actor_id=current_user.id,
@@ -70,6 +135,7 @@ async def create_deal(
             title=payload.title,
             amount=payload.amount,
             currency=payload.currency,
+            expected_close_date=payload.expected_close_date,
         )
     except Exception as exc:
         raise HTTPException(status_code=getattr(exc, "status_code", 400), detail=str(exc)) from exc
@@ -79,14 +145,14 @@ async def create_deal(
 async def update_deal(
     deal_id: int,
     payload: DealUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     org_context: OrganizationContext = Depends(get_organization_context),
     service: DealService = Depends(get_deal_service),
 ) -> DealOut:
     try:
         return await service.update_deal(
             deal_id=deal_id,
-            organization_id=org_context.organization.id,
+            organization_id=org_context.organization_id,
             actor_id=current_user.id,
             role=org_context.role,
             data={k: v for k, v in payload.model_dump(exclude_unset=True).items()},
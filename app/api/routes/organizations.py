@@ -1,21 +1,56 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, status
 
-from app.api.dependencies.auth import get_current_user
+from app.api.dependencies.auth import get_current_user, get_organization_context
 from app.dependencies.services import get_organization_service
-from app.models.user import User
-from app.schemas.organization import OrganizationOut
-from app.services.organizations import OrganizationService
+from app.schemas.organization import (
+    OrganizationMemberOut,
+    OrganizationMemberRoleUpdate,
+    OrganizationOut,
+)
+from app.services.organizations import OrganizationContext, OrganizationService
+from app.services.principals import CurrentUser
 
 router = APIRouter()
 
 
 @router.get("/me", response_model=list[OrganizationOut])
 async def my_organizations(
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     service: OrganizationService = Depends(get_organization_service),
 ) -> list[OrganizationOut]:
     return await service.get_user_organizations(current_user.id)
 
 
+@router.patch("/members/{user_id}", response_model=OrganizationMemberOut)
+async def change_member_role(
+    user_id: int,
+    payload: OrganizationMemberRoleUpdate,
+    org_context: OrganizationContext = Depends(get_organization_context),
+    service: OrganizationService = Depends(get_organization_service),
+) -> OrganizationMemberOut:
+    try:
+        membership = await service.change_member_role(
+            organization_id=org_context.organization_id,
+            actor_role=org_context.role,
+            user_id=user_id,
+            role=payload.role,
+        )
+    except Exception as exc:
+        raise HTTPException(status_code=getattr(exc, "status_code", 400), detail=str(exc)) from exc
+    return OrganizationMemberOut.model_validate(membership)
+
+
+@router.delete("/members/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def remove_member(
+    user_id: int,
+    org_context: OrganizationContext = Depends(get_organization_context),
+    service: OrganizationService = Depends(get_organization_service),
+) -> None:
+    try:
+        await service.remove_member(
+            organization_id=org_context.organization_id, actor_role=org_context.role, user_id=user_id
+        )
+    except Exception as exc:
+        raise HTTPException(status_code=getattr(exc, "status_code", 400), detail=str(exc)) from exc
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.api.dependencies.auth import get_current_user, get_organization_context
+from app.dependencies.services import get_report_job_service
+from app.schemas.report import ReportJobCreate, ReportJobOut, ReportResultOut
+from app.services.organizations import OrganizationContext
+from app.services.principals import CurrentUser
+from app.services.reports import ReportJobService
+
+router = APIRouter()
+
+
+@router.post("", response_model=ReportJobOut, status_code=status.HTTP_202_ACCEPTED)
+async def submit_report(
+    payload: ReportJobCreate,
+    current_user: CurrentUser = Depends(get_current_user),
+    org_context: OrganizationContext = Depends(get_organization_context),
+    service: ReportJobService = Depends(get_report_job_service),
+) -> ReportJobOut:
+    try:
+        job, _ = await service.submit(
+            organization_id=org_context.organization_id,
+            user_id=current_user.id,
+            kind=payload.kind,
+            params=payload.params,
+        )
+    except Exception as exc:
+        raise HTTPException(status_code=getattr(exc, "status_code", 400), detail=str(exc)) from exc
+    return ReportJobOut.model_validate(job)
+
+
+@router.get("/{job_id}", response_model=ReportJobOut)
+async def get_report(
+    job_id: int,
+    org_context: OrganizationContext = Depends(get_organization_context),
+    service: ReportJobService = Depends(get_report_job_service),
+) -> ReportJobOut:
+    try:
+        job = await service.get(organization_id=org_context.organization_id, job_id=job_id)
+    except Exception as exc:
+        raise HTTPException(status_code=getattr(exc, "status_code", 400), detail=str(exc)) from exc
+    return ReportJobOut.model_validate(job)
+
+
+@router.get("/{job_id}/result", response_model=ReportResultOut)
+async def get_report_result(
+    job_id: int,
+    org_context: OrganizationContext = Depends(get_organization_context),
+    service: ReportJobService = Depends(get_report_job_service),
+) -> ReportResultOut:
+    try:
+        job = await service.result(organization_id=org_context.organization_id, job_id=job_id)
+    except Exception as exc:
+        raise HTTPException(status_code=getattr(exc, "status_code", 400), detail=str(exc)) from exc
+    return ReportResultOut.model_validate(job)
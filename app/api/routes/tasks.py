@@ -2,50 +2,71 @@ from __future__ import annotations
 
 from datetime import date
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 
 from app.api.dependencies.auth import get_current_user, get_organization_context
+from app.api.dependencies.conditional import conditional_get
+from app.core.config import settings
 from app.dependencies.services import get_task_service
-from app.models.user import User
+from app.models.organization_revision import RevisionEntity
 from app.schemas.task import TaskCreate, TaskOut
 from app.services.organizations import OrganizationContext
+from app.services.principals import CurrentUser
 from app.services.tasks import TaskService
 
 router = APIRouter()
 
 
-@router.get("", response_model=list[TaskOut])
+@router.get(
+    "",
+    response_model=list[TaskOut],
+    dependencies=[Depends(conditional_get(RevisionEntity.tasks))],
+)
 async def list_tasks(
+    response: Response,
     deal_id: int | None = None,
+    owner_id: int | None = None,
     only_open: bool = False,
     due_before: date | None = None,
     due_after: date | None = None,
+    order_by: str = "due_date",
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    limit: int = Query(settings.list_default_limit, ge=1, le=settings.list_max_limit),
+    cursor: str | None = Query(None, max_length=512),
     org_context: OrganizationContext = Depends(get_organization_context),
     service: TaskService = Depends(get_task_service),
 ) -> list[TaskOut]:
     try:
-        return await service.list_tasks(
-            organization_id=org_context.organization.id,
+        result = await service.list_tasks(
+            organization_id=org_context.organization_id,
             deal_id=deal_id,
+            owner_id=owner_id,
             only_open=only_open,
             due_before=due_before,
             due_after=due_after,
+            order_by=order_by,
+            order=order,
+            limit=limit,
+            cursor=cursor,
         )
     except Exception as exc:
         raise HTTPException(status_code=getattr(exc, "status_code", 400), detail=str(exc)) from exc
+    if result.next_cursor:
+        response.headers["X-Next-Cursor"] = result.next_cursor
+    return result.items
 
 
 @router.post("", response_model=TaskOut, status_code=status.HTTP_201_CREATED)
 async def create_task(
     payload: TaskCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     org_context: OrganizationContext = Depends(get_organization_context),
     service: TaskService = Depends(get_task_service),
 ) -> TaskOut:
     try:
         return await service.create_task(
             deal_id=payload.deal_id,
-            organization_id=org_context.organization.id,
+            organization_id=org_context.organization_id,
             actor_id=current_user.id,
             role=org_context.role,
             title=payload.title,
@@ -1,14 +1,61 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from typing import Optional
 
 import typer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.core.invalidation import invalidation_bus
+from app.core.versions import publish_deal_version
 from app.db.session import async_session_factory
+from app.models.organization import Organization
+from app.models.organization_revision import RevisionEntity
+from app.repositories.analytics_sketch import AnalyticsSketchRepository
+from app.repositories.deal_hourly_stat import DealHourlyStatRepository
+from app.repositories.deal_stat import DealStatMismatch, DealStatRepository
+from app.repositories.organization_revision import OrganizationRevisionRepository
+from app.repositories.pipeline_total import PipelineTotalRepository
+from app.repositories.report_job import ReportJobRepository
+from app.repositories.revoked_token import RevokedTokenRepository
 
 app = typer.Typer()
 
 
+async def _organization_ids(session: AsyncSession, organization_id: int | None) -> list[int]:
+    if organization_id is not None:
+        return [organization_id]
+    result = await session.execute(select(Organization.id).order_by(Organization.id))
+    return list(result.scalars().all())
+
+
+async def _bump_deal_revisions(
+    session: AsyncSession, organization_ids: Iterable[int]
+) -> dict[int, int]:
+    # ETag и кэши аналитики завязаны на ревизию сделок: без этого пересчёт не виден клиентам
+    repo = OrganizationRevisionRepository(session)
+    revisions: dict[int, int] = {}
+    for org_id in organization_ids:
+        revisions[org_id] = await repo.bump(org_id, RevisionEntity.deals)
+    return revisions
+
+
+async def _publish_deal_revisions(revisions: dict[int, int]) -> None:
+    """Рассылает воркерам хоста ревизии, поднятые пересчётом; вызывать после commit."""
+    if not revisions or not settings.invalidation_bus_enabled:
+        return
+    await invalidation_bus.start()
+    try:
+        for org_id, revision in revisions.items():
+            publish_deal_version(org_id, revision)
+    finally:
+        await invalidation_bus.stop()
+
+
 @app.command()
 def shell() -> None:
     """Простая консоль для отладки."""
@@ -19,3 +66,129 @@ def shell() -> None:
     asyncio.run(_shell())
 
 
+@app.command()
+def prune_revoked_tokens() -> None:
+    """Удаляет истёкшие записи об отозванных refresh-токенах."""
+    async def _prune() -> int:
+        async with async_session_factory() as session:
+            removed = await RevokedTokenRepository(session).delete_expired(
+                datetime.now(timezone.utc).replace(tzinfo=None)
+            )
+            await session.commit()
+            return removed
+
+    typer.echo(f"Удалено записей: {asyncio.run(_prune())}")
+
+
+@app.command()
+def prune_report_jobs() -> None:
+    """Удаляет задачи отчётов, срок хранения результата которых истёк."""
+    async def _prune() -> int:
+        async with async_session_factory() as session:
+            removed = await ReportJobRepository(session).delete_expired(
+                datetime.now(timezone.utc).replace(tzinfo=None)
+            )
+            await session.commit()
+            return removed
+
+    typer.echo(f"Удалено отчётов: {asyncio.run(_prune())}")
+
+
+@app.command()
+def rebuild_deal_stats(organization_id: Optional[int] = typer.Option(None, help="Только эта организация")) -> None:
+    """Пересчитывает свёртку deal_stats по таблице сделок."""
+    async def _rebuild() -> list[int]:
+        async with async_session_factory() as session:
+            organizations = await DealStatRepository(session).rebuild(organization_id)
+            revisions = await _bump_deal_revisions(session, organizations)
+            await session.commit()
+        await _publish_deal_revisions(revisions)
+        return organizations
+
+    typer.echo(f"Пересчитано организаций: {len(asyncio.run(_rebuild()))}")
+
+
+@app.command()
+def verify_deal_stats(organization_id: Optional[int] = typer.Option(None, help="Только эта организация")) -> None:
+    """Сверяет свёртку deal_stats с таблицей сделок; код выхода 1 при расхождениях."""
+    async def _verify() -> list[DealStatMismatch]:
+        async with async_session_factory() as session:
+            return await DealStatRepository(session).verify(organization_id)
+
+    mismatches = asyncio.run(_verify())
+    for item in mismatches:
+        typer.echo(
+            f"org={item.organization_id} {item.status.value}/{item.stage.value}: "
+            f"ожидалось {item.expected[0]} / {item.expected[1]}, в свёртке {item.actual[0]} / {item.actual[1]}"
+        )
+    if mismatches:
+        raise typer.Exit(code=1)
+    typer.echo("Свёртка deal_stats совпадает со сделками")
+
+
+@app.command()
+def rebuild_deal_timeseries(
+    organization_id: Optional[int] = typer.Option(None, help="Только эта организация"),
+) -> None:
+    """Заполняет почасовую свёртку для /analytics/deals/timeseries по сделкам и активностям."""
+    async def _rebuild() -> int:
+        async with async_session_factory() as session:
+            buckets = await DealHourlyStatRepository(session).rebuild(organization_id)
+            revisions = await _bump_deal_revisions(
+                session, await _organization_ids(session, organization_id)
+            )
+            await session.commit()
+        await _publish_deal_revisions(revisions)
+        return buckets
+
+    typer.echo(f"Записано почасовых корзин: {asyncio.run(_rebuild())}")
+
+
+@app.command()
+def rebuild_pipeline_totals(
+    organization_id: Optional[int] = typer.Option(None, help="Только эта организация"),
+) -> None:
+    """Пересчитывает корзины прогноза pipeline_totals по открытым сделкам."""
+    async def _rebuild() -> int:
+        async with async_session_factory() as session:
+            buckets = await PipelineTotalRepository(session).rebuild(organization_id)
+            revisions = await _bump_deal_revisions(
+                session, await _organization_ids(session, organization_id)
+            )
+            await session.commit()
+        await _publish_deal_revisions(revisions)
+        return buckets
+
+    typer.echo(f"Записано корзин прогноза: {asyncio.run(_rebuild())}")
+
+
+@app.command()
+def rebuild_sketches(
+    organization_id: Optional[int] = typer.Option(None, help="Только эта организация"),
+) -> None:
+    """Пересобирает месячные скетчи активных контактов и сумм сделок."""
+    async def _rebuild() -> int:
+        async with async_session_factory() as session:
+            sketches = await AnalyticsSketchRepository(session).rebuild(organization_id)
+            revisions = await _bump_deal_revisions(
+                session, await _organization_ids(session, organization_id)
+            )
+            await session.commit()
+        await _publish_deal_revisions(revisions)
+        return sketches
+
+    typer.echo(f"Записано скетчей: {asyncio.run(_rebuild())}")
+
+
+@app.command()
+def fold_sketches(
+    organization_id: Optional[int] = typer.Option(None, help="Только эта организация"),
+) -> None:
+    """Сворачивает накопленные наблюдения в месячные скетчи; запускать по расписанию."""
+    async def _fold() -> int:
+        async with async_session_factory() as session:
+            folded = await AnalyticsSketchRepository(session).fold(organization_id)
+            await session.commit()
+            return folded
+
+    typer.echo(f"Свёрнуто наблюдений: {asyncio.run(_fold())}")
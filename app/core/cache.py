@@ -1,50 +1,333 @@
 from __future__ import annotations
 
+import asyncio
+import enum
+import functools
+import inspect
+import math
+import pickle
 import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, Generic, Hashable, Tuple, TypeVar
+from typing import Any, AsyncContextManager, Awaitable, Callable, Final, Generic, Hashable, TypeVar
 
 T = TypeVar("T")
 
 
+class _Missing(enum.Enum):
+    token = enum.auto()
+
+
+# отличает промах от закэшированных None / 0 / пустых коллекций
+MISSING: Final = _Missing.token
+
+
 @dataclass
 class CacheEntry(Generic[T]):
     value: T
     expires_at: float
+    size: int = 0
+
+
+@dataclass(frozen=True)
+class _Stamped:
+    value: Any
+    fresh_until: float
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    namespace: str
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    size: int
+    bytes: int
+
+
+def approximate_size(value: Any) -> int:
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:  # noqa: BLE001
+        return 0
+
+
+_registry: dict[str, CacheBackend] = {}
+
+
+def _consume_exception(task: asyncio.Task[Any]) -> None:
+    # ошибка фонового обновления не должна теряться с предупреждением; следующий промах повторит расчёт
+    if not task.cancelled():
+        task.exception()
+
 
+def cache_stats() -> dict[str, CacheStats]:
+    return {namespace: cache.stats() for namespace, cache in _registry.items()}
 
-class TTLCache:
-    def __init__(self, ttl_seconds: int) -> None:
+
+class CacheBackend(ABC):
+    """Общий интерфейс кэшей: хранилище реализует get/set/delete, декораторы работают поверх него."""
+
+    def __init__(self, *, namespace: str | None, ttl_seconds: float | None) -> None:
+        self.namespace = namespace or f"cache-{id(self):x}"
         self._ttl = ttl_seconds
-        self._store: Dict[Hashable, CacheEntry[Any]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        _registry[self.namespace] = self
 
-    def _is_expired(self, key: Hashable) -> bool:
-        entry = self._store.get(key)
-        if entry is None:
-            return True
-        if entry.expires_at < time.time():
-            self._store.pop(key, None)
-            return True
-        return False
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+    @abstractmethod
+    def get(self, key: Hashable, default: Any = None) -> Any: ...
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any, *, ttl: float | None = None) -> None: ...
+
+    async def get_async(self, key: Hashable, default: Any = None) -> Any:
+        """Чтение из корутины; хранилища с блокирующим I/O уводят его из цикла событий."""
+        return self.get(key, default)
+
+    async def set_async(self, key: Hashable, value: Any, *, ttl: float | None = None) -> None:
+        self.set(key, value, ttl=ttl)
 
-    def get(self, key: Hashable) -> Any | None:
-        if self._is_expired(key):
-            return None
-        return self._store[key].value
+    @abstractmethod
+    def delete(self, key: Hashable) -> None: ...
 
-    def set(self, key: Hashable, value: Any) -> None:
-        self._store[key] = CacheEntry(value=value, expires_at=time.time() + self._ttl)
+    @abstractmethod
+    def delete_where(self, predicate: Callable[[Hashable], bool]) -> None: ...
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+    def _size_bytes(self) -> int:
+        return 0
+
+    def _clock(self) -> float:
+        return time.monotonic()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            namespace=self.namespace,
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            expirations=self._expirations,
+            size=len(self),
+            bytes=self._size_bytes(),
+        )
+
+    def reset_stats(self) -> None:
+        self._hits = self._misses = self._evictions = self._expirations = 0
 
     def cached(self, func: Callable[..., T]) -> Callable[..., T]:
+        def make_key(args: tuple[Any, ...], kwargs: dict[str, Any]) -> Hashable:
+            return (func.__qualname__,) + args + tuple(sorted(kwargs.items()))
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                key = make_key(args, kwargs)
+                cached_value = await self.get_async(key, MISSING)
+                if cached_value is not MISSING:
+                    return cached_value
+                value = await func(*args, **kwargs)
+                await self.set_async(key, value)
+                return value
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> T:
-            key: Tuple[Hashable, ...] = (func.__name__,) + args + tuple(sorted(kwargs.items()))
-            cached_value = self.get(key)
-            if cached_value is not None:
-                return cached_value
+            key = make_key(args, kwargs)
+            cached_value = self.get(key, MISSING)
+            if cached_value is not MISSING:
+                return cached_value  # type: ignore[no-any-return]
             value = func(*args, **kwargs)
             self.set(key, value)
             return value
 
         return wrapper
 
+    def memoize(
+        self,
+        *,
+        key: Callable[..., Hashable] | None = None,
+        stale_seconds: float = 0.0,
+        detach: Callable[[Any], AsyncContextManager[Any]] | None = None,
+    ) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+        """Кэширует результат корутины и не даёт конкурентным промахам считать его повторно.
+
+        Первый промах по ключу запускает вычисление, остальные ждут тот же future.
+        При ``stale_seconds > 0`` истёкшее значение ещё столько секунд отдаётся сразу,
+        а обновление идёт в фоне. Общее вычисление переживает отмену запроса, который его
+        начал, и не должно делить его ресурсы (например, сессию БД), поэтому для методов
+        передаётся ``detach``: он получает ``self`` и открывает независимый экземпляр
+        на время любого пересчёта — и по промаху, и в фоне.
+        """
+
+        def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+            signature = inspect.signature(func)
+            in_flight: dict[Hashable, asyncio.Task[T]] = {}
+
+            def make_key(args: tuple[Any, ...], kwargs: dict[str, Any]) -> Hashable:
+                if key is not None:
+                    return (func.__qualname__, key(*args, **kwargs))
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                values = [v for name, v in bound.arguments.items() if name != "self"]
+                return (func.__qualname__, *values)
+
+            async def compute(cache_key: Hashable, args: tuple[Any, ...], kwargs: dict[str, Any]) -> T:
+                try:
+                    value = await func(*args, **kwargs)
+                    # без TTL значение свежо, пока его не вытеснят или не сменится ключ
+                    fresh_until = self._clock() + self._ttl if self._ttl is not None else math.inf
+                    await self.set_async(
+                        cache_key,
+                        _Stamped(value=value, fresh_until=fresh_until),
+                        ttl=self._ttl + stale_seconds if self._ttl is not None else None,
+                    )
+                    return value
+                finally:
+                    in_flight.pop(cache_key, None)
+
+            async def revalidate(cache_key: Hashable, args: tuple[Any, ...], kwargs: dict[str, Any]) -> T:
+                if detach is None or not args:
+                    return await compute(cache_key, args, kwargs)
+                async with detach(args[0]) as owner:
+                    return await compute(cache_key, (owner, *args[1:]), kwargs)
+
+            @functools.wraps(func)
+            async def wrapper(*args: Any, **kwargs: Any) -> T:
+                cache_key = make_key(args, kwargs)
+                stamped = await self.get_async(cache_key, MISSING)
+                if stamped is not MISSING:
+                    if stamped.fresh_until > self._clock():
+                        return stamped.value  # type: ignore[no-any-return]
+                    if cache_key not in in_flight:
+                        refresh = asyncio.create_task(revalidate(cache_key, args, kwargs))
+                        refresh.add_done_callback(_consume_exception)
+                        in_flight[cache_key] = refresh
+                    return stamped.value  # type: ignore[no-any-return]
+
+                task = in_flight.get(cache_key)
+                if task is None:
+                    task = asyncio.create_task(revalidate(cache_key, args, kwargs))
+                    in_flight[cache_key] = task
+                # отмена одного ожидающего не должна обрывать вычисление для остальных
+                return await asyncio.shield(task)
+
+            return wrapper
+
+        return decorator
+
+
+class LRUCache(CacheBackend):
+    """Кэш с ограничением по числу записей и/или байтам, LRU-вытеснением и TTL.
+
+    Время считается по монотонным часам; истёкшие записи удаляются при чтении
+    и периодическим проходом не реже раза в ``sweep_interval_seconds``.
+    """
+
+    def __init__(
+        self,
+        max_entries: int | None = None,
+        ttl_seconds: float | None = None,
+        *,
+        namespace: str | None = None,
+        max_bytes: int | None = None,
+        sizeof: Callable[[Any], int] = approximate_size,
+        sweep_interval_seconds: float = 60.0,
+    ) -> None:
+        if max_entries is None and max_bytes is None:
+            raise ValueError("Нужно ограничение max_entries или max_bytes")
+        super().__init__(namespace=namespace, ttl_seconds=ttl_seconds)
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._sweep_interval = sweep_interval_seconds
+        self._next_sweep = time.monotonic() + sweep_interval_seconds
+        self._store: OrderedDict[Hashable, CacheEntry[Any]] = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._store.get(key)
+        return entry is not None and entry.expires_at > time.monotonic()
+
+    def _remove(self, key: Hashable) -> CacheEntry[Any] | None:
+        entry = self._store.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+        return entry
+
+    def _maybe_sweep(self, now: float) -> None:
+        if now >= self._next_sweep:
+            self.sweep(now)
+
+    def sweep(self, now: float | None = None) -> int:
+        now = time.monotonic() if now is None else now
+        self._next_sweep = now + self._sweep_interval
+        expired = [key for key, entry in self._store.items() if entry.expires_at <= now]
+        for key in expired:
+            self._remove(key)
+        self._expirations += len(expired)
+        return len(expired)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = time.monotonic()
+        self._maybe_sweep(now)
+        entry = self._store.get(key)
+        if entry is None:
+            self._misses += 1
+            return default
+        if entry.expires_at <= now:
+            self._remove(key)
+            self._expirations += 1
+            self._misses += 1
+            return default
+        self._store.move_to_end(key)
+        self._hits += 1
+        return entry.value
+
+    def set(self, key: Hashable, value: Any, *, ttl: float | None = None) -> None:
+        now = time.monotonic()
+        self._maybe_sweep(now)
+        ttl = self._ttl if ttl is None else ttl
+        expires_at = now + ttl if ttl is not None else float("inf")
+        size = self._sizeof(value) if self._max_bytes is not None else 0
+        self._remove(key)
+        self._store[key] = CacheEntry(value=value, expires_at=expires_at, size=size)
+        self._bytes += size
+        self._evict()
+
+    def _evict(self) -> None:
+        while self._store and (
+            (self._max_entries is not None and len(self._store) > self._max_entries)
+            or (self._max_bytes is not None and self._bytes > self._max_bytes)
+        ):
+            _, entry = self._store.popitem(last=False)
+            self._bytes -= entry.size
+            self._evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        self._remove(key)
+
+    def delete_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        for key in [key for key in self._store if predicate(key)]:
+            self._remove(key)
+
+    def clear(self) -> None:
+        self._store.clear()
+        self._bytes = 0
 
+    def _size_bytes(self) -> int:
+        return self._bytes
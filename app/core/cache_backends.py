@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Hashable
+
+from app.core.cache import CacheBackend, LRUCache
+from app.core.config import settings
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS cache_entries (
+        namespace TEXT NOT NULL,
+        key TEXT NOT NULL,
+        key_blob BLOB NOT NULL,
+        value BLOB NOT NULL,
+        expires_at REAL NOT NULL,
+        stored_at REAL NOT NULL,
+        PRIMARY KEY (namespace, key)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_cache_entries_stored_at ON cache_entries (namespace, stored_at)",
+)
+
+
+class SharedFileCache(CacheBackend):
+    """Кэш в SQLite-файле, общем для всех воркеров хоста.
+
+    Файл открывается в WAL-режиме с mmap, поэтому чтение попадания — это обращение
+    к отображённым в память страницам без внешнего сервиса. Значения хранятся в pickle.
+    Ограничение по числу записей применяется пачками и вытесняет самые старые записи:
+    честный LRU потребовал бы записи в файл на каждое чтение. Из корутин файл читается
+    и пишется в пуле потоков (``get_async``/``set_async``), чтобы ожидание блокировки
+    SQLite не останавливало цикл событий; соединение воркера защищено мьютексом.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        max_entries: int,
+        ttl_seconds: float | None = None,
+        *,
+        namespace: str | None = None,
+        sweep_interval_seconds: float = 60.0,
+        mmap_size: int = 64 * 1024 * 1024,
+    ) -> None:
+        super().__init__(namespace=namespace, ttl_seconds=ttl_seconds)
+        self._path = Path(path)
+        self._max_entries = max_entries
+        self._sweep_interval = sweep_interval_seconds
+        self._next_sweep = 0.0
+        self._mmap_size = mmap_size
+        self._connection: sqlite3.Connection | None = None
+        self._pid: int | None = None
+        self._lock = threading.RLock()
+
+    def _conn(self) -> sqlite3.Connection:
+        # соединение SQLite нельзя наследовать через fork, поэтому у каждого воркера своё
+        if self._connection is None or self._pid != os.getpid():
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(
+                self._path, timeout=5.0, isolation_level=None, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(f"PRAGMA mmap_size={int(self._mmap_size)}")
+            for statement in _SCHEMA:
+                connection.execute(statement)
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def _clock(self) -> float:
+        # у процессов общий только системный wall-clock, он же переживает перезапуск хоста
+        return time.time()
+
+    @staticmethod
+    def _encode_key(key: Hashable) -> str:
+        return repr(key)
+
+    def __len__(self) -> int:
+        with self._lock:
+            row = self._conn().execute(
+                "SELECT count(*) FROM cache_entries WHERE namespace = ? AND expires_at > ?",
+                (self.namespace, self._clock()),
+            ).fetchone()
+            return int(row[0])
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            row = self._conn().execute(
+                "SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, self._encode_key(key)),
+            ).fetchone()
+            if row is None:
+                self._misses += 1
+                return default
+            if row[1] <= self._clock():
+                self._expirations += 1
+                self._misses += 1
+                return default
+            self._hits += 1
+            return pickle.loads(row[0])  # noqa: S301 - файл пишет только само приложение
+
+    def set(self, key: Hashable, value: Any, *, ttl: float | None = None) -> None:
+        with self._lock:
+            now = self._clock()
+            ttl = self._ttl if ttl is None else ttl
+            expires_at = now + ttl if ttl is not None else float("inf")
+            self._conn().execute(
+                "INSERT OR REPLACE INTO cache_entries"
+                " (namespace, key, key_blob, value, expires_at, stored_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    self.namespace,
+                    self._encode_key(key),
+                    pickle.dumps(key, protocol=pickle.HIGHEST_PROTOCOL),
+                    pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+                    expires_at,
+                    now,
+                ),
+            )
+            if now >= self._next_sweep:
+                self.sweep(now)
+
+    async def get_async(self, key: Hashable, default: Any = None) -> Any:
+        return await asyncio.to_thread(self.get, key, default)
+
+    async def set_async(self, key: Hashable, value: Any, *, ttl: float | None = None) -> None:
+        await asyncio.to_thread(functools.partial(self.set, key, value, ttl=ttl))
+
+    def sweep(self, now: float | None = None) -> int:
+        with self._lock:
+            now = self._clock() if now is None else now
+            self._next_sweep = now + self._sweep_interval
+            connection = self._conn()
+            expired = connection.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND expires_at <= ?",
+                (self.namespace, now),
+            ).rowcount
+            self._expirations += expired
+            overflow = len(self) - self._max_entries
+            if overflow > 0:
+                self._evictions += connection.execute(
+                    "DELETE FROM cache_entries WHERE namespace = ? AND key IN ("
+                    " SELECT key FROM cache_entries WHERE namespace = ? ORDER BY stored_at LIMIT ?)",
+                    (self.namespace, self.namespace, overflow),
+                ).rowcount
+            return expired
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._conn().execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, self._encode_key(key)),
+            )
+
+    def delete_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        with self._lock:
+            connection = self._conn()
+            rows = connection.execute(
+                "SELECT key, key_blob FROM cache_entries WHERE namespace = ?", (self.namespace,)
+            ).fetchall()
+            doomed = [(self.namespace, key) for key, blob in rows if predicate(pickle.loads(blob))]  # noqa: S301
+            connection.executemany("DELETE FROM cache_entries WHERE namespace = ? AND key = ?", doomed)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn().execute("DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,))
+
+    def _size_bytes(self) -> int:
+        with self._lock:
+            row = self._conn().execute(
+                "SELECT coalesce(sum(length(value)), 0) FROM cache_entries WHERE namespace = ?",
+                (self.namespace,),
+            ).fetchone()
+            return int(row[0])
+
+
+def create_cache(
+    namespace: str,
+    *,
+    max_entries: int,
+    ttl_seconds: float | None = None,
+    sweep_interval_seconds: float = 60.0,
+) -> CacheBackend:
+    if settings.cache_backend == "shared":
+        return SharedFileCache(
+            settings.cache_shared_path,
+            max_entries=max_entries,
+            ttl_seconds=ttl_seconds,
+            namespace=namespace,
+            sweep_interval_seconds=sweep_interval_seconds,
+        )
+    return LRUCache(
+        max_entries=max_entries,
+        ttl_seconds=ttl_seconds,
+        namespace=namespace,
+        sweep_interval_seconds=sweep_interval_seconds,
+    )
@@ -28,8 +28,42 @@ class Settings(BaseSettings):
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
     refresh_token_expire_minutes: int = 60 * 24
+    token_cache_size: int = 10_000
 
+    password_hash_executor: Literal["thread", "process"] = "thread"  # noqa: S105 - вид пула, не пароль
+    password_hash_workers: int = 4
+    password_hash_max_pending: int = 64
+    password_hash_timeout_seconds: float = 5.0
+
+    cache_backend: Literal["memory", "shared"] = "memory"
+    cache_shared_path: str = "./.cache/mini_crm_cache.sqlite3"
     cache_ttl_seconds: int = 60
+    invalidation_bus_enabled: bool = True
+    invalidation_socket_dir: str = "/tmp/mini-crm-invalidation"  # noqa: S108
+    invalidation_batch_window_ms: int = 50
+    cache_max_entries: int = 10_000
+    cache_sweep_interval_seconds: int = 60
+    analytics_stale_seconds: int = 0
+    count_cache_ttl_seconds: int = 10
+    list_default_limit: int = 50
+    # жёсткий потолок страницы задач и активностей, что бы ни запросил клиент
+    list_max_limit: int = 200
+    # ниже этого порога оценка планировщика уточняется точным COUNT(*)
+    count_estimate_threshold: int = 1_000
+    principal_cache_size: int = 10_000
+    principal_cache_ttl_seconds: int = 60
+    funnel_velocity_settle_seconds: int = 5
+    deal_columns_cache_bytes: int = 256 * 1024 * 1024
+    # держим ниже размера пула соединений, чтобы одна сводка не вытеснила остальные запросы
+    dashboard_max_concurrency: int = 4
+    dashboard_timeout_seconds: float = 2.0
+    # опоздавшие расчёты сводок на процесс; сверх лимита они отменяются и не держат соединения
+    dashboard_max_background: int = 32
+    report_executor: Literal["thread", "process"] = "process"
+    report_workers: int = 2
+    report_batch_size: int = 5_000
+    report_timeout_seconds: int = 600
+    report_result_ttl_seconds: int = 24 * 3600
 
     @property
     def token_settings(self) -> TokenSettings:
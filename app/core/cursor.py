@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import base64
+import binascii
+from decimal import Decimal
+from typing import Any
+
+import orjson
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Тип {type(value).__name__} нельзя положить в курсор")
+
+
+def encode_cursor(payload: dict[str, Any]) -> str:
+    """Непрозрачный для клиента курсор: JSON в urlsafe base64 без паддинга."""
+    raw = orjson.dumps(payload, default=_default, option=orjson.OPT_SORT_KEYS)
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(token: str) -> dict[str, Any]:
+    try:
+        payload = orjson.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (binascii.Error, ValueError) as exc:
+        raise InvalidCursorError("Некорректный курсор") from exc
+    if not isinstance(payload, dict):
+        raise InvalidCursorError("Некорректный курсор")
+    return payload
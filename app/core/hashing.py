@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Literal, TypeVar
+
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_password
+
+T = TypeVar("T")
+
+ExecutorKind = Literal["thread", "process"]
+
+
+class HashingError(Exception):
+    pass
+
+
+class HashingOverloadedError(HashingError):
+    pass
+
+
+class HashingTimeoutError(HashingError):
+    pass
+
+
+@dataclass(frozen=True)
+class HashingPoolMetrics:
+    executor: ExecutorKind
+    max_workers: int
+    max_pending: int
+    in_flight: int
+    submitted: int
+    completed: int
+    rejected: int
+    timed_out: int
+    failed: int
+    avg_latency_ms: float
+
+
+class PasswordHasher:
+    """Выполняет bcrypt в отдельном пуле, чтобы не блокировать event loop."""
+
+    def __init__(
+        self,
+        *,
+        executor: ExecutorKind = "thread",
+        max_workers: int = 4,
+        max_pending: int = 64,
+        timeout_seconds: float = 5.0,
+    ) -> None:
+        self._executor_kind = executor
+        self._max_workers = max_workers
+        self._max_pending = max_pending
+        self._timeout = timeout_seconds
+        self._executor: Executor | None = None
+        self._in_flight = 0
+        self._submitted = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._failed = 0
+        self._total_latency = 0.0
+
+    @classmethod
+    def from_settings(cls) -> PasswordHasher:
+        return cls(
+            executor=settings.password_hash_executor,
+            max_workers=settings.password_hash_workers,
+            max_pending=settings.password_hash_max_pending,
+            timeout_seconds=settings.password_hash_timeout_seconds,
+        )
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self._executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix="password-hasher"
+                )
+        return self._executor
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        if self._in_flight >= self._max_pending:
+            self._rejected += 1
+            raise HashingOverloadedError("Сервис аутентификации перегружен, повторите попытку позже")
+
+        loop = asyncio.get_running_loop()
+        self._in_flight += 1
+        self._submitted += 1
+        started = time.perf_counter()
+        job = self._get_executor().submit(func, *args)
+        # слот освобождается только когда воркер действительно закончил, даже после таймаута
+        job.add_done_callback(lambda _: loop.call_soon_threadsafe(self._release))
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(job), timeout=self._timeout)
+        except asyncio.TimeoutError as exc:
+            self._timed_out += 1
+            raise HashingTimeoutError("Превышено время ожидания проверки пароля") from exc
+        except Exception:
+            self._failed += 1
+            raise
+        self._completed += 1
+        self._total_latency += time.perf_counter() - started
+        return result
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    def metrics(self) -> HashingPoolMetrics:
+        return HashingPoolMetrics(
+            executor=self._executor_kind,
+            max_workers=self._max_workers,
+            max_pending=self._max_pending,
+            in_flight=self._in_flight,
+            submitted=self._submitted,
+            completed=self._completed,
+            rejected=self._rejected,
+            timed_out=self._timed_out,
+            failed=self._failed,
+            avg_latency_ms=(self._total_latency / self._completed * 1000) if self._completed else 0.0,
+        )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher.from_settings()
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import os
+import socket
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable
+
+import orjson
+
+from app.core.config import settings
+
+Handler = Callable[[Any], object]
+
+logger = logging.getLogger(__name__)
+
+# держим датаграмму заметно меньше net.core.wmem_default
+_MAX_EVENTS_PER_DATAGRAM = 500
+
+
+class InvalidationBus:
+    """Рассылает сообщения об инвалидации всем воркерам хоста через UNIX datagram-сокеты.
+
+    Каждый воркер слушает свой сокет в общем каталоге. ``publish`` сразу применяет
+    событие локально, а соседям отправляет его пачкой по истечении окна батчинга;
+    повторы одного и того же (канал, ключ) в окне схлопываются в одно событие.
+    Доставка best-effort: потерянное сообщение лечится TTL соответствующего кэша.
+    """
+
+    def __init__(
+        self,
+        socket_dir: str | os.PathLike[str],
+        *,
+        batch_window_seconds: float = 0.05,
+        name: str | None = None,
+    ) -> None:
+        self._dir = Path(socket_dir)
+        self._window = batch_window_seconds
+        self._name = name
+        self._handlers: dict[str, list[Handler]] = defaultdict(list)
+        self._pending: dict[str, dict[bytes, Any]] = defaultdict(dict)
+        self._socket: socket.socket | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self.sent_datagrams = 0
+        self.received_events = 0
+
+    @property
+    def path(self) -> Path:
+        # pid берётся в момент обращения: при preload-форке воркеры наследуют уже созданный объект
+        return self._dir / f"{self._name or os.getpid()}.sock"
+
+    @property
+    def started(self) -> bool:
+        return self._socket is not None
+
+    def subscribe(self, channel: str, handler: Handler) -> None:
+        self._handlers[channel].append(handler)
+
+    def _apply(self, channel: str, key: Any) -> None:
+        for handler in self._handlers.get(channel, ()):
+            handler(key)
+
+    def publish(self, channel: str, key: Any) -> None:
+        self._apply(channel, key)
+        if self._socket is None or self._loop is None:
+            return
+        self._pending[channel][orjson.dumps(key)] = key
+        if self._flush_handle is None:
+            self._flush_handle = self._loop.call_later(self._window, self.flush)
+
+    def flush(self) -> None:
+        self._flush_handle = None
+        if self._socket is None or not self._pending:
+            self._pending.clear()
+            return
+        events = [[channel, key] for channel, keys in self._pending.items() for key in keys.values()]
+        self._pending.clear()
+        datagrams = [
+            orjson.dumps(events[start : start + _MAX_EVENTS_PER_DATAGRAM])
+            for start in range(0, len(events), _MAX_EVENTS_PER_DATAGRAM)
+        ]
+        for peer in self._dir.glob("*.sock"):
+            if peer == self.path:
+                continue
+            for datagram in datagrams:
+                try:
+                    self._socket.sendto(datagram, str(peer))
+                except (ConnectionRefusedError, FileNotFoundError):
+                    # воркер завершился, не убрав сокет
+                    with contextlib.suppress(FileNotFoundError):
+                        peer.unlink()
+                    break
+                except BlockingIOError:
+                    # буфер соседа переполнен: пропускаем, его кэш доживёт до TTL
+                    break
+                self.sent_datagrams += 1
+
+    def _on_readable(self) -> None:
+        if self._socket is None:
+            # событие готовности пришло уже после stop(): сокет закрыт, читать нечего
+            logger.warning("Сокет шины инвалидации закрыт, датаграммы не читаются")
+            return
+        while True:
+            try:
+                datagram = self._socket.recv(256 * 1024)
+            except (BlockingIOError, InterruptedError):
+                return
+            try:
+                events = orjson.loads(datagram)
+            except orjson.JSONDecodeError:
+                continue
+            for channel, key in events:
+                self.received_events += 1
+                self._apply(channel, key)
+
+    async def start(self) -> None:
+        if self._socket is not None or not hasattr(socket, "AF_UNIX"):
+            return
+        self._dir.mkdir(parents=True, exist_ok=True)
+        with contextlib.suppress(FileNotFoundError):
+            self.path.unlink()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.setblocking(False)
+        sock.bind(str(self.path))
+        self._socket = sock
+        self._loop = asyncio.get_running_loop()
+        self._loop.add_reader(sock.fileno(), self._on_readable)
+
+    async def stop(self) -> None:
+        if self._socket is None or self._loop is None:
+            return
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        self.flush()
+        self._loop.remove_reader(self._socket.fileno())
+        self._socket.close()
+        self._socket = None
+        self._loop = None
+        with contextlib.suppress(FileNotFoundError):
+            self.path.unlink()
+
+
+invalidation_bus = InvalidationBus(
+    settings.invalidation_socket_dir,
+    batch_window_seconds=settings.invalidation_batch_window_ms / 1000,
+)
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import math
+import struct
+import zlib
+from collections import Counter
+
+# ниже любого достижимого индекса, поэтому при сортировке корзин нули идут первыми
+ZERO_BUCKET = -(2**62)
+
+
+class LogHistogram:
+    """Гистограмма с геометрическими корзинами для квантилей положительных величин.
+
+    Корзина ``i`` покрывает ``[growth**i, growth**(i+1))``, поэтому квантиль
+    оценивается с относительной ошибкой не больше ``(growth - 1) / 2`` при
+    фиксированной памяти: число корзин растёт лишь логарифмически от диапазона.
+    Дробные значения меньше 1 получают отрицательные индексы, а нулевые и отрицательные
+    учитываются в отдельной корзине ``ZERO_BUCKET`` и оцениваются как 0. Гистограммы
+    с одним ``growth`` складываются, что позволяет обновлять их инкрементально,
+    а отрицательный ``count`` в ``add`` убирает ранее добавленное значение.
+    """
+
+    def __init__(self, growth: float = 1.05, counts: dict[int, int] | None = None) -> None:
+        if growth <= 1:
+            raise ValueError("growth должен быть больше 1")
+        self.growth = growth
+        self._log_growth = math.log(growth)
+        self.counts: Counter[int] = Counter(counts or {})
+
+    def __len__(self) -> int:
+        return sum(self.counts.values())
+
+    @property
+    def relative_error(self) -> float:
+        return math.sqrt(self.growth) - 1
+
+    def add(self, value: float, count: int = 1) -> None:
+        index = math.floor(math.log(value) / self._log_growth) if value > 0 else ZERO_BUCKET
+        self.counts[index] += count
+        if self.counts[index] <= 0:
+            del self.counts[index]
+
+    def merge(self, other: LogHistogram) -> None:
+        if other.growth != self.growth:
+            raise ValueError("Нельзя сложить гистограммы с разным growth")
+        self.counts.update(other.counts)
+
+    def quantile(self, q: float) -> float | None:
+        total = len(self)
+        if total == 0:
+            return None
+        rank = q * (total - 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen > rank:
+                # геометрическая середина корзины симметрично ограничивает относительную ошибку
+                return self._estimate(index)
+        return self._estimate(max(self.counts))
+
+    def _estimate(self, index: int) -> float:
+        return 0.0 if index == ZERO_BUCKET else float(self.growth ** (index + 0.5))
+
+    def to_dict(self) -> dict[str, int]:
+        return {str(index): count for index, count in self.counts.items() if count}
+
+    def to_bytes(self) -> bytes:
+        items = sorted(self.counts.items())
+        flat = [number for pair in items for number in pair]
+        return zlib.compress(struct.pack(f"<dI{len(flat)}q", self.growth, len(items), *flat))
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> LogHistogram:
+        raw = zlib.decompress(payload)
+        growth, size = struct.unpack_from("<dI", raw)
+        flat = struct.unpack_from(f"<{size * 2}q", raw, struct.calcsize("<dI"))
+        return cls(growth, dict(zip(flat[::2], flat[1::2], strict=True)))
+
+    @classmethod
+    def from_dict(cls, data: dict[str, int], growth: float = 1.05) -> LogHistogram:
+        return cls(growth, {int(index): count for index, count in data.items()})
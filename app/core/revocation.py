@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+from typing import Mapping
+
+from app.core.invalidation import invalidation_bus
+
+REVOCATIONS_CHANNEL = "revoked_tokens"
+
+
+def to_timestamp(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class RevocationStore:
+    """Множество отозванных jti/семейств refresh-токенов в памяти процесса.
+
+    Источник истины — таблица revoked_tokens; здесь держится её неистёкшая часть,
+    чтобы отказ по отозванному токену обходился без запроса к БД.
+    """
+
+    def __init__(self, prune_interval_seconds: float = 60.0) -> None:
+        self._expires: dict[str, float] = {}
+        self._prune_interval = prune_interval_seconds
+        self._next_prune = 0.0
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+    def load(self, entries: Mapping[str, datetime]) -> None:
+        for token_id, expires_at in entries.items():
+            self._expires[token_id] = to_timestamp(expires_at)
+        self.loaded = True
+
+    def add(self, token_id: str, expires_at: float) -> None:
+        self._expires[token_id] = expires_at
+        self.prune()
+
+    def is_revoked(self, token_id: str) -> bool:
+        expires_at = self._expires.get(token_id)
+        return expires_at is not None and expires_at > time.time()
+
+    def prune(self, *, force: bool = False) -> None:
+        now = time.time()
+        if not force and now < self._next_prune:
+            return
+        self._next_prune = now + self._prune_interval
+        for token_id in [key for key, expires_at in self._expires.items() if expires_at <= now]:
+            del self._expires[token_id]
+
+
+revocation_store = RevocationStore()
+
+
+def _apply_revocation(key: list[str | float]) -> None:
+    token_id, expires_at = key
+    revocation_store.add(str(token_id), float(expires_at))
+
+
+invalidation_bus.subscribe(REVOCATIONS_CHANNEL, _apply_revocation)
+
+
+def remember_revocation(token_id: str, expires_at: float) -> None:
+    invalidation_bus.publish(REVOCATIONS_CHANNEL, [token_id, expires_at])
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import hashlib
+import time
+import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
+from app.core.cache import LRUCache
 from app.core.config import settings
 
 try:  # pragma: no cover - защитный код от предупреждений passlib
@@ -19,6 +23,8 @@ except Exception:  # noqa: BLE001
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+verified_token_cache = LRUCache(max_entries=settings.token_cache_size, namespace="tokens")
+
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
@@ -28,13 +34,20 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
-def create_token(subject: str, expires_delta: timedelta, token_type: str) -> str:
+def create_token(
+    subject: str,
+    expires_delta: timedelta,
+    token_type: str,
+    extra_claims: Dict[str, Any] | None = None,
+) -> str:
     now = datetime.now(tz=timezone.utc)
     payload: Dict[str, Any] = {
         "sub": subject,
         "type": token_type,
+        "jti": uuid.uuid4().hex,
         "iat": now,
         "exp": now + expires_delta,
+        **(extra_claims or {}),
     }
     return jwt.encode(payload, settings.secret_key, algorithm=settings.algorithm)
 
@@ -47,11 +60,12 @@ def create_access_token(subject: str) -> str:
     )
 
 
-def create_refresh_token(subject: str) -> str:
+def create_refresh_token(subject: str, family_id: str | None = None) -> str:
     return create_token(
         subject,
         expires_delta=timedelta(minutes=settings.refresh_token_expire_minutes),
         token_type="refresh",
+        extra_claims={"fam": family_id or uuid.uuid4().hex},
     )
 
 
@@ -59,12 +73,24 @@ class TokenError(Exception):
     pass
 
 
-def decode_token(token: str, expected_type: str = "access") -> Dict[str, Any]:
+def _verify_token(token: str) -> Dict[str, Any]:
+    key = hashlib.sha256(token.encode()).digest()
+    payload: Dict[str, Any] | None = verified_token_cache.get(key)
+    if payload is not None:
+        return payload
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
     except JWTError as exc:
         raise TokenError("Невалидный токен") from exc
+    expires_at = payload.get("exp")
+    if isinstance(expires_at, (int, float)):
+        # запись живёт ровно до exp, после этого токен снова проходит полную проверку
+        verified_token_cache.set(key, payload, ttl=expires_at - time.time())
+    return payload
 
+
+def decode_token(token: str, expected_type: str = "access") -> Dict[str, Any]:
+    payload = dict(_verify_token(token))
     token_type = payload.get("type")
     if token_type != expected_type:
         raise TokenError("Неверный тип токена")
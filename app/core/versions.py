@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from typing import Hashable
+
+from app.core.invalidation import invalidation_bus
+
+DEAL_VERSIONS_CHANNEL = "deal_versions"
+
+
+class VersionCounter:
+    """Последние известные процессу ревизии; входят в ключи кэшей, чтобы запись устаревала после изменения.
+
+    Значения абсолютные (номер ревизии из БД), а не счётчики событий: повтор, склейка или
+    потеря сообщения не разводят воркеров — каждый берёт максимум из известного и полученного.
+    """
+
+    def __init__(self) -> None:
+        self._versions: dict[Hashable, int] = {}
+
+    def get(self, key: Hashable) -> int:
+        return self._versions.get(key, 0)
+
+    def observe(self, key: Hashable, version: int) -> int:
+        version = max(self._versions.get(key, 0), version)
+        self._versions[key] = version
+        return version
+
+
+deal_versions = VersionCounter()
+
+
+def _observe_deal_version(event: list[int]) -> None:
+    organization_id, revision = event
+    deal_versions.observe(organization_id, revision)
+
+
+invalidation_bus.subscribe(DEAL_VERSIONS_CHANNEL, _observe_deal_version)
+
+
+def publish_deal_version(organization_id: int, revision: int) -> None:
+    """Рассылает сохранённую ревизию сделок организации; вызывать после commit."""
+    invalidation_bus.publish(DEAL_VERSIONS_CHANNEL, [organization_id, revision])
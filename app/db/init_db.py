@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import get_password_hash
+from app.core.hashing import password_hasher
 from app.models.organization import Organization
 from app.models.organization_member import OrganizationMember, OrganizationRole
 from app.models.user import User
@@ -17,7 +17,7 @@ async def init_db(session: AsyncSession) -> None:
 
     user = User(
         email="owner@example.com",
-        hashed_password=get_password_hash("Owner123"),
+        hashed_password=await password_hasher.hash("Owner123"),
         name="Default Owner",
     )
     organization = Organization(name="Default Org")
@@ -5,10 +5,19 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_db
 from app.repositories.activity import ActivityRepository
+from app.repositories.analytics_sketch import AnalyticsSketchRepository
 from app.repositories.contact import ContactRepository
 from app.repositories.deal import DealRepository
+from app.repositories.deal_hourly_stat import DealHourlyStatRepository
+from app.repositories.deal_stat import DealStatRepository
+from app.repositories.funnel_checkpoint import FunnelCheckpointRepository
 from app.repositories.organization import OrganizationRepository
 from app.repositories.organization_member import OrganizationMemberRepository
+from app.repositories.organization_revision import OrganizationRevisionRepository
+from app.repositories.pipeline_total import PipelineTotalRepository
+from app.repositories.report_job import ReportJobRepository
+from app.repositories.revoked_token import RevokedTokenRepository
+from app.repositories.stage_probability import StageProbabilityRepository
 from app.repositories.task import TaskRepository
 from app.repositories.user import UserRepository
 
@@ -35,6 +44,16 @@ def get_deal_repository(session: AsyncSession = Depends(get_db)) -> DealReposito
     return DealRepository(session)
 
 
+def get_deal_stat_repository(session: AsyncSession = Depends(get_db)) -> DealStatRepository:
+    return DealStatRepository(session)
+
+
+def get_deal_hourly_stat_repository(
+    session: AsyncSession = Depends(get_db),
+) -> DealHourlyStatRepository:
+    return DealHourlyStatRepository(session)
+
+
 def get_task_repository(session: AsyncSession = Depends(get_db)) -> TaskRepository:
     return TaskRepository(session)
 
@@ -43,3 +62,37 @@ def get_activity_repository(session: AsyncSession = Depends(get_db)) -> Activity
     return ActivityRepository(session)
 
 
+def get_analytics_sketch_repository(
+    session: AsyncSession = Depends(get_db),
+) -> AnalyticsSketchRepository:
+    return AnalyticsSketchRepository(session)
+
+
+def get_revoked_token_repository(session: AsyncSession = Depends(get_db)) -> RevokedTokenRepository:
+    return RevokedTokenRepository(session)
+
+
+def get_organization_revision_repository(
+    session: AsyncSession = Depends(get_db),
+) -> OrganizationRevisionRepository:
+    return OrganizationRevisionRepository(session)
+
+
+def get_funnel_checkpoint_repository(
+    session: AsyncSession = Depends(get_db),
+) -> FunnelCheckpointRepository:
+    return FunnelCheckpointRepository(session)
+
+
+def get_pipeline_total_repository(session: AsyncSession = Depends(get_db)) -> PipelineTotalRepository:
+    return PipelineTotalRepository(session)
+
+
+def get_stage_probability_repository(
+    session: AsyncSession = Depends(get_db),
+) -> StageProbabilityRepository:
+    return StageProbabilityRepository(session)
+
+
+def get_report_job_repository(session: AsyncSession = Depends(get_db)) -> ReportJobRepository:
+    return ReportJobRepository(session)
@@ -6,26 +6,51 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.session import get_db
 from app.dependencies.repositories import (
     get_activity_repository,
+    get_analytics_sketch_repository,
     get_contact_repository,
+    get_deal_hourly_stat_repository,
     get_deal_repository,
+    get_deal_stat_repository,
+    get_funnel_checkpoint_repository,
     get_organization_member_repository,
     get_organization_repository,
+    get_organization_revision_repository,
+    get_pipeline_total_repository,
+    get_report_job_repository,
+    get_revoked_token_repository,
+    get_stage_probability_repository,
     get_task_repository,
     get_user_repository,
 )
 from app.repositories.activity import ActivityRepository
+from app.repositories.analytics_sketch import AnalyticsSketchRepository
 from app.repositories.contact import ContactRepository
 from app.repositories.deal import DealRepository
+from app.repositories.deal_hourly_stat import DealHourlyStatRepository
+from app.repositories.deal_stat import DealStatRepository
+from app.repositories.funnel_checkpoint import FunnelCheckpointRepository
 from app.repositories.organization import OrganizationRepository
 from app.repositories.organization_member import OrganizationMemberRepository
+from app.repositories.organization_revision import OrganizationRevisionRepository
+from app.repositories.pipeline_total import PipelineTotalRepository
+from app.repositories.report_job import ReportJobRepository
+from app.repositories.revoked_token import RevokedTokenRepository
+from app.repositories.stage_probability import StageProbabilityRepository
 from app.repositories.task import TaskRepository
 from app.repositories.user import UserRepository
 from app.services.activities import ActivityService
+from app.services.amount_distribution import AmountDistributionService
 from app.services.analytics import AnalyticsService
 from app.services.auth import AuthService
 from app.services.contacts import ContactService
+from app.services.dashboard import DashboardService
 from app.services.deals import DealService
+from app.services.forecast import ForecastService
+from app.services.funnel_velocity import FunnelVelocityService
 from app.services.organizations import OrganizationService
+from app.services.principals import PrincipalResolver
+from app.services.reports import ReportJobService
+from app.services.sketches import SketchAnalyticsService
 from app.services.tasks import TaskService
 
 
@@ -34,12 +59,14 @@ def get_auth_service(
     user_repo: UserRepository = Depends(get_user_repository),
     org_repo: OrganizationRepository = Depends(get_organization_repository),
     member_repo: OrganizationMemberRepository = Depends(get_organization_member_repository),
+    revoked_repo: RevokedTokenRepository = Depends(get_revoked_token_repository),
 ) -> AuthService:
     return AuthService(
         session=session,
         user_repo=user_repo,
         org_repo=org_repo,
         member_repo=member_repo,
+        revoked_repo=revoked_repo,
     )
 
 
@@ -51,12 +78,26 @@ def get_organization_service(
     return OrganizationService(session=session, org_repo=org_repo, member_repo=member_repo)
 
 
+def get_principal_resolver(
+    session: AsyncSession = Depends(get_db),
+    user_repo: UserRepository = Depends(get_user_repository),
+    member_repo: OrganizationMemberRepository = Depends(get_organization_member_repository),
+) -> PrincipalResolver:
+    return PrincipalResolver(session=session, user_repo=user_repo, member_repo=member_repo)
+
+
 def get_contact_service(
     session: AsyncSession = Depends(get_db),
     contact_repo: ContactRepository = Depends(get_contact_repository),
     deal_repo: DealRepository = Depends(get_deal_repository),
+    revision_repo: OrganizationRevisionRepository = Depends(get_organization_revision_repository),
 ) -> ContactService:
-    return ContactService(session=session, contact_repo=contact_repo, deal_repo=deal_repo)
+    return ContactService(
+        session=session,
+        contact_repo=contact_repo,
+        deal_repo=deal_repo,
+        revision_repo=revision_repo,
+    )
 
 
 def get_deal_service(
@@ -64,12 +105,22 @@ def get_deal_service(
     deal_repo: DealRepository = Depends(get_deal_repository),
     contact_repo: ContactRepository = Depends(get_contact_repository),
     activity_repo: ActivityRepository = Depends(get_activity_repository),
+    revision_repo: OrganizationRevisionRepository = Depends(get_organization_revision_repository),
+    stats_repo: DealStatRepository = Depends(get_deal_stat_repository),
+    hourly_stats_repo: DealHourlyStatRepository = Depends(get_deal_hourly_stat_repository),
+    pipeline_repo: PipelineTotalRepository = Depends(get_pipeline_total_repository),
+    sketch_repo: AnalyticsSketchRepository = Depends(get_analytics_sketch_repository),
 ) -> DealService:
     return DealService(
         session=session,
         deal_repo=deal_repo,
         contact_repo=contact_repo,
         activity_repo=activity_repo,
+        revision_repo=revision_repo,
+        stats_repo=stats_repo,
+        hourly_stats_repo=hourly_stats_repo,
+        pipeline_repo=pipeline_repo,
+        sketch_repo=sketch_repo,
     )
 
 
@@ -77,22 +128,97 @@ def get_task_service(
     session: AsyncSession = Depends(get_db),
     task_repo: TaskRepository = Depends(get_task_repository),
     deal_repo: DealRepository = Depends(get_deal_repository),
+    revision_repo: OrganizationRevisionRepository = Depends(get_organization_revision_repository),
 ) -> TaskService:
-    return TaskService(session=session, task_repo=task_repo, deal_repo=deal_repo)
+    return TaskService(
+        session=session,
+        task_repo=task_repo,
+        deal_repo=deal_repo,
+        revision_repo=revision_repo,
+    )
 
 
 def get_activity_service(
     session: AsyncSession = Depends(get_db),
     activity_repo: ActivityRepository = Depends(get_activity_repository),
     deal_repo: DealRepository = Depends(get_deal_repository),
+    sketch_repo: AnalyticsSketchRepository = Depends(get_analytics_sketch_repository),
 ) -> ActivityService:
-    return ActivityService(session=session, activity_repo=activity_repo, deal_repo=deal_repo)
+    return ActivityService(
+        session=session, activity_repo=activity_repo, deal_repo=deal_repo, sketch_repo=sketch_repo
+    )
 
 
 def get_analytics_service(
     session: AsyncSession = Depends(get_db),
     deal_repo: DealRepository = Depends(get_deal_repository),
+    stats_repo: DealStatRepository = Depends(get_deal_stat_repository),
+    hourly_stats_repo: DealHourlyStatRepository = Depends(get_deal_hourly_stat_repository),
+    revision_repo: OrganizationRevisionRepository = Depends(get_organization_revision_repository),
 ) -> AnalyticsService:
-    return AnalyticsService(session=session, deal_repo=deal_repo)
+    return AnalyticsService(
+        session=session,
+        deal_repo=deal_repo,
+        stats_repo=stats_repo,
+        hourly_stats_repo=hourly_stats_repo,
+        revision_repo=revision_repo,
+    )
 
 
+def get_funnel_velocity_service(
+    session: AsyncSession = Depends(get_db),
+    activity_repo: ActivityRepository = Depends(get_activity_repository),
+    deal_repo: DealRepository = Depends(get_deal_repository),
+    checkpoint_repo: FunnelCheckpointRepository = Depends(get_funnel_checkpoint_repository),
+) -> FunnelVelocityService:
+    return FunnelVelocityService(
+        session=session,
+        activity_repo=activity_repo,
+        deal_repo=deal_repo,
+        checkpoint_repo=checkpoint_repo,
+    )
+
+
+def get_amount_distribution_service(
+    session: AsyncSession = Depends(get_db),
+    deal_repo: DealRepository = Depends(get_deal_repository),
+    revision_repo: OrganizationRevisionRepository = Depends(get_organization_revision_repository),
+) -> AmountDistributionService:
+    return AmountDistributionService(
+        session=session, deal_repo=deal_repo, revision_repo=revision_repo
+    )
+
+
+def get_forecast_service(
+    session: AsyncSession = Depends(get_db),
+    pipeline_repo: PipelineTotalRepository = Depends(get_pipeline_total_repository),
+    probability_repo: StageProbabilityRepository = Depends(get_stage_probability_repository),
+    revision_repo: OrganizationRevisionRepository = Depends(get_organization_revision_repository),
+) -> ForecastService:
+    return ForecastService(
+        session=session,
+        pipeline_repo=pipeline_repo,
+        probability_repo=probability_repo,
+        revision_repo=revision_repo,
+    )
+
+
+def get_sketch_analytics_service(
+    session: AsyncSession = Depends(get_db),
+    sketch_repo: AnalyticsSketchRepository = Depends(get_analytics_sketch_repository),
+) -> SketchAnalyticsService:
+    return SketchAnalyticsService(session=session, sketch_repo=sketch_repo)
+
+
+def get_dashboard_service(
+    session: AsyncSession = Depends(get_db),
+    member_repo: OrganizationMemberRepository = Depends(get_organization_member_repository),
+) -> DashboardService:
+    return DashboardService(session=session, member_repo=member_repo)
+
+
+def get_report_job_service(
+    session: AsyncSession = Depends(get_db),
+    job_repo: ReportJobRepository = Depends(get_report_job_repository),
+) -> ReportJobService:
+    return ReportJobService(session=session, job_repo=job_repo)
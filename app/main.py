@@ -1,13 +1,33 @@
 from __future__ import annotations
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+from typing import Any
+
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
 from app.api.v1.router import api_router
+from app.core.cache import cache_stats
 from app.core.config import settings
+from app.core.hashing import password_hasher
+from app.core.invalidation import invalidation_bus
 from app.services import exceptions
+from app.services.reports import report_runner
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    if settings.invalidation_bus_enabled:
+        await invalidation_bus.start()
+    yield
+    await invalidation_bus.stop()
+    password_hasher.shutdown()
+    report_runner.shutdown()
+
 
-app = FastAPI(title=settings.app_name, version="1.0.0")
+app = FastAPI(title=settings.app_name, version="1.0.0", lifespan=lifespan)
 app.include_router(api_router, prefix=settings.api_v1_prefix)
 
 
@@ -16,3 +36,11 @@ async def service_error_handler(request: Request, exc: exceptions.ServiceError)
     return JSONResponse(status_code=exc.status_code, content={"detail": exc.message})
 
 
+@app.get("/health")
+async def health() -> dict[str, Any]:
+    """Состояние процесса: очередь пула хеширования паролей (отказы, таймауты) и счётчики кэшей."""
+    return {
+        "status": "ok",
+        "password_hashing": asdict(password_hasher.metrics()),
+        "caches": {namespace: asdict(stats) for namespace, stats in cache_stats().items()},
+    }
@@ -1,21 +1,45 @@
 from app.models.activity import Activity, ActivityType
+from app.models.analytics_sketch import AnalyticsSketch, AnalyticsSketchObservation, SketchKind
 from app.models.contact import Contact
 from app.models.deal import Deal, DealStage, DealStatus
+from app.models.deal_hourly_stat import DealHourlyStat
+from app.models.deal_stat import DealStat
+from app.models.funnel_checkpoint import FunnelCheckpoint
 from app.models.organization import Organization
 from app.models.organization_member import OrganizationMember, OrganizationRole
+from app.models.organization_revision import OrganizationRevision, RevisionEntity
+from app.models.pipeline_total import PipelineTotal
+from app.models.report_job import ReportJob, ReportKind, ReportStatus
+from app.models.revoked_token import RevocationKind, RevokedToken
+from app.models.stage_probability import StageProbability
 from app.models.task import Task
 from app.models.user import User
 
 __all__ = [
     "Activity",
     "ActivityType",
+    "AnalyticsSketch",
+    "AnalyticsSketchObservation",
     "Contact",
     "Deal",
+    "DealHourlyStat",
     "DealStage",
+    "DealStat",
     "DealStatus",
+    "FunnelCheckpoint",
     "Organization",
     "OrganizationMember",
+    "OrganizationRevision",
     "OrganizationRole",
+    "PipelineTotal",
+    "ReportJob",
+    "ReportKind",
+    "ReportStatus",
+    "RevisionEntity",
+    "RevocationKind",
+    "RevokedToken",
+    "SketchKind",
+    "StageProbability",
     "Task",
     "User",
 ]
@@ -3,7 +3,7 @@ from __future__ import annotations
 import enum
 from datetime import datetime
 
-from sqlalchemy import Enum, ForeignKey, JSON, func
+from sqlalchemy import Enum, ForeignKey, Index, JSON, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -20,7 +20,7 @@ class ActivityType(str, enum.Enum):
 class Activity(Base):
     __tablename__ = "activities"
 
-    deal_id: Mapped[int] = mapped_column(ForeignKey("deals.id"), nullable=False, index=True)
+    deal_id: Mapped[int] = mapped_column(ForeignKey("deals.id"), nullable=False)
     author_id: Mapped[int | None] = mapped_column(ForeignKey("users.id"), nullable=True)
     type: Mapped[ActivityType] = mapped_column(Enum(ActivityType), default=ActivityType.system, nullable=False)
     payload: Mapped[dict | None] = mapped_column(JSON, nullable=True)
@@ -28,4 +28,9 @@ class Activity(Base):
 
     deal = relationship("Deal", back_populates="activities")
 
+    __table_args__ = (
+        # лента сделки: фильтр по deal_id и keyset по (created_at, id) читаются из одного индекса
+        Index("ix_activities_deal_created", "deal_id", "created_at", "id"),
+    )
+
 
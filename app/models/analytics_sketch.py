@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import enum
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import Enum, ForeignKey, Index, LargeBinary, Numeric, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class SketchKind(str, enum.Enum):
+    active_contacts = "active_contacts"
+    deal_amounts = "deal_amounts"
+
+
+class AnalyticsSketch(Base):
+    """Сериализованный вероятностный скетч организации за календарный месяц (UTC)."""
+
+    __tablename__ = "analytics_sketches"
+
+    organization_id: Mapped[int] = mapped_column(ForeignKey("organizations.id"), nullable=False)
+    kind: Mapped[SketchKind] = mapped_column(Enum(SketchKind), nullable=False)
+    # первое число месяца
+    bucket_start: Mapped[date] = mapped_column(nullable=False)
+    payload: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("organization_id", "kind", "bucket_start", name="uq_analytics_sketches_bucket"),
+    )
+
+
+class AnalyticsSketchObservation(Base):
+    """Наблюдение для месячного скетча, ещё не свёрнутое в ``AnalyticsSketch``.
+
+    Запись сделки или активности только добавляет строку, не блокируя общую строку скетча
+    организации; ``value`` — id контакта или сумма сделки, ``count`` со знаком минус
+    убирает сумму из гистограммы.
+    """
+
+    __tablename__ = "analytics_sketch_observations"
+
+    organization_id: Mapped[int] = mapped_column(ForeignKey("organizations.id"), nullable=False)
+    kind: Mapped[SketchKind] = mapped_column(Enum(SketchKind), nullable=False)
+    bucket_start: Mapped[date] = mapped_column(nullable=False)
+    value: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False)
+    count: Mapped[int] = mapped_column(default=1, nullable=False)
+
+    __table_args__ = (
+        Index("ix_analytics_sketch_observations_bucket", "organization_id", "kind", "bucket_start"),
+    )
@@ -2,8 +2,9 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, String, func
+from sqlalchemy import DDL, ForeignKey, Index, String, event, func, literal
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql.elements import ColumnElement
 
 from app.db.base import Base
 
@@ -22,4 +23,66 @@ class Contact(Base):
     owner = relationship("User", back_populates="contacts")
     deals = relationship("Deal", back_populates="contact")
 
+    __table_args__ = (
+        Index("ix_contacts_org_created", "organization_id", "created_at", "id"),
+        Index("ix_contacts_org_owner", "organization_id", "owner_id"),
+    )
 
+
+# конфигурация подставляется в SQL литералом, иначе планировщик не сопоставит выражение с индексом
+SEARCH_CONFIG = literal("simple", literal_execute=True)
+
+
+def contact_search_document() -> ColumnElement[object]:
+    """tsvector имени для полнотекстового поиска на PostgreSQL; совпадает с выражением индекса."""
+    return func.to_tsvector(SEARCH_CONFIG, Contact.name)
+
+
+# PostgreSQL: триграммы обслуживают ILIKE '%x%' по любой части строки, tsvector — совпадения слов
+Index(
+    "ix_contacts_name_trgm", Contact.name, postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}
+).ddl_if(dialect="postgresql")
+Index(
+    "ix_contacts_email_trgm", Contact.email, postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"}
+).ddl_if(dialect="postgresql")
+Index(
+    "ix_contacts_phone_trgm", Contact.phone, postgresql_using="gin", postgresql_ops={"phone": "gin_trgm_ops"}
+).ddl_if(dialect="postgresql")
+Index("ix_contacts_search_document", contact_search_document(), postgresql_using="gin").ddl_if(dialect="postgresql")
+
+
+def _ddl(statement: str, *, dialect: str) -> DDL:
+    """DDL-команда только для указанного диалекта; конструктор DDL в SQLAlchemy не аннотирован."""
+    return DDL(statement).execute_if(dialect=dialect)  # type: ignore[no-untyped-call]
+
+
+event.listen(
+    Contact.__table__,
+    "before_create",
+    _ddl("CREATE EXTENSION IF NOT EXISTS pg_trgm", dialect="postgresql"),
+)
+
+# SQLite: внешняя FTS5-таблица с триграммным токенизатором поверх contacts, синхронизируется триггерами
+CONTACTS_FTS_DDL = (
+    "CREATE VIRTUAL TABLE contacts_fts USING fts5("
+    "name, email, phone, content='contacts', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER contacts_fts_insert AFTER INSERT ON contacts BEGIN"
+    " INSERT INTO contacts_fts(rowid, name, email, phone) VALUES (new.id, new.name, new.email, new.phone);"
+    " END",
+    "CREATE TRIGGER contacts_fts_delete AFTER DELETE ON contacts BEGIN"
+    " INSERT INTO contacts_fts(contacts_fts, rowid, name, email, phone)"
+    " VALUES ('delete', old.id, old.name, old.email, old.phone);"
+    " END",
+    "CREATE TRIGGER contacts_fts_update AFTER UPDATE ON contacts BEGIN"
+    " INSERT INTO contacts_fts(contacts_fts, rowid, name, email, phone)"
+    " VALUES ('delete', old.id, old.name, old.email, old.phone);"
+    " INSERT INTO contacts_fts(rowid, name, email, phone) VALUES (new.id, new.name, new.email, new.phone);"
+    " END",
+)
+for _statement in CONTACTS_FTS_DDL:
+    event.listen(Contact.__table__, "after_create", _ddl(_statement, dialect="sqlite"))
+event.listen(
+    Contact.__table__,
+    "before_drop",
+    _ddl("DROP TABLE IF EXISTS contacts_fts", dialect="sqlite"),
+)
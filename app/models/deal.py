@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 import enum
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 
-from sqlalchemy import DECIMAL, Enum, ForeignKey, String, func
+from sqlalchemy import DECIMAL, Enum, ForeignKey, Index, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -35,6 +35,7 @@ class Deal(Base):
     currency: Mapped[str] = mapped_column(String(10), default="USD", nullable=False)
     status: Mapped[DealStatus] = mapped_column(Enum(DealStatus), default=DealStatus.new, nullable=False)
     stage: Mapped[DealStage] = mapped_column(Enum(DealStage), default=DealStage.qualification, nullable=False)
+    expected_close_date: Mapped[date | None] = mapped_column(nullable=True)
     created_at: Mapped[datetime] = mapped_column(server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(server_default=func.now(), onupdate=func.now(), nullable=False)
 
@@ -44,4 +45,13 @@ class Deal(Base):
     tasks = relationship("Task", back_populates="deal", cascade="all, delete")
     activities = relationship("Activity", back_populates="deal", cascade="all, delete")
 
+    __table_args__ = (
+        # все списки и агрегаты сначала фильтруют по организации
+        Index("ix_deals_org_created", "organization_id", "created_at", "id"),
+        Index("ix_deals_org_status", "organization_id", "status"),
+        Index("ix_deals_org_stage", "organization_id", "stage"),
+        Index("ix_deals_org_owner", "organization_id", "owner_id"),
+        Index("ix_deals_contact_id", "contact_id"),
+    )
+
 
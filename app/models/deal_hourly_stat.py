@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import ForeignKey, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class DealHourlyStat(Base):
+    __tablename__ = "deal_hourly_stats"
+
+    organization_id: Mapped[int] = mapped_column(ForeignKey("organizations.id"), nullable=False)
+    # начало часа в UTC без tzinfo, как и остальные метки времени в БД
+    bucket_start: Mapped[datetime] = mapped_column(nullable=False)
+    created_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    # события закрытия за час, а не число сделок в статусе: откат статуса их не уменьшает
+    won_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    lost_count: Mapped[int] = mapped_column(nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("organization_id", "bucket_start", name="uq_deal_hourly_stats_bucket"),
+    )
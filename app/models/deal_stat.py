@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+from sqlalchemy import DECIMAL, Enum, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.models.deal import DealStage, DealStatus
+
+
+class DealStat(Base):
+    __tablename__ = "deal_stats"
+
+    organization_id: Mapped[int] = mapped_column(ForeignKey("organizations.id"), nullable=False)
+    status: Mapped[DealStatus] = mapped_column(Enum(DealStatus), nullable=False)
+    stage: Mapped[DealStage] = mapped_column(Enum(DealStage), nullable=False)
+    deal_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    amount_total: Mapped[Decimal] = mapped_column(DECIMAL(18, 2), nullable=False, default=0)
+
+    __table_args__ = (UniqueConstraint("organization_id", "status", "stage", name="uq_deal_stats_bucket"),)
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import enum
+
+from sqlalchemy import ForeignKey, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class RevisionEntity(str, enum.Enum):
+    deals = "deals"
+    contacts = "contacts"
+    tasks = "tasks"
+
+
+class OrganizationRevision(Base):
+    __tablename__ = "organization_revisions"
+
+    organization_id: Mapped[int] = mapped_column(ForeignKey("organizations.id"), nullable=False)
+    entity: Mapped[str] = mapped_column(String(32), nullable=False)
+    revision: Mapped[int] = mapped_column(nullable=False, default=0)
+
+    __table_args__ = (UniqueConstraint("organization_id", "entity", name="uq_org_revision_entity"),)
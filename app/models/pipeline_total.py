@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import DECIMAL, Enum, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.models.deal import DealStage
+
+
+class PipelineTotal(Base):
+    """Открытые сделки организации по владельцу, стадии и месяцу ожидаемого закрытия."""
+
+    __tablename__ = "pipeline_totals"
+
+    organization_id: Mapped[int] = mapped_column(ForeignKey("organizations.id"), nullable=False)
+    owner_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    stage: Mapped[DealStage] = mapped_column(Enum(DealStage), nullable=False)
+    # первое число месяца; сделки без даты закрытия лежат под UNSCHEDULED_MONTH,
+    # потому что NULL в уникальном ключе не даёт upsert найти строку
+    close_month: Mapped[date] = mapped_column(nullable=False)
+    deal_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    amount_total: Mapped[Decimal] = mapped_column(DECIMAL(18, 2), nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("organization_id", "owner_id", "stage", "close_month", name="uq_pipeline_totals_bucket"),
+    )
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import enum
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import JSON, Enum, ForeignKey, Index, String, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class ReportKind(str, enum.Enum):
+    cohort_conversion = "cohort_conversion"
+    owner_leaderboard = "owner_leaderboard"
+    year_over_year = "year_over_year"
+
+
+class ReportStatus(str, enum.Enum):
+    pending = "pending"
+    running = "running"
+    done = "done"
+    failed = "failed"
+
+
+_ACTIVE = text("status IN ('pending', 'running')")
+
+
+class ReportJob(Base):
+    __tablename__ = "report_jobs"
+
+    organization_id: Mapped[int] = mapped_column(ForeignKey("organizations.id"), nullable=False)
+    requested_by_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    kind: Mapped[ReportKind] = mapped_column(Enum(ReportKind), nullable=False)
+    params: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
+    # sha256 от вида отчёта и нормализованных параметров — ключ дедупликации
+    params_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    status: Mapped[ReportStatus] = mapped_column(Enum(ReportStatus), default=ReportStatus.pending, nullable=False)
+    result: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    error: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now(), nullable=False)
+    started_at: Mapped[datetime | None] = mapped_column(nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(nullable=True)
+    expires_at: Mapped[datetime | None] = mapped_column(nullable=True)
+
+    __table_args__ = (
+        # одинаковый отчёт организации может выполняться только один раз одновременно
+        Index(
+            "uq_report_jobs_active",
+            "organization_id",
+            "kind",
+            "params_hash",
+            unique=True,
+            postgresql_where=_ACTIVE,
+            sqlite_where=_ACTIVE,
+        ),
+        Index("ix_report_jobs_expires_at", "expires_at"),
+    )
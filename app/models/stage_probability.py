@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+from sqlalchemy import DECIMAL, Enum, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.models.deal import DealStage
+
+
+class StageProbability(Base):
+    __tablename__ = "stage_probabilities"
+
+    organization_id: Mapped[int] = mapped_column(ForeignKey("organizations.id"), nullable=False)
+    stage: Mapped[DealStage] = mapped_column(Enum(DealStage), nullable=False)
+    probability: Mapped[Decimal] = mapped_column(DECIMAL(5, 4), nullable=False)
+
+    __table_args__ = (UniqueConstraint("organization_id", "stage", name="uq_stage_probability"),)
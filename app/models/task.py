@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import date, datetime
 
-from sqlalchemy import Boolean, Date, ForeignKey, String, func
+from sqlalchemy import Boolean, Date, ForeignKey, Index, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -22,4 +22,9 @@ class Task(Base):
     deal = relationship("Deal", back_populates="tasks")
     owner = relationship("User", back_populates="tasks")
 
+    __table_args__ = (
+        Index("ix_tasks_deal_due_date", "deal_id", "due_date"),
+        Index("ix_tasks_owner_open_due_date", "owner_id", "is_done", "due_date"),
+    )
+
 
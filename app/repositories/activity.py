@@ -1,19 +1,92 @@
 from __future__ import annotations
 
-from sqlalchemy import select
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Row, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
-from app.models.activity import Activity
-from app.repositories.base import BaseRepository
+from app.models.activity import Activity, ActivityType
+from app.models.deal import Deal
+from app.repositories.base import BaseRepository, Page
 
 
 class ActivityRepository(BaseRepository[Activity]):
+    sort_keys = ("created_at",)
+
     def __init__(self, session: AsyncSession):
         super().__init__(session, Activity)
 
-    async def list_for_deal(self, deal_id: int) -> list[Activity]:
-        stmt = select(Activity).where(Activity.deal_id == deal_id).order_by(Activity.created_at.desc())
+    async def list_for_deal(
+        self,
+        deal_id: int,
+        *,
+        order: str = "desc",
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> Page[Activity]:
+        stmt = select(Activity).where(Activity.deal_id == deal_id)
+        return await self.paginate(stmt, order_by="created_at", order=order, limit=limit, cursor=cursor)
+
+    async def last_settled_id(self, organization_id: int, *, created_before: datetime) -> int:
+        stmt = (
+            select(func.max(Activity.id))
+            .join(Deal, Deal.id == Activity.deal_id)
+            .where(Deal.organization_id == organization_id, Activity.created_at <= created_before)
+        )
         result = await self.session.execute(stmt)
-        return list(result.scalars().all())
+        return result.scalar_one() or 0
 
+    async def stream_stage_history(
+        self,
+        organization_id: int,
+        *,
+        after_id: int,
+        until_id: int,
+        batch_size: int = 1_000,
+    ) -> AsyncIterator[Row[Any]]:
+        """Смены стадии и статуса в диапазоне id, упорядоченные по сделке, затем по id.
 
+        К каждой строке добавлены создание сделки и последняя смена стадии до ``after_id``,
+        чтобы продолжить подсчёт с чекпоинта, не перечитывая старые активности.
+        """
+        prior = aliased(Activity)
+        prior_stage_change = (
+            select(prior.id)
+            .where(
+                prior.deal_id == Activity.deal_id,
+                prior.type == ActivityType.stage_changed,
+                prior.id <= after_id,
+            )
+            .order_by(prior.id.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        previous = aliased(Activity)
+        stmt = (
+            select(
+                Activity.id,
+                Activity.deal_id,
+                Activity.type,
+                Activity.payload,
+                Activity.created_at,
+                Deal.created_at.label("deal_created_at"),
+                previous.payload.label("prior_payload"),
+                previous.created_at.label("prior_created_at"),
+            )
+            .join(Deal, Deal.id == Activity.deal_id)
+            .outerjoin(previous, previous.id == prior_stage_change)
+            .where(
+                Deal.organization_id == organization_id,
+                Activity.id > after_id,
+                Activity.id <= until_id,
+                Activity.type.in_([ActivityType.stage_changed, ActivityType.status_changed]),
+            )
+            .order_by(Activity.deal_id, Activity.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.session.stream(stmt)
+        async for row in result:
+            yield row
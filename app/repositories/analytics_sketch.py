@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any, Callable, Literal, cast, overload
+
+from sqlalchemy import CursorResult, delete, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.quantiles import LogHistogram
+from app.core.sketches import HyperLogLog
+from app.models.activity import Activity
+from app.models.analytics_sketch import AnalyticsSketch, AnalyticsSketchObservation, SketchKind
+from app.models.deal import Deal
+from app.repositories.base import BaseRepository
+
+Sketch = HyperLogLog | LogHistogram
+
+HLL_PRECISION = 12
+# шаг 2% даёт относительную ошибку квантилей около 1%
+AMOUNT_GROWTH = 1.02
+_BATCH = 5_000
+
+
+def month_start(moment: datetime | date) -> date:
+    if isinstance(moment, datetime):
+        if moment.tzinfo is not None:
+            moment = moment.astimezone(timezone.utc)
+        moment = moment.date()
+    return moment.replace(day=1)
+
+
+@overload
+def new_sketch(kind: Literal[SketchKind.active_contacts]) -> HyperLogLog: ...
+@overload
+def new_sketch(kind: Literal[SketchKind.deal_amounts]) -> LogHistogram: ...
+@overload
+def new_sketch(kind: SketchKind) -> Sketch: ...
+def new_sketch(kind: SketchKind) -> Sketch:
+    if kind == SketchKind.active_contacts:
+        return HyperLogLog(HLL_PRECISION)
+    return LogHistogram(AMOUNT_GROWTH)
+
+
+@overload
+def load_sketch(kind: Literal[SketchKind.active_contacts], payload: bytes) -> HyperLogLog: ...
+@overload
+def load_sketch(kind: Literal[SketchKind.deal_amounts], payload: bytes) -> LogHistogram: ...
+@overload
+def load_sketch(kind: SketchKind, payload: bytes) -> Sketch: ...
+def load_sketch(kind: SketchKind, payload: bytes) -> Sketch:
+    if kind == SketchKind.active_contacts:
+        return HyperLogLog.from_bytes(payload)
+    return LogHistogram.from_bytes(payload)
+
+
+def apply_observation(sketch: Sketch, value: Decimal, count: int) -> None:
+    if isinstance(sketch, HyperLogLog):
+        # id контакта хранится в Numeric; хэш HyperLogLog считается от int
+        sketch.add(int(value))
+    else:
+        sketch.add(float(value), count)
+
+
+class AnalyticsSketchRepository(BaseRepository[AnalyticsSketch]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, AnalyticsSketch)
+
+    async def _modify(
+        self,
+        organization_id: int,
+        kind: SketchKind,
+        moment: datetime | date,
+        change: Callable[[Sketch], None],
+    ) -> None:
+        # скетч не складывается в SQL, поэтому read-modify-write под блокировкой строки;
+        # её берёт только свёртка наблюдений, а не каждая запись сделки
+        bucket = month_start(moment)
+        stmt = (
+            select(AnalyticsSketch)
+            .where(
+                AnalyticsSketch.organization_id == organization_id,
+                AnalyticsSketch.kind == kind,
+                AnalyticsSketch.bucket_start == bucket,
+            )
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        row = (await self.session.execute(stmt)).scalar_one_or_none()
+        if row is None:
+            sketch = new_sketch(kind)
+            change(sketch)
+            insert_ = pg_insert if self.session.bind.dialect.name == "postgresql" else sqlite_insert
+            create = (
+                insert_(AnalyticsSketch)
+                .values(organization_id=organization_id, kind=kind, bucket_start=bucket, payload=sketch.to_bytes())
+                .on_conflict_do_nothing()
+            )
+            created = cast(CursorResult[Any], await self.session.execute(create))
+            if created.rowcount:
+                return
+            # строку только что вставила параллельная транзакция: теперь её можно заблокировать
+            row = (await self.session.execute(stmt)).scalar_one()
+        sketch = load_sketch(kind, row.payload)
+        change(sketch)
+        row.payload = sketch.to_bytes()
+        await self.session.flush()
+
+    async def _observe(
+        self,
+        organization_id: int,
+        kind: SketchKind,
+        moment: datetime | date,
+        value: Decimal | int,
+        count: int = 1,
+    ) -> None:
+        # только вставка: конкурентные записи одной организации не ждут друг друга
+        await self.session.execute(
+            insert(AnalyticsSketchObservation).values(
+                organization_id=organization_id,
+                kind=kind,
+                bucket_start=month_start(moment),
+                value=value,
+                count=count,
+            )
+        )
+
+    async def record_contact(self, organization_id: int, contact_id: int, moment: datetime) -> None:
+        await self._observe(organization_id, SketchKind.active_contacts, moment, contact_id)
+
+    async def record_amount(
+        self, organization_id: int, moment: datetime | date, amount: Decimal, *, count: int = 1
+    ) -> None:
+        await self._observe(organization_id, SketchKind.deal_amounts, moment, amount, count)
+
+    async def list_range(
+        self, organization_id: int, kind: SketchKind, start: date, end: date
+    ) -> list[AnalyticsSketch]:
+        stmt = (
+            select(AnalyticsSketch)
+            .where(
+                AnalyticsSketch.organization_id == organization_id,
+                AnalyticsSketch.kind == kind,
+                AnalyticsSketch.bucket_start >= month_start(start),
+                AnalyticsSketch.bucket_start <= end,
+            )
+            .order_by(AnalyticsSketch.bucket_start)
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    @overload
+    async def monthly(
+        self,
+        organization_id: int,
+        kind: Literal[SketchKind.active_contacts],
+        start: date,
+        end: date,
+    ) -> list[tuple[date, HyperLogLog]]: ...
+    @overload
+    async def monthly(
+        self,
+        organization_id: int,
+        kind: Literal[SketchKind.deal_amounts],
+        start: date,
+        end: date,
+    ) -> list[tuple[date, LogHistogram]]: ...
+    async def monthly(
+        self, organization_id: int, kind: SketchKind, start: date, end: date
+    ) -> list[tuple[date, HyperLogLog]] | list[tuple[date, LogHistogram]]:
+        """Месячные скетчи периода вместе с наблюдениями, которые ещё не свёрнуты."""
+        sketches: dict[date, Sketch] = {
+            row.bucket_start: load_sketch(kind, row.payload)
+            for row in await self.list_range(organization_id, kind, start, end)
+        }
+        pending = select(
+            AnalyticsSketchObservation.bucket_start,
+            AnalyticsSketchObservation.value,
+            AnalyticsSketchObservation.count,
+        ).where(
+            AnalyticsSketchObservation.organization_id == organization_id,
+            AnalyticsSketchObservation.kind == kind,
+            AnalyticsSketchObservation.bucket_start >= month_start(start),
+            AnalyticsSketchObservation.bucket_start <= end,
+        )
+        for bucket, value, count in await self.session.execute(pending):
+            if bucket not in sketches:
+                sketches[bucket] = new_sketch(kind)
+            apply_observation(sketches[bucket], value, count)
+        return sorted(sketches.items())  # type: ignore[return-value]
+
+    async def fold(self, organization_id: int | None = None) -> int:
+        """Сворачивает накопленные наблюдения в месячные скетчи; возвращает их число.
+
+        Строка скетча блокируется один раз на месяц и пачку наблюдений. Пачка выбирается
+        с ``SKIP LOCKED``, поэтому параллельные свёртки не учтут одно наблюдение дважды.
+        """
+        folded = 0
+        while True:
+            stmt = (
+                select(
+                    AnalyticsSketchObservation.id,
+                    AnalyticsSketchObservation.organization_id,
+                    AnalyticsSketchObservation.kind,
+                    AnalyticsSketchObservation.bucket_start,
+                    AnalyticsSketchObservation.value,
+                    AnalyticsSketchObservation.count,
+                )
+                .order_by(AnalyticsSketchObservation.id)
+                .limit(_BATCH)
+                .with_for_update(skip_locked=True)
+            )
+            if organization_id is not None:
+                stmt = stmt.where(AnalyticsSketchObservation.organization_id == organization_id)
+            rows = (await self.session.execute(stmt)).all()
+            if not rows:
+                return folded
+
+            groups: dict[tuple[int, SketchKind, date], list[tuple[Decimal, int]]] = {}
+            for _, org_id, kind, bucket, value, count in rows:
+                groups.setdefault((org_id, kind, bucket), []).append((value, count))
+            for (org_id, kind, bucket), observations in groups.items():
+
+                def change(sketch: Sketch, batch: list[tuple[Decimal, int]] = observations) -> None:
+                    for value, count in batch:
+                        apply_observation(sketch, value, count)
+
+                await self._modify(org_id, kind, bucket, change)
+
+            await self.session.execute(
+                delete(AnalyticsSketchObservation).where(
+                    AnalyticsSketchObservation.id.in_([row.id for row in rows])
+                )
+            )
+            folded += len(rows)
+
+    async def rebuild(self, organization_id: int | None = None) -> int:
+        """Пересобирает месячные скетчи по сделкам и активностям; возвращает число скетчей.
+
+        Контакт считается активным в месяцах создания и последнего изменения своих сделок
+        и во всех месяцах, где по ним есть активности. Сумма сделки попадает в месяц её создания.
+        """
+        sketches: dict[tuple[int, SketchKind, date], Sketch] = {}
+
+        def sketch_for(org_id: int, kind: SketchKind, moment: datetime) -> Sketch:
+            key = (org_id, kind, month_start(moment))
+            if key not in sketches:
+                sketches[key] = new_sketch(kind)
+            return sketches[key]
+
+        deals = select(Deal.organization_id, Deal.contact_id, Deal.amount, Deal.created_at, Deal.updated_at)
+        activities = select(Deal.organization_id, Deal.contact_id, Activity.created_at).join(
+            Deal, Deal.id == Activity.deal_id
+        )
+        cleanup = delete(AnalyticsSketch)
+        # пересборка уже учитывает всё, что успели записать наблюдения
+        pending = delete(AnalyticsSketchObservation)
+        if organization_id is not None:
+            deals = deals.where(Deal.organization_id == organization_id)
+            activities = activities.where(Deal.organization_id == organization_id)
+            cleanup = cleanup.where(AnalyticsSketch.organization_id == organization_id)
+            pending = pending.where(AnalyticsSketchObservation.organization_id == organization_id)
+
+        result = await self.session.stream(deals.execution_options(yield_per=_BATCH))
+        async for org_id, contact_id, amount, created_at, updated_at in result:
+            sketch_for(org_id, SketchKind.deal_amounts, created_at).add(float(amount))
+            for moment in (created_at, updated_at):
+                sketch_for(org_id, SketchKind.active_contacts, moment).add(contact_id)
+
+        result = await self.session.stream(activities.execution_options(yield_per=_BATCH))
+        async for org_id, contact_id, created_at in result:
+            sketch_for(org_id, SketchKind.active_contacts, created_at).add(contact_id)
+
+        await self.session.execute(cleanup)
+        await self.session.execute(pending)
+        rows = [
+            {"organization_id": org_id, "kind": kind, "bucket_start": bucket, "payload": sketch.to_bytes()}
+            for (org_id, kind, bucket), sketch in sketches.items()
+        ]
+        for start in range(0, len(rows), _BATCH):
+            await self.session.execute(insert(AnalyticsSketch), rows[start : start + _BATCH])
+        return len(rows)
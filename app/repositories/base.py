@@ -1,21 +1,233 @@
 from __future__ import annotations
 
+import enum
+import json
+from dataclasses import dataclass
+from datetime import date
 from typing import Any, Generic, Iterable, Sequence, TypeVar
 
-from sqlalchemy import delete, select, update
+from sqlalchemy import DateTime, Select, delete, func, literal, select, true, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.elements import ClauseElement, ColumnElement
+
+from app.core.cache import MISSING
+from app.core.cache_backends import create_cache
+from app.core.config import settings
+from app.core.cursor import InvalidCursorError, decode_cursor, encode_cursor
 
 ModelType = TypeVar("ModelType")
 
+count_cache = create_cache(
+    "counts",
+    max_entries=settings.cache_max_entries,
+    ttl_seconds=settings.count_cache_ttl_seconds,
+    sweep_interval_seconds=settings.cache_sweep_interval_seconds,
+)
+
+
+class CountMode(str, enum.Enum):
+    exact = "exact"  # COUNT(*) по фильтрам, кэшируется на count_cache_ttl_seconds
+    estimated = "estimated"  # оценка планировщика PostgreSQL; на других СУБД — как exact
+    none = "none"  # только has_more по лишней строке страницы
+
+
+@dataclass
+class Page(Generic[ModelType]):
+    items: list[ModelType]
+    next_cursor: str | None = None
+    total: int | None = None
+    total_estimated: bool = False
+    has_more: bool = False
+
+
+class _Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, stmt: Select[Any]) -> None:
+        self.stmt = stmt
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element: _Explain, compiler: Any, **kw: Any) -> str:
+    return "EXPLAIN (FORMAT JSON) " + str(compiler.process(element.stmt, **kw))
+
 
 class BaseRepository(Generic[ModelType]):
+    # колонки, по которым разрешены сортировка и keyset-пагинация; id добавляется к ключу всегда
+    sort_keys: tuple[str, ...] = ()
+
     def __init__(self, session: AsyncSession, model: type[ModelType]):
         self.session = session
         self.model = model
 
+    def sort_key(self, column: ColumnElement[Any], value: Any = None) -> ColumnElement[Any]:
+        """Выражение для сортировки и keyset-сравнения по колонке (или по значению из курсора).
+
+        SQLite хранит DateTime строкой: метки из func.now() без долей секунды, а записанные
+        через ORM — с микросекундами, поэтому сырое сравнение с параметром курсора ошибается
+        на равных моментах. Там обе стороны приводятся к одному формату.
+        """
+        expression = column if value is None else literal(value, column.type)
+        if self.session.bind.dialect.name == "sqlite" and isinstance(column.type, DateTime):
+            return func.strftime("%Y-%m-%d %H:%M:%f", expression)
+        return expression
+
+    def sort_column(self, order_by: str) -> ColumnElement[Any]:
+        if order_by not in self.sort_keys:
+            raise ValueError(f"Сортировка возможна только по: {', '.join(self.sort_keys)}")
+        column: ColumnElement[Any] = getattr(self.model, order_by)
+        return column
+
+    def keyset(
+        self, *, order_by: str, order: str, after: tuple[Any, int] | None = None
+    ) -> tuple[ColumnElement[bool], tuple[ColumnElement[Any], ...]]:
+        """Условие «строго после ``after``» и порядок (ключ сортировки, id) для keyset-пагинации.
+
+        Сравнение кортежей ``(key, id) > (value, last_id)`` обслуживается индексом
+        по тем же колонкам, поэтому страница на любой глубине стоит одинаково.
+        """
+        column = self.sort_column(order_by)
+        key, model_id = self.sort_key(column), self.model.id  # type: ignore[attr-defined]
+        descending = order == "desc"
+        ordering = (key.desc(), model_id.desc()) if descending else (key.asc(), model_id.asc())
+        if after is None:
+            return true(), ordering
+        value, last_id = after
+        row, bound = tuple_(key, model_id), tuple_(self.sort_key(column, value), literal(last_id))
+        return (row < bound if descending else row > bound), ordering
+
+    def encode_keyset(self, item: ModelType, *, order_by: str, order: str, **extra: Any) -> str:
+        return encode_cursor(
+            {
+                "order_by": order_by,
+                "order": order,
+                "value": getattr(item, order_by),
+                "id": item.id,  # type: ignore[attr-defined]
+                **extra,
+            }
+        )
+
+    def decode_keyset(
+        self, cursor: str, *, order_by: str, order: str
+    ) -> tuple[tuple[Any, int], dict[str, Any]]:
+        """Ключ (значение сортировки, id) из курсора и весь payload — для дополнительных полей."""
+        payload = decode_cursor(cursor)
+        if (payload.get("order_by"), payload.get("order")) != (order_by, order):
+            raise InvalidCursorError("Курсор получен при другой сортировке")
+        python_type = self.sort_column(order_by).type.python_type
+        try:
+            value = payload["value"]
+            if issubclass(python_type, date):
+                value = python_type.fromisoformat(value)
+            else:
+                value = python_type(value)
+            return (value, int(payload["id"])), payload
+        except (ArithmeticError, ValueError, KeyError, TypeError) as exc:
+            raise InvalidCursorError("Некорректный курсор") from exc
+
+    async def paginate(
+        self,
+        stmt: Select[tuple[ModelType]],
+        *,
+        order_by: str,
+        order: str,
+        limit: int | None,
+        cursor: str | None = None,
+        offset: int = 0,
+        count: CountMode = CountMode.none,
+        revision: int | None = None,
+        ranking: ColumnElement[Any] | None = None,
+    ) -> Page[ModelType]:
+        """Страница ``stmt`` в порядке (order_by, id) и курсор на следующую.
+
+        С курсором ``offset`` не применяется: выборка продолжается сразу за последней
+        строкой прошлой страницы. Без ``limit`` возвращаются все строки. ``count``
+        выбирает, чем платить за ``total``: см. :class:`CountMode`; ``revision`` —
+        ревизия сущности организации, под которой кэшируется точный подсчёт.
+
+        ``ranking`` (релевантность поиска) заменяет сортировку: строки идут по убыванию
+        ранга, листаются только смещением, и курсор следующей страницы не выдаётся.
+        """
+        after = None
+        condition: ColumnElement[bool]
+        ordering: tuple[ColumnElement[Any], ...]
+        if ranking is not None:
+            if cursor is not None:
+                raise InvalidCursorError("Курсор недоступен для выдачи по релевантности, используйте page")
+            condition, ordering = true(), (ranking.desc(), self.model.id.asc())  # type: ignore[attr-defined]
+        else:
+            if cursor is not None:
+                after, _ = self.decode_keyset(cursor, order_by=order_by, order=order)
+            condition, ordering = self.keyset(order_by=order_by, order=order, after=after)
+        page_stmt = stmt.order_by(*ordering)
+        if after is not None:
+            page_stmt = page_stmt.where(condition)
+        elif offset:
+            page_stmt = page_stmt.offset(offset)
+        if limit is not None:
+            page_stmt = page_stmt.limit(limit + 1)
+        items = list((await self.session.execute(page_stmt)).scalars().unique().all())
+        page = Page(items)
+        if limit is not None and len(items) > limit:
+            page.items, page.has_more = items[:limit], True
+            if ranking is None:
+                page.next_cursor = self.encode_keyset(page.items[-1], order_by=order_by, order=order)
+
+        if count == CountMode.none:
+            return page
+        if after is None and not page.has_more and (items or not offset):
+            # последняя страница от начала выборки: итог известен без отдельного запроса
+            page.total = offset + len(items)
+        elif count == CountMode.estimated and self.session.bind.dialect.name == "postgresql":
+            page.total = await self.estimate_count(stmt)
+            page.total_estimated = page.total > settings.count_estimate_threshold
+            if not page.total_estimated:
+                page.total = await self.count(stmt, revision=revision)
+        else:
+            page.total = await self.count(stmt, revision=revision)
+        return page
+
+    async def count(self, stmt: Select[Any], *, revision: int | None = None) -> int:
+        """Точное число строк ``stmt``; кэшируется по тексту запроса, параметрам и ``revision``.
+
+        Без ревизии запись в кэше может отставать от таблицы на ``count_cache_ttl_seconds``,
+        с ревизией организации — устаревает сразу после её увеличения.
+        """
+        compiled = stmt.compile(dialect=self.session.bind.dialect)
+        key = (str(compiled), repr(sorted(compiled.params.items())), revision)
+        total = count_cache.get(key, MISSING)
+        if total is MISSING:
+            counted = select(func.count()).select_from(stmt.order_by(None).subquery())
+            total = int((await self.session.execute(counted)).scalar_one())
+            count_cache.set(key, total)
+        return int(total)
+
+    async def estimate_count(self, stmt: Select[Any]) -> int:
+        """Оценка числа строк по плану PostgreSQL: без чтения таблицы, точность — как у статистики."""
+        raw = (await self.session.execute(_Explain(stmt.order_by(None)))).scalar_one()
+        plan = json.loads(raw) if isinstance(raw, str) else raw
+        return int(plan[0]["Plan"]["Plan Rows"])
+
     async def get(self, object_id: int) -> ModelType | None:
         return await self.session.get(self.model, object_id)
 
+    async def get_for_update(self, object_id: int) -> ModelType | None:
+        """Блокирует строку до конца транзакции и перечитывает её, минуя identity map.
+
+        Нужен, когда по текущим значениям считаются дельты: без блокировки два конкурентных
+        обновления вычтут одно и то же старое значение.
+        """
+        stmt = (
+            select(self.model)
+            .where(self.model.id == object_id)  # type: ignore[attr-defined]
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
     async def list(self, *, filters: Iterable[Any] = (), limit: int | None = None) -> Sequence[ModelType]:
         stmt = select(self.model)
         for condition in filters:
@@ -34,16 +246,16 @@ class BaseRepository(Generic[ModelType]):
     async def update(self, object_id: int, obj_in: dict[str, Any]) -> ModelType | None:
         stmt = (
             update(self.model)
-            .where(self.model.id == object_id)
+            .where(self.model.id == object_id)  # type: ignore[attr-defined]
             .values(**obj_in)
-            .returning(self.model)  # type: ignore[arg-type]
+            .returning(self.model)
         )
         result = await self.session.execute(stmt)
         instance = result.scalar_one_or_none()
         return instance
 
     async def delete(self, object_id: int) -> None:
-        stmt = delete(self.model).where(self.model.id == object_id)
+        stmt = delete(self.model).where(self.model.id == object_id)  # type: ignore[attr-defined]
         await self.session.execute(stmt)
 
 
@@ -4,12 +4,16 @@ from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.contact import Contact
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, CountMode, Page
+from app.repositories.contact_search import ContactSearchBackend, contact_search_backend
 
 
 class ContactRepository(BaseRepository[Contact]):
-    def __init__(self, session: AsyncSession):
+    sort_keys = ("created_at", "name")
+
+    def __init__(self, session: AsyncSession, search_backend: ContactSearchBackend | None = None):
         super().__init__(session, Contact)
+        self.search_backend = search_backend or contact_search_backend(session.bind.dialect.name)
 
     def base_query(self) -> Select[tuple[Contact]]:
         return select(Contact)
@@ -20,20 +24,32 @@ class ContactRepository(BaseRepository[Contact]):
         *,
         owner_id: int | None = None,
         search: str | None = None,
+        order_by: str = "created_at",
+        order: str = "asc",
         limit: int = 20,
         offset: int = 0,
-    ) -> list[Contact]:
+        cursor: str | None = None,
+        count: CountMode = CountMode.none,
+        revision: int | None = None,
+    ) -> Page[Contact]:
         stmt = self.base_query().where(Contact.organization_id == organization_id)
         if owner_id is not None:
             stmt = stmt.where(Contact.owner_id == owner_id)
+        ranking = None
+        search = (search or "").strip()
         if search:
-            stmt = stmt.where(
-                (Contact.name.ilike(f"%{search}%"))
-                | (Contact.email.ilike(f"%{search}%"))
-                | (Contact.phone.ilike(f"%{search}%"))
-            )
-        stmt = stmt.limit(limit).offset(offset)
-        result = await self.session.execute(stmt)
-        return list(result.scalars().all())
+            # поиск отдаётся по релевантности, order_by/order при нём не действуют
+            stmt, ranking = self.search_backend.apply(stmt, search)
+        return await self.paginate(
+            stmt,
+            order_by=order_by,
+            order=order,
+            limit=limit,
+            cursor=cursor,
+            offset=offset,
+            count=count,
+            revision=revision,
+            ranking=ranking,
+        )
 
 
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Any
+
+from sqlalchemy import Select, case, column, func, literal, or_, table
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.contact import SEARCH_CONFIG, Contact, contact_search_document
+
+SearchQuery = Select[tuple[Contact]]
+
+# внешняя FTS5-таблица; скрытая колонка с именем таблицы нужна для MATCH и bm25()
+contacts_fts = table("contacts_fts", column("rowid"), column("contacts_fts"))
+
+
+class ContactSearchBackend(ABC):
+    """Поиск контактов по имени, email и телефону: добавляет к запросу фильтр и выражение ранга.
+
+    Чем больше ранг, тем выше контакт в выдаче.
+    """
+
+    @abstractmethod
+    def apply(self, stmt: SearchQuery, query: str) -> tuple[SearchQuery, ColumnElement[Any]]: ...
+
+
+class LikeContactSearch(ContactSearchBackend):
+    """Подстрока через ILIKE без специальных индексов; совпадения с начала имени — выше."""
+
+    def apply(self, stmt: SearchQuery, query: str) -> tuple[SearchQuery, ColumnElement[Any]]:
+        pattern = f"%{query}%"
+        stmt = stmt.where(
+            or_(Contact.name.ilike(pattern), Contact.email.ilike(pattern), Contact.phone.ilike(pattern))
+        )
+        return stmt, case((Contact.name.ilike(f"{query}%"), 1), else_=0)
+
+
+class PostgresContactSearch(ContactSearchBackend):
+    """ILIKE по триграммным GIN-индексам плюс совпадение слов имени по tsvector.
+
+    Ранг — наибольшее триграммное сходство полей и ``ts_rank_cd`` по словам имени.
+    """
+
+    def apply(self, stmt: SearchQuery, query: str) -> tuple[SearchQuery, ColumnElement[Any]]:
+        pattern = f"%{query}%"
+        document = contact_search_document()
+        words = func.plainto_tsquery(SEARCH_CONFIG, query)
+        stmt = stmt.where(
+            or_(
+                Contact.name.ilike(pattern),
+                Contact.email.ilike(pattern),
+                Contact.phone.ilike(pattern),
+                document.op("@@")(words),
+            )
+        )
+        similarity = func.greatest(
+            func.similarity(Contact.name, query),
+            func.similarity(func.coalesce(Contact.email, ""), query),
+            func.similarity(func.coalesce(Contact.phone, ""), query),
+        )
+        return stmt, similarity + func.ts_rank_cd(document, words)
+
+
+class SqliteContactSearch(ContactSearchBackend):
+    """FTS5 с триграммным токенизатором: подстрока от трёх символов, ранг по bm25."""
+
+    # триграммный индекс не находит более короткие подстроки
+    min_length = 3
+
+    def __init__(self) -> None:
+        self.fallback = LikeContactSearch()
+
+    def apply(self, stmt: SearchQuery, query: str) -> tuple[SearchQuery, ColumnElement[Any]]:
+        if len(query) < self.min_length:
+            return self.fallback.apply(stmt, query)
+        # фраза в кавычках: операторы FTS5 в пользовательском вводе трактуются как текст
+        phrase = '"' + query.replace('"', '""') + '"'
+        stmt = stmt.join(contacts_fts, contacts_fts.c.rowid == Contact.id).where(
+            contacts_fts.c.contacts_fts.op("MATCH")(literal(phrase))
+        )
+        # bm25 тем меньше, чем релевантнее строка
+        return stmt, -func.bm25(contacts_fts.c.contacts_fts)
+
+
+def contact_search_backend(dialect_name: str) -> ContactSearchBackend:
+    if dialect_name == "postgresql":
+        return PostgresContactSearch()
+    if dialect_name == "sqlite":
+        return SqliteContactSearch()
+    return LikeContactSearch()
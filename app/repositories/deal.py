@@ -1,17 +1,34 @@
 from __future__ import annotations
 
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from typing import Sequence
+from typing import Any, Sequence
 
-from sqlalchemy import Select, and_, func, select
+from sqlalchemy import BigInteger, Row, Select, and_, case, cast, func, or_, select, true
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 from app.models.deal import Deal, DealStage, DealStatus
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, CountMode, Page
+
+
+@dataclass
+class BoardColumnRows:
+    stage: DealStage
+    total_count: int = 0
+    total_amount: Decimal = Decimal(0)
+    deals: list[Deal] = field(default_factory=list)
+    has_more: bool = False
+
+
+BOARD_SORT_KEYS = ("created_at", "updated_at", "amount")
 
 
 class DealRepository(BaseRepository[Deal]):
+    sort_keys = ("created_at", "updated_at", "amount", "title", "status", "stage")
+
     def __init__(self, session: AsyncSession):
         super().__init__(session, Deal)
 
@@ -31,7 +48,10 @@ class DealRepository(BaseRepository[Deal]):
         order: str = "desc",
         limit: int = 20,
         offset: int = 0,
-    ) -> list[Deal]:
+        cursor: str | None = None,
+        count: CountMode = CountMode.none,
+        revision: int | None = None,
+    ) -> Page[Deal]:
         stmt = self.base_query().where(Deal.organization_id == organization_id)
         if status:
             stmt = stmt.where(Deal.status.in_(status))
@@ -43,16 +63,69 @@ class DealRepository(BaseRepository[Deal]):
             stmt = stmt.where(Deal.stage == stage)
         if owner_id is not None:
             stmt = stmt.where(Deal.owner_id == owner_id)
+        return await self.paginate(
+            stmt,
+            order_by=order_by,
+            order=order,
+            limit=limit,
+            cursor=cursor,
+            offset=offset,
+            count=count,
+            revision=revision,
+        )
 
-        order_column = getattr(Deal, order_by, Deal.created_at)
-        if order == "desc":
-            order_column = order_column.desc()
-        else:
-            order_column = order_column.asc()
+    async def board(
+        self,
+        organization_id: int,
+        *,
+        stages: Sequence[DealStage],
+        status: Sequence[DealStatus] | None = None,
+        owner_id: int | None = None,
+        order_by: str = "created_at",
+        order: str = "desc",
+        limit: int = 20,
+        after: tuple[Any, int] | None = None,
+    ) -> dict[DealStage, BoardColumnRows]:
+        """Первые ``limit`` сделок каждой стадии плюс число и сумма сделок колонки — одним запросом.
+
+        ROW_NUMBER() нумерует сделки внутри стадии, COUNT/SUM OVER считают итоги колонки
+        по тем же фильтрам. ``after`` — ключ (значение сортировки, id) последней показанной
+        сделки: строки до него попадают в отдельное окно, из которого берётся только
+        первая строка, чтобы итоги колонки были известны и на пустой странице.
+        """
+        is_after, ordering = self.keyset(order_by=order_by, order=order, after=after)
+
+        inner = select(
+            Deal,
+            is_after.label("is_after"),
+            func.row_number().over(partition_by=(Deal.stage, is_after), order_by=ordering).label("position"),
+            func.count().over(partition_by=Deal.stage).label("stage_count"),
+            func.sum(Deal.amount).over(partition_by=Deal.stage).label("stage_amount"),
+        ).where(Deal.organization_id == organization_id, Deal.stage.in_(stages))
+        if status:
+            inner = inner.where(Deal.status.in_(status))
+        if owner_id is not None:
+            inner = inner.where(Deal.owner_id == owner_id)
+        ranked = inner.subquery()
+        deal = aliased(Deal, ranked)
+        stmt = (
+            select(deal, ranked.c.is_after, ranked.c.stage_count, ranked.c.stage_amount)
+            .where(ranked.c.position <= limit + 1, or_(ranked.c.is_after == true(), ranked.c.position == 1))
+            .order_by(ranked.c.stage, ranked.c.is_after, ranked.c.position)
+        )
 
-        stmt = stmt.order_by(order_column).limit(limit).offset(offset)
-        result = await self.session.execute(stmt)
-        return list(result.scalars().unique().all())
+        columns = {stage: BoardColumnRows(stage=stage) for stage in stages}
+        for row, row_is_after, stage_count, stage_amount in (await self.session.execute(stmt)).all():
+            column = columns[row.stage]
+            column.total_count = stage_count
+            column.total_amount = Decimal(stage_amount or 0)
+            if not row_is_after:
+                continue
+            if len(column.deals) == limit:
+                column.has_more = True
+            else:
+                column.deals.append(row)
+        return columns
 
     async def count_by_status(self, organization_id: int) -> dict[DealStatus, int]:
         stmt = (
@@ -90,6 +163,40 @@ class DealRepository(BaseRepository[Deal]):
         result = await self.session.execute(stmt)
         return list(result.all())
 
+    async def count_created_after(
+        self, organization_id: int, *, after_id: int, created_before: datetime
+    ) -> tuple[int, int]:
+        stmt = select(func.count(), func.max(Deal.id)).where(
+            Deal.organization_id == organization_id,
+            Deal.id > after_id,
+            Deal.created_at <= created_before,
+        )
+        count, last_id = (await self.session.execute(stmt)).one()
+        return int(count), last_id or after_id
+
+    async def stream_amount_columns(
+        self, organization_id: int, *, batch_size: int = 10_000
+    ) -> AsyncIterator[Sequence[Row[Any]]]:
+        """Пачки (сумма в центах, код статуса, код стадии, владелец, создана) для колоночной аналитики.
+
+        Коды — позиции значений в ``DealStatus`` / ``DealStage``; сумма переводится в целые
+        центы на стороне БД, чтобы не создавать Decimal на каждую строку.
+        """
+        stmt = (
+            select(
+                cast(func.round(Deal.amount * 100), BigInteger),
+                case({status.name: code for code, status in enumerate(DealStatus)}, value=Deal.status),
+                case({stage.name: code for code, stage in enumerate(DealStage)}, value=Deal.stage),
+                Deal.owner_id,
+                Deal.created_at,
+            )
+            .where(Deal.organization_id == organization_id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.session.stream(stmt)
+        async for batch in result.partitions(batch_size):
+            yield batch
+
     async def has_contact_deals(self, contact_id: int) -> bool:
         stmt = select(func.count()).where(Deal.contact_id == contact_id)
         result = await self.session.execute(stmt)
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from collections import Counter
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.activity import Activity, ActivityType
+from app.models.deal import Deal, DealStatus
+from app.models.deal_hourly_stat import DealHourlyStat
+from app.repositories.base import BaseRepository
+
+_COUNTERS = {"created": "created_count", DealStatus.won: "won_count", DealStatus.lost: "lost_count"}
+_BATCH = 5_000
+
+
+def hour_start(moment: datetime) -> datetime:
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+class DealHourlyStatRepository(BaseRepository[DealHourlyStat]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, DealHourlyStat)
+
+    async def apply(
+        self,
+        organization_id: int,
+        moment: datetime,
+        *,
+        created: int = 0,
+        won: int = 0,
+        lost: int = 0,
+    ) -> None:
+        insert_ = pg_insert if self.session.bind.dialect.name == "postgresql" else sqlite_insert
+        stmt = insert_(DealHourlyStat).values(
+            organization_id=organization_id,
+            bucket_start=hour_start(moment),
+            created_count=created,
+            won_count=won,
+            lost_count=lost,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DealHourlyStat.organization_id, DealHourlyStat.bucket_start],
+            set_={
+                column: getattr(DealHourlyStat, column) + getattr(stmt.excluded, column)
+                for column in ("created_count", "won_count", "lost_count")
+            },
+        )
+        await self.session.execute(stmt)
+
+    async def list_range(
+        self, organization_id: int, start: datetime, end: datetime
+    ) -> list[DealHourlyStat]:
+        stmt = (
+            select(DealHourlyStat)
+            .where(
+                DealHourlyStat.organization_id == organization_id,
+                DealHourlyStat.bucket_start >= hour_start(start),
+                DealHourlyStat.bucket_start < end,
+            )
+            .order_by(DealHourlyStat.bucket_start)
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def rebuild(self, organization_id: int | None = None) -> int:
+        """Пересобирает почасовые корзины из сделок и их активностей; возвращает число корзин.
+
+        Закрытия (won/lost) берутся из активностей status_changed. Для закрытых сделок
+        без такой активности временем закрытия считается ``updated_at``.
+        """
+        counters: dict[tuple[int, datetime], Counter[str]] = {}
+
+        def bump(org_id: int, moment: datetime, counter: str) -> None:
+            counters.setdefault((org_id, hour_start(moment)), Counter())[counter] += 1
+
+        deals = select(Deal.id, Deal.organization_id, Deal.status, Deal.created_at, Deal.updated_at)
+        transitions = (
+            select(Activity.deal_id, Deal.organization_id, Activity.payload, Activity.created_at)
+            .join(Deal, Deal.id == Activity.deal_id)
+            .where(Activity.type == ActivityType.status_changed)
+        )
+        if organization_id is not None:
+            deals = deals.where(Deal.organization_id == organization_id)
+            transitions = transitions.where(Deal.organization_id == organization_id)
+
+        closed_with_history: set[int] = set()
+        result = await self.session.stream(transitions.execution_options(yield_per=_BATCH))
+        async for deal_id, org_id, payload, created_at in result:
+            new_status = (payload or {}).get("new_status")
+            if new_status in (DealStatus.won.value, DealStatus.lost.value):
+                bump(org_id, created_at, _COUNTERS[DealStatus(new_status)])
+                closed_with_history.add(deal_id)
+
+        result = await self.session.stream(deals.execution_options(yield_per=_BATCH))
+        async for deal_id, org_id, status, created_at, updated_at in result:
+            bump(org_id, created_at, _COUNTERS["created"])
+            if status in (DealStatus.won, DealStatus.lost) and deal_id not in closed_with_history:
+                bump(org_id, updated_at, _COUNTERS[status])
+
+        cleanup = delete(DealHourlyStat)
+        if organization_id is not None:
+            cleanup = cleanup.where(DealHourlyStat.organization_id == organization_id)
+        await self.session.execute(cleanup)
+        rows = [
+            {
+                "organization_id": org_id,
+                "bucket_start": bucket,
+                **{column: counter[column] for column in _COUNTERS.values()},
+            }
+            for (org_id, bucket), counter in counters.items()
+        ]
+        for start in range(0, len(rows), _BATCH):
+            await self.session.execute(insert(DealHourlyStat), rows[start : start + _BATCH])
+        return len(rows)
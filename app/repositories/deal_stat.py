@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import Select, delete, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.deal import Deal, DealStage, DealStatus
+from app.models.deal_stat import DealStat
+from app.repositories.base import BaseRepository
+
+Bucket = tuple[int, DealStatus, DealStage]
+
+
+@dataclass(frozen=True)
+class DealStatMismatch:
+    organization_id: int
+    status: DealStatus
+    stage: DealStage
+    expected: tuple[int, Decimal]
+    actual: tuple[int, Decimal]
+
+
+class DealStatRepository(BaseRepository[DealStat]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, DealStat)
+
+    async def apply(
+        self,
+        organization_id: int,
+        status: DealStatus,
+        stage: DealStage,
+        *,
+        count: int,
+        amount: Decimal,
+    ) -> None:
+        # инкремент одним upsert: конкурентные транзакции блокируют только свою строку-корзину
+        insert_ = pg_insert if self.session.bind.dialect.name == "postgresql" else sqlite_insert
+        stmt = insert_(DealStat).values(
+            organization_id=organization_id,
+            status=status,
+            stage=stage,
+            deal_count=count,
+            amount_total=amount,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DealStat.organization_id, DealStat.status, DealStat.stage],
+            set_={
+                "deal_count": DealStat.deal_count + stmt.excluded.deal_count,
+                "amount_total": DealStat.amount_total + stmt.excluded.amount_total,
+            },
+        )
+        await self.session.execute(stmt)
+
+    async def list_for_org(self, organization_id: int) -> list[DealStat]:
+        stmt = select(DealStat).where(DealStat.organization_id == organization_id, DealStat.deal_count > 0)
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    @staticmethod
+    def _live_totals(organization_id: int | None) -> Select[Any]:
+        stmt = select(
+            Deal.organization_id,
+            Deal.status,
+            Deal.stage,
+            func.count().label("deal_count"),
+            func.coalesce(func.sum(Deal.amount), 0).label("amount_total"),
+        ).group_by(Deal.organization_id, Deal.status, Deal.stage)
+        if organization_id is not None:
+            stmt = stmt.where(Deal.organization_id == organization_id)
+        return stmt
+
+    async def rebuild(self, organization_id: int | None = None) -> list[int]:
+        """Пересчитывает корзины по таблице сделок и возвращает затронутые организации."""
+        cleanup = delete(DealStat)
+        if organization_id is not None:
+            cleanup = cleanup.where(DealStat.organization_id == organization_id)
+        await self.session.execute(cleanup)
+        await self.session.execute(
+            insert(DealStat).from_select(
+                ["organization_id", "status", "stage", "deal_count", "amount_total"],
+                self._live_totals(organization_id),
+            )
+        )
+        touched = select(DealStat.organization_id).distinct()
+        if organization_id is not None:
+            touched = touched.where(DealStat.organization_id == organization_id)
+        result = await self.session.execute(touched)
+        return sorted(result.scalars().all())
+
+    async def verify(self, organization_id: int | None = None) -> list[DealStatMismatch]:
+        live = await self.session.execute(self._live_totals(organization_id))
+        expected: dict[Bucket, tuple[int, Decimal]] = {
+            (org_id, DealStatus(status), DealStage(stage)): (count, Decimal(total))
+            for org_id, status, stage, count, total in live.all()
+        }
+        stmt = select(DealStat)
+        if organization_id is not None:
+            stmt = stmt.where(DealStat.organization_id == organization_id)
+        actual: dict[Bucket, tuple[int, Decimal]] = {
+            (row.organization_id, row.status, row.stage): (row.deal_count, Decimal(row.amount_total))
+            for row in (await self.session.execute(stmt)).scalars().all()
+        }
+        zero = (0, Decimal(0))
+        return [
+            DealStatMismatch(bucket[0], bucket[1], bucket[2], expected.get(bucket, zero), actual.get(bucket, zero))
+            for bucket in sorted(expected.keys() | actual.keys())
+            if expected.get(bucket, zero) != actual.get(bucket, zero)
+        ]
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from typing import Any, cast
+
+from sqlalchemy import CursorResult, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.funnel_checkpoint import FunnelCheckpoint
+from app.repositories.base import BaseRepository
+
+
+class FunnelCheckpointRepository(BaseRepository[FunnelCheckpoint]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, FunnelCheckpoint)
+
+    async def get_for_org(self, organization_id: int) -> FunnelCheckpoint | None:
+        stmt = select(FunnelCheckpoint).where(FunnelCheckpoint.organization_id == organization_id)
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def advance(
+        self,
+        organization_id: int,
+        *,
+        expected_activity_id: int,
+        last_activity_id: int,
+        last_deal_id: int,
+        state: dict[str, Any],
+    ) -> bool:
+        """Сдвигает чекпоинт, только если его не успел сдвинуть параллельный пересчёт."""
+        insert_ = pg_insert if self.session.bind.dialect.name == "postgresql" else sqlite_insert
+        stmt = insert_(FunnelCheckpoint).values(
+            organization_id=organization_id,
+            last_activity_id=last_activity_id,
+            last_deal_id=last_deal_id,
+            state=state,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[FunnelCheckpoint.organization_id],
+            set_={
+                "last_activity_id": stmt.excluded.last_activity_id,
+                "last_deal_id": stmt.excluded.last_deal_id,
+                "state": stmt.excluded.state,
+            },
+            where=FunnelCheckpoint.last_activity_id == expected_activity_id,
+        )
+        result = cast(CursorResult[Any], await self.session.execute(stmt))
+        return bool(result.rowcount > 0)
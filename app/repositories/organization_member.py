@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from sqlalchemy import delete, select
+from sqlalchemy import and_, delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.organization import Organization
 from app.models.organization_member import OrganizationMember
+from app.models.user import User
 from app.repositories.base import BaseRepository
 
 
@@ -19,6 +21,40 @@ class OrganizationMemberRepository(BaseRepository[OrganizationMember]):
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def list_organizations_for_user(
+        self, user_id: int
+    ) -> list[tuple[Organization, OrganizationMember]]:
+        stmt = (
+            select(Organization, OrganizationMember)
+            .join(OrganizationMember, OrganizationMember.organization_id == Organization.id)
+            .where(OrganizationMember.user_id == user_id)
+            .order_by(Organization.id)
+        )
+        result = await self.session.execute(stmt)
+        return [(organization, membership) for organization, membership in result.all()]
+
+    async def get_principal(
+        self, *, user_id: int, organization_id: int
+    ) -> tuple[User, Organization | None, OrganizationMember | None] | None:
+        stmt = (
+            select(User, Organization, OrganizationMember)
+            .select_from(User)
+            .outerjoin(Organization, Organization.id == organization_id)
+            .outerjoin(
+                OrganizationMember,
+                and_(
+                    OrganizationMember.organization_id == Organization.id,
+                    OrganizationMember.user_id == User.id,
+                ),
+            )
+            .where(User.id == user_id)
+        )
+        result = await self.session.execute(stmt)
+        row = result.one_or_none()
+        if row is None:
+            return None
+        return row[0], row[1], row[2]
+
     async def remove_user(self, organization_id: int, user_id: int) -> None:
         stmt = delete(OrganizationMember).where(
             OrganizationMember.organization_id == organization_id,
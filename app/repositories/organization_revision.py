@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.organization_revision import OrganizationRevision, RevisionEntity
+from app.repositories.base import BaseRepository
+
+
+class OrganizationRevisionRepository(BaseRepository[OrganizationRevision]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, OrganizationRevision)
+
+    async def current(self, organization_id: int, entity: RevisionEntity) -> int:
+        stmt = select(OrganizationRevision.revision).where(
+            OrganizationRevision.organization_id == organization_id,
+            OrganizationRevision.entity == entity.value,
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none() or 0
+
+    async def bump(self, organization_id: int, entity: RevisionEntity) -> int:
+        insert = pg_insert if self.session.bind.dialect.name == "postgresql" else sqlite_insert
+        stmt = insert(OrganizationRevision).values(
+            organization_id=organization_id, entity=entity.value, revision=1
+        )
+        upsert = stmt.on_conflict_do_update(
+            index_elements=[OrganizationRevision.organization_id, OrganizationRevision.entity],
+            set_={"revision": OrganizationRevision.revision + 1},
+        ).returning(OrganizationRevision.revision)
+        result = await self.session.execute(upsert)
+        return int(result.scalar_one())
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.deal import Deal, DealStage, DealStatus
+from app.models.pipeline_total import PipelineTotal
+from app.repositories.base import BaseRepository
+
+OPEN_STATUSES = (DealStatus.new, DealStatus.in_progress)
+UNSCHEDULED_MONTH = date(1970, 1, 1)
+
+
+def close_month(expected_close_date: date | None) -> date:
+    return expected_close_date.replace(day=1) if expected_close_date else UNSCHEDULED_MONTH
+
+
+class PipelineTotalRepository(BaseRepository[PipelineTotal]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, PipelineTotal)
+
+    async def apply(
+        self,
+        organization_id: int,
+        owner_id: int,
+        stage: DealStage,
+        expected_close_date: date | None,
+        *,
+        count: int,
+        amount: Decimal,
+    ) -> None:
+        insert_ = pg_insert if self.session.bind.dialect.name == "postgresql" else sqlite_insert
+        stmt = insert_(PipelineTotal).values(
+            organization_id=organization_id,
+            owner_id=owner_id,
+            stage=stage,
+            close_month=close_month(expected_close_date),
+            deal_count=count,
+            amount_total=amount,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                PipelineTotal.organization_id,
+                PipelineTotal.owner_id,
+                PipelineTotal.stage,
+                PipelineTotal.close_month,
+            ],
+            set_={
+                "deal_count": PipelineTotal.deal_count + stmt.excluded.deal_count,
+                "amount_total": PipelineTotal.amount_total + stmt.excluded.amount_total,
+            },
+        )
+        await self.session.execute(stmt)
+
+    async def list_for_org(self, organization_id: int) -> list[PipelineTotal]:
+        stmt = select(PipelineTotal).where(
+            PipelineTotal.organization_id == organization_id, PipelineTotal.deal_count > 0
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def rebuild(self, organization_id: int | None = None) -> int:
+        """Пересчитывает корзины по открытым сделкам; возвращает число корзин."""
+        # усечение даты до месяца в SQL зависит от диалекта, поэтому группируем по дате и сворачиваем здесь
+        stmt = (
+            select(
+                Deal.organization_id,
+                Deal.owner_id,
+                Deal.stage,
+                Deal.expected_close_date,
+                func.count(),
+                func.coalesce(func.sum(Deal.amount), 0),
+            )
+            .where(Deal.status.in_(OPEN_STATUSES))
+            .group_by(Deal.organization_id, Deal.owner_id, Deal.stage, Deal.expected_close_date)
+        )
+        cleanup = delete(PipelineTotal)
+        if organization_id is not None:
+            stmt = stmt.where(Deal.organization_id == organization_id)
+            cleanup = cleanup.where(PipelineTotal.organization_id == organization_id)
+
+        buckets: dict[tuple[int, int, DealStage, date], list[Decimal]] = defaultdict(
+            lambda: [Decimal(0), Decimal(0)]
+        )
+        for org_id, owner_id, stage, expected, count, total in (await self.session.execute(stmt)).all():
+            bucket = buckets[(org_id, owner_id, DealStage(stage), close_month(expected))]
+            bucket[0] += count
+            bucket[1] += Decimal(total)
+
+        await self.session.execute(cleanup)
+        rows = [
+            {
+                "organization_id": org_id,
+                "owner_id": owner_id,
+                "stage": stage,
+                "close_month": month,
+                "deal_count": int(count),
+                "amount_total": total,
+            }
+            for (org_id, owner_id, stage, month), (count, total) in buckets.items()
+        ]
+        if rows:
+            await self.session.execute(insert(PipelineTotal), rows)
+        return len(rows)
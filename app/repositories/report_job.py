@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, cast
+
+from sqlalchemy import CursorResult, delete, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.report_job import ReportJob, ReportKind, ReportStatus
+from app.repositories.base import BaseRepository
+
+ACTIVE_STATUSES = (ReportStatus.pending, ReportStatus.running)
+
+
+class ReportJobRepository(BaseRepository[ReportJob]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, ReportJob)
+
+    async def get_for_org(self, job_id: int, organization_id: int) -> ReportJob | None:
+        # задачу обновляет фоновый раннер в своей сессии, поэтому не доверяем identity map
+        stmt = (
+            select(ReportJob)
+            .where(ReportJob.id == job_id, ReportJob.organization_id == organization_id)
+            .execution_options(populate_existing=True)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def find_reusable(
+        self, organization_id: int, kind: ReportKind, params_hash: str, *, now: datetime
+    ) -> ReportJob | None:
+        """Выполняющаяся задача с теми же параметрами или ещё не истёкший готовый результат."""
+        stmt = (
+            select(ReportJob)
+            .where(
+                ReportJob.organization_id == organization_id,
+                ReportJob.kind == kind,
+                ReportJob.params_hash == params_hash,
+                or_(
+                    ReportJob.status.in_(ACTIVE_STATUSES),
+                    (ReportJob.status == ReportStatus.done) & (ReportJob.expires_at > now),
+                ),
+            )
+            .order_by(ReportJob.id.desc())
+            .limit(1)
+            .execution_options(populate_existing=True)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def finish(
+        self,
+        job_id: int,
+        *,
+        status: ReportStatus,
+        now: datetime,
+        expires_at: datetime,
+        result: dict[str, Any] | None = None,
+        error: str | None = None,
+    ) -> None:
+        await self.update(
+            job_id,
+            {"status": status, "result": result, "error": error, "finished_at": now, "expires_at": expires_at},
+        )
+
+    async def delete_expired(self, now: datetime) -> int:
+        stmt = delete(ReportJob).where(ReportJob.expires_at <= now)
+        result = cast(CursorResult[Any], await self.session.execute(stmt))
+        return result.rowcount or 0
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Iterable, cast
+
+from sqlalchemy import CursorResult, delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.revoked_token import RevokedToken
+from app.repositories.base import BaseRepository
+
+
+class RevokedTokenRepository(BaseRepository[RevokedToken]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, RevokedToken)
+
+    async def list_active(self, now: datetime) -> dict[str, datetime]:
+        stmt = select(RevokedToken.token_id, RevokedToken.expires_at).where(
+            RevokedToken.expires_at > now
+        )
+        result = await self.session.execute(stmt)
+        return dict(result.tuples().all())
+
+    async def find_revoked(self, token_ids: Iterable[str]) -> dict[str, datetime]:
+        stmt = select(RevokedToken.token_id, RevokedToken.expires_at).where(
+            RevokedToken.token_id.in_(list(token_ids))
+        )
+        result = await self.session.execute(stmt)
+        return dict(result.tuples().all())
+
+    async def delete_expired(self, now: datetime) -> int:
+        stmt = delete(RevokedToken).where(RevokedToken.expires_at <= now)
+        result = cast(CursorResult[Any], await self.session.execute(stmt))
+        return result.rowcount or 0
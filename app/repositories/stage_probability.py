@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.deal import DealStage
+from app.models.stage_probability import StageProbability
+from app.repositories.base import BaseRepository
+
+
+class StageProbabilityRepository(BaseRepository[StageProbability]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, StageProbability)
+
+    async def for_org(self, organization_id: int) -> dict[DealStage, Decimal]:
+        stmt = select(StageProbability.stage, StageProbability.probability).where(
+            StageProbability.organization_id == organization_id
+        )
+        result = await self.session.execute(stmt)
+        return {DealStage(stage): Decimal(probability) for stage, probability in result.all()}
+
+    async def upsert_many(self, organization_id: int, probabilities: dict[DealStage, Decimal]) -> None:
+        if not probabilities:
+            return
+        insert_ = pg_insert if self.session.bind.dialect.name == "postgresql" else sqlite_insert
+        stmt = insert_(StageProbability).values(
+            [
+                {"organization_id": organization_id, "stage": stage, "probability": probability}
+                for stage, probability in probabilities.items()
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[StageProbability.organization_id, StageProbability.stage],
+            set_={"probability": stmt.excluded.probability},
+        )
+        await self.session.execute(stmt)
@@ -6,10 +6,12 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.task import Task
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, Page
 
 
 class TaskRepository(BaseRepository[Task]):
+    sort_keys = ("due_date", "created_at")
+
     def __init__(self, session: AsyncSession):
         super().__init__(session, Task)
 
@@ -18,23 +20,28 @@ class TaskRepository(BaseRepository[Task]):
         *,
         organization_id: int,
         deal_id: int | None = None,
+        owner_id: int | None = None,
         only_open: bool = False,
         due_before: date | None = None,
         due_after: date | None = None,
-    ) -> list[Task]:
+        order_by: str = "due_date",
+        order: str = "asc",
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> Page[Task]:
         from app.models.deal import Deal  # local import to avoid circular
 
         stmt = select(Task).join(Deal).where(Deal.organization_id == organization_id)
         if deal_id is not None:
             stmt = stmt.where(Task.deal_id == deal_id)
+        if owner_id is not None:
+            stmt = stmt.where(Task.owner_id == owner_id)
         if only_open:
             stmt = stmt.where(Task.is_done.is_(False))
         if due_before is not None:
             stmt = stmt.where(Task.due_date <= due_before)
         if due_after is not None:
             stmt = stmt.where(Task.due_date >= due_after)
-
-        result = await self.session.execute(stmt.order_by(Task.due_date))
-        return list(result.scalars().all())
+        return await self.paginate(stmt, order_by=order_by, order=order, limit=limit, cursor=cursor)
 
 
@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+from datetime import date
+from decimal import Decimal
+
+from pydantic import BaseModel, Field
+
 from app.models.deal import DealStage, DealStatus
 from app.schemas.common import ORMModel
 
@@ -15,3 +20,115 @@ class DealsFunnelOut(ORMModel):
     funnel: dict[str, dict[str, int]]
 
 
+class DealsTimeseriesPointOut(ORMModel):
+    bucket: date
+    created: int
+    won: int
+    lost: int
+
+
+class DealsTimeseriesOut(ORMModel):
+    interval: str
+    timezone: str
+    points: list[DealsTimeseriesPointOut]
+
+
+class StageVelocityOut(ORMModel):
+    stage: str
+    entered: int
+    advanced: int
+    conversion_rate: float
+    won: int
+    lost: int
+    median_seconds: float | None
+    p90_seconds: float | None
+    completed_stays: int
+
+
+class DealsVelocityOut(ORMModel):
+    stages: list[StageVelocityOut]
+    transitions: dict[str, dict[str, int]]
+    processed_through_activity_id: int
+
+
+class OwnerAmountsOut(ORMModel):
+    owner_id: int
+    deal_count: int
+    total: float
+    median: float
+
+
+class DealsAmountDistributionOut(ORMModel):
+    deal_count: int
+    total: float
+    mean: float
+    percentiles: dict[str, float]
+    histogram_edges: list[float]
+    histogram_counts: list[int]
+    by_owner: list[OwnerAmountsOut]
+
+
+class OwnerForecastOut(ORMModel):
+    owner_id: int
+    open_deals: int
+    pipeline: float
+    weighted: float
+
+
+class MonthForecastOut(ORMModel):
+    month: date | None
+    open_deals: int
+    pipeline: float
+    weighted: float
+
+
+class DealsForecastOut(ORMModel):
+    probabilities: dict[str, float]
+    open_deals: int
+    pipeline: float
+    weighted: float
+    by_owner: list[OwnerForecastOut]
+    by_month: list[MonthForecastOut]
+
+
+class StageProbabilitiesIn(BaseModel):
+    probabilities: dict[DealStage, Decimal] = Field(min_length=1)
+
+
+class StageProbabilitiesOut(ORMModel):
+    probabilities: dict[str, float]
+
+
+class MonthlyActiveContactsOut(ORMModel):
+    month: date
+    estimate: int
+
+
+class ActiveContactsOut(ORMModel):
+    month_from: date
+    month_to: date
+    total: int
+    months: list[MonthlyActiveContactsOut]
+    relative_error: float
+
+
+class AmountQuantilesOut(ORMModel):
+    month_from: date
+    month_to: date
+    deals: int
+    quantiles: dict[str, float | None]
+    relative_error: float
+
+
+class OrganizationDealsSummaryOut(ORMModel):
+    organization_id: int
+    organization_name: str
+    role: str
+    status: str
+    summary: DealsSummaryOut | None
+    error: str | None
+
+
+class DealsDashboardOut(ORMModel):
+    organizations: list[OrganizationDealsSummaryOut]
+    complete: bool
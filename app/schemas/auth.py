@@ -17,6 +17,10 @@ class LoginRequest(BaseModel):
     password: str
 
 
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+
 class TokenPair(ORMModel):
     access_token: str
     refresh_token: str
@@ -1,16 +1,26 @@
 from __future__ import annotations
 
+from typing import Generic, TypeVar
+
 from pydantic import BaseModel, ConfigDict
 
+ItemT = TypeVar("ItemT")
+
 
 class ORMModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
-class PaginatedResult(BaseModel):
-    items: list
+class PaginatedResult(BaseModel, Generic[ItemT]):
+    model_config = ConfigDict(from_attributes=True)
+
+    items: list[ItemT]
     page: int
     page_size: int
-    total: int
+    # None, если счётчик не запрашивали (count=none); total_estimated — оценка планировщика
+    total: int | None = None
+    total_estimated: bool = False
+    has_more: bool = False
+    next_cursor: str | None = None
 
 
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 
 from pydantic import BaseModel, Field
@@ -15,6 +15,7 @@ class DealCreate(BaseModel):
     title: str
     amount: Decimal = Field(ge=0)
     currency: str = "USD"
+    expected_close_date: date | None = None
 
 
 class DealUpdate(BaseModel):
@@ -23,6 +24,7 @@ class DealUpdate(BaseModel):
     currency: str | None = None
     status: DealStatus | None = None
     stage: DealStage | None = None
+    expected_close_date: date | None = None
 
 
 class DealOut(ORMModel):
@@ -35,7 +37,19 @@ class DealOut(ORMModel):
     currency: str
     status: DealStatus
     stage: DealStage
+    expected_close_date: date | None
     created_at: datetime
     updated_at: datetime
 
 
+class DealBoardColumnOut(ORMModel):
+    stage: DealStage
+    total_count: int
+    total_amount: Decimal
+    deals: list[DealOut]
+    # передаётся в GET /deals/board?cursor=..., чтобы догрузить только эту колонку
+    next_cursor: str | None
+
+
+class DealBoardOut(ORMModel):
+    columns: list[DealBoardColumnOut]
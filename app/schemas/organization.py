@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from datetime import datetime
 
+from pydantic import BaseModel
+
 from app.models.organization_member import OrganizationRole
 from app.schemas.common import ORMModel
 
@@ -20,3 +22,5 @@ class OrganizationMemberOut(ORMModel):
     created_at: datetime
 
 
+class OrganizationMemberRoleUpdate(BaseModel):
+    role: OrganizationRole
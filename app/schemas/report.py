@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from app.models.report_job import ReportKind, ReportStatus
+from app.schemas.common import ORMModel
+
+
+class ReportJobCreate(BaseModel):
+    kind: ReportKind
+    # cohort_conversion: months; owner_leaderboard: date_from, date_to; year_over_year: year
+    params: dict[str, Any] = Field(default_factory=dict)
+
+
+class ReportJobOut(ORMModel):
+    id: int
+    kind: ReportKind
+    params: dict[str, Any]
+    status: ReportStatus
+    error: str | None
+    created_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
+    expires_at: datetime | None
+
+
+class ReportResultOut(ORMModel):
+    id: int
+    kind: ReportKind
+    params: dict[str, Any]
+    result: dict[str, Any]
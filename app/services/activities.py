@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+from datetime import datetime, timezone
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.models.activity import Activity, ActivityType
 from app.repositories.activity import ActivityRepository
+from app.repositories.analytics_sketch import AnalyticsSketchRepository
+from app.repositories.base import Page
 from app.repositories.deal import DealRepository
 from app.services import exceptions
 
@@ -14,16 +19,30 @@ class ActivityService:
         session: AsyncSession,
         activity_repo: ActivityRepository | None = None,
         deal_repo: DealRepository | None = None,
+        sketch_repo: AnalyticsSketchRepository | None = None,
     ) -> None:
         self.session = session
         self.repo = activity_repo or ActivityRepository(session)
         self.deal_repo = deal_repo or DealRepository(session)
+        self.sketch_repo = sketch_repo or AnalyticsSketchRepository(session)
 
-    async def list_for_deal(self, *, deal_id: int, organization_id: int) -> list[Activity]:
+    async def list_for_deal(
+        self,
+        *,
+        deal_id: int,
+        organization_id: int,
+        order: str = "desc",
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> Page[Activity]:
         deal = await self.deal_repo.get(deal_id)
         if deal is None or deal.organization_id != organization_id:
             raise exceptions.NotFoundError("Сделка не найдена")
-        return await self.repo.list_for_deal(deal_id)
+        limit = min(limit or settings.list_default_limit, settings.list_max_limit)
+        try:
+            return await self.repo.list_for_deal(deal_id, order=order, limit=limit, cursor=cursor)
+        except ValueError as exc:
+            raise exceptions.ServiceError(str(exc)) from exc
 
     async def add_comment(
         self,
@@ -45,6 +64,7 @@ class ActivityService:
                 "payload": payload,
             }
         )
+        await self.sketch_repo.record_contact(organization_id, deal.contact_id, datetime.now(timezone.utc))
         await self.session.commit()
         return activity
 
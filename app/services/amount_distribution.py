@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.models.deal import DealStage, DealStatus
+from app.models.organization_revision import RevisionEntity
+from app.repositories.deal import DealRepository
+from app.repositories.organization_revision import OrganizationRevisionRepository
+from app.services import exceptions
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy ставится экстрой analytics
+    np = None  # type: ignore[assignment]
+
+PERCENTILES = (50, 75, 90, 95, 99)
+STATUSES = list(DealStatus)
+STAGES = list(DealStage)
+
+
+@dataclass(frozen=True)
+class DealColumns:
+    """Сделки организации в колоночном виде: по массиву на поле, суммы в целых центах."""
+
+    amount_cents: np.ndarray
+    status: np.ndarray
+    stage: np.ndarray
+    owner_id: np.ndarray
+    created_at: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.amount_cents)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            column.nbytes
+            for column in (self.amount_cents, self.status, self.stage, self.owner_id, self.created_at)
+        )
+
+
+def _columns_size(stamped: Any) -> int:
+    columns: DealColumns = stamped.value
+    return columns.nbytes
+
+
+# массивы numpy держим только в памяти воркера: через pickle в общий файл они дороже пересчёта
+columns_cache = LRUCache(
+    max_bytes=settings.deal_columns_cache_bytes,
+    namespace="deal_columns",
+    sizeof=_columns_size,
+)
+
+
+@dataclass
+class OwnerAmounts:
+    owner_id: int
+    deal_count: int
+    total: float
+    median: float
+
+
+@dataclass
+class AmountDistribution:
+    deal_count: int
+    total: float
+    mean: float
+    percentiles: dict[str, float]
+    histogram_edges: list[float]
+    histogram_counts: list[int]
+    by_owner: list[OwnerAmounts]
+
+
+def _units(cents: Any) -> float:
+    return round(float(cents) / 100, 2)
+
+
+@asynccontextmanager
+async def _detached(service: AmountDistributionService) -> AsyncIterator[AmountDistributionService]:
+    async with AsyncSession(service.session.bind, expire_on_commit=False) as session:
+        yield AmountDistributionService(session)
+
+
+class AmountDistributionService:
+    def __init__(
+        self,
+        session: AsyncSession,
+        deal_repo: DealRepository | None = None,
+        revision_repo: OrganizationRevisionRepository | None = None,
+    ) -> None:
+        self.session = session
+        self.repo = deal_repo or DealRepository(session)
+        self.revision_repo = revision_repo or OrganizationRevisionRepository(session)
+
+    async def load_columns(self, organization_id: int) -> DealColumns:
+        # ревизия из БД — та же, что в ETag ответа: снимок не переживает чужие изменения сделок
+        revision = await self.revision_repo.current(organization_id, RevisionEntity.deals)
+        return await self._load_columns(organization_id, revision)
+
+    @columns_cache.memoize(detach=_detached)
+    async def _load_columns(self, organization_id: int, revision: int) -> DealColumns:
+        amounts, statuses, stages, owners, created = [], [], [], [], []
+        async for batch in self.repo.stream_amount_columns(organization_id):
+            amount, status, stage, owner, created_at = zip(*batch, strict=True)
+            amounts.append(np.array(amount, dtype=np.int64))
+            statuses.append(np.array(status, dtype=np.uint8))
+            stages.append(np.array(stage, dtype=np.uint8))
+            owners.append(np.array(owner, dtype=np.int64))
+            created.append(np.array(created_at, dtype="datetime64[s]"))
+
+        def concat(parts: list[np.ndarray], dtype: Any) -> np.ndarray:
+            return np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+
+        return DealColumns(
+            amount_cents=concat(amounts, np.int64),
+            status=concat(statuses, np.uint8),
+            stage=concat(stages, np.uint8),
+            owner_id=concat(owners, np.int64),
+            created_at=concat(created, "datetime64[s]"),
+        )
+
+    async def distribution(
+        self,
+        organization_id: int,
+        *,
+        status: list[DealStatus] | None = None,
+        stage: DealStage | None = None,
+        created_from: date | None = None,
+        created_to: date | None = None,
+        bins: int = 20,
+    ) -> AmountDistribution:
+        if np is None:
+            raise exceptions.ServiceUnavailableError(
+                "Распределение сумм требует numpy: установите пакет с экстрой analytics"
+            )
+        columns = await self.load_columns(organization_id)
+        mask = np.ones(len(columns), dtype=bool)
+        if status:
+            mask &= np.isin(columns.status, [STATUSES.index(item) for item in status])
+        if stage is not None:
+            mask &= columns.stage == STAGES.index(stage)
+        if created_from is not None:
+            mask &= columns.created_at >= np.datetime64(created_from, "s")
+        if created_to is not None:
+            mask &= columns.created_at < np.datetime64(created_to + timedelta(days=1), "s")
+        amounts = columns.amount_cents[mask]
+        owners = columns.owner_id[mask]
+        if amounts.size == 0:
+            return AmountDistribution(0, 0.0, 0.0, {}, [], [], [])
+
+        percentiles = np.percentile(amounts, PERCENTILES)
+        counts, edges = np.histogram(amounts, bins=bins)
+
+        # сортировка по (владелец, сумма) даёт медиану каждой группы по смещениям без цикла по сделкам
+        order = np.lexsort((amounts, owners))
+        sorted_amounts = amounts[order]
+        owner_ids, starts, sizes = np.unique(owners[order], return_index=True, return_counts=True)
+        medians = (sorted_amounts[starts + (sizes - 1) // 2] + sorted_amounts[starts + sizes // 2]) / 2
+        totals = np.add.reduceat(sorted_amounts, starts)
+
+        return AmountDistribution(
+            deal_count=int(amounts.size),
+            total=_units(amounts.sum()),
+            mean=_units(amounts.mean()),
+            percentiles={f"p{p}": _units(value) for p, value in zip(PERCENTILES, percentiles, strict=True)},
+            histogram_edges=[_units(edge) for edge in edges],
+            histogram_counts=counts.tolist(),
+            by_owner=[
+                OwnerAmounts(
+                    owner_id=int(owner), deal_count=int(size), total=_units(total), median=_units(median)
+                )
+                for owner, size, total, median in zip(owner_ids, sizes, totals, medians, strict=True)
+            ],
+        )
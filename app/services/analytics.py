@@ -1,16 +1,31 @@
 from __future__ import annotations
 
+import enum
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.cache import TTLCache
+from app.core.cache_backends import create_cache
 from app.core.config import settings
-from app.models.deal import DealStage, DealStatus
+from app.models.deal import DealStatus
+from app.models.organization_revision import RevisionEntity
 from app.repositories.deal import DealRepository
+from app.repositories.deal_hourly_stat import DealHourlyStatRepository
+from app.repositories.deal_stat import DealStatRepository
+from app.repositories.organization_revision import OrganizationRevisionRepository
+from app.services import exceptions
 
-
-cache = TTLCache(ttl_seconds=settings.cache_ttl_seconds)
+cache = create_cache(
+    "analytics",
+    max_entries=settings.cache_max_entries,
+    ttl_seconds=settings.cache_ttl_seconds,
+    sweep_interval_seconds=settings.cache_sweep_interval_seconds,
+)
 
 
 @dataclass
@@ -21,38 +36,168 @@ class DealSummary:
     new_deals_last_n_days: int
 
 
+class TimeseriesInterval(str, enum.Enum):
+    day = "day"
+    week = "week"
+    month = "month"
+
+
+# ограничение окна держит число читаемых почасовых корзин в пределах ~26 тыс.
+MAX_TIMESERIES_DAYS = 3 * 366
+
+
+@dataclass
+class TimeseriesPoint:
+    bucket: date
+    created: int = 0
+    won: int = 0
+    lost: int = 0
+
+
+def _bucket_of(day: date, interval: TimeseriesInterval) -> date:
+    if interval == TimeseriesInterval.week:
+        return day - timedelta(days=day.weekday())
+    if interval == TimeseriesInterval.month:
+        return day.replace(day=1)
+    return day
+
+
+def _next_bucket(bucket: date, interval: TimeseriesInterval) -> date:
+    if interval == TimeseriesInterval.week:
+        return bucket + timedelta(weeks=1)
+    if interval == TimeseriesInterval.month:
+        return (bucket + timedelta(days=32)).replace(day=1)
+    return bucket + timedelta(days=1)
+
+
+def _utc_midnight(day: date, zone: ZoneInfo) -> datetime:
+    return datetime.combine(day, time(), tzinfo=zone).astimezone(timezone.utc).replace(tzinfo=None)
+
+
+@asynccontextmanager
+async def _detached(service: AnalyticsService) -> AsyncIterator[AnalyticsService]:
+    async with AsyncSession(service.session.bind, expire_on_commit=False) as session:
+        yield AnalyticsService(session)
+
+
 class AnalyticsService:
-    def __init__(self, session: AsyncSession, deal_repo: DealRepository | None = None) -> None:
+    def __init__(
+        self,
+        session: AsyncSession,
+        deal_repo: DealRepository | None = None,
+        stats_repo: DealStatRepository | None = None,
+        hourly_stats_repo: DealHourlyStatRepository | None = None,
+        revision_repo: OrganizationRevisionRepository | None = None,
+    ) -> None:
         self.session = session
         self.repo = deal_repo or DealRepository(session)
+        self.stats_repo = stats_repo or DealStatRepository(session)
+        self.hourly_stats_repo = hourly_stats_repo or DealHourlyStatRepository(session)
+        self.revision_repo = revision_repo or OrganizationRevisionRepository(session)
+
+    # Ключ кэша — ревизия сделок из БД, прочитанная в том же запросе, что и данные: кэш может
+    # быть общим для воркеров, и запись под ревизией N всегда посчитана по состоянию не старше N.
+    async def _revision(self, organization_id: int) -> int:
+        return await self.revision_repo.current(organization_id, RevisionEntity.deals)
 
     async def deals_summary(self, organization_id: int, *, last_days: int = 30) -> DealSummary:
-        cache_key = (organization_id, last_days)
-        cached = cache.get(cache_key)
-        if cached:
-            return cached
-        count_by_status = await self.repo.count_by_status(organization_id)
-        amount_stats = await self.repo.amount_stats_by_status(organization_id)
-        amount_by_status = {status.value: float(stats["total"]) for status, stats in amount_stats.items()}
-        won_stats = amount_stats.get(DealStatus.won)
-        average_won_amount = float(won_stats["avg"]) if won_stats else 0.0
+        revision = await self._revision(organization_id)
+        return await self._deals_summary(organization_id, revision, last_days=last_days)
+
+    async def deals_funnel(self, organization_id: int) -> dict[str, dict[str, int]]:
+        return await self._deals_funnel(organization_id, await self._revision(organization_id))
+
+    async def deals_timeseries(
+        self,
+        organization_id: int,
+        *,
+        interval: TimeseriesInterval = TimeseriesInterval.day,
+        tz: str = "UTC",
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> list[TimeseriesPoint]:
+        revision = await self._revision(organization_id)
+        return await self._deals_timeseries(
+            organization_id,
+            revision,
+            interval=interval,
+            tz=tz,
+            date_from=date_from,
+            date_to=date_to,
+        )
+
+    @cache.memoize(stale_seconds=settings.analytics_stale_seconds, detach=_detached)
+    async def _deals_summary(
+        self, organization_id: int, revision: int, *, last_days: int
+    ) -> DealSummary:
+        # счётчики и суммы берём из свёртки deal_stats: O(статусы × стадии) строк вместо скана сделок
+        count_by_status: dict[str, int] = {}
+        amount_by_status: dict[str, Decimal] = {}
+        for row in await self.stats_repo.list_for_org(organization_id):
+            count_by_status[row.status.value] = count_by_status.get(row.status.value, 0) + row.deal_count
+            amount_by_status[row.status.value] = amount_by_status.get(row.status.value, Decimal(0)) + Decimal(
+                row.amount_total
+            )
+        won_count = count_by_status.get(DealStatus.won.value, 0)
+        average_won_amount = amount_by_status[DealStatus.won.value] / won_count if won_count else Decimal(0)
         new_deals = await self.repo.count_newer_than(organization_id, last_days)
-        summary = DealSummary(
-            count_by_status={status.value: count for status, count in count_by_status.items()},
-            amount_by_status=amount_by_status,
-            average_won_amount=average_won_amount,
+        return DealSummary(
+            count_by_status=count_by_status,
+            amount_by_status={status: float(total) for status, total in amount_by_status.items()},
+            average_won_amount=float(average_won_amount),
             new_deals_last_n_days=new_deals,
         )
-        cache.set(cache_key, summary)
-        return summary
 
-    async def deals_funnel(self, organization_id: int) -> dict[str, dict[str, int]]:
-        rows = await self.repo.funnel(organization_id)
+    @cache.memoize(stale_seconds=settings.analytics_stale_seconds, detach=_detached)
+    async def _deals_funnel(self, organization_id: int, revision: int) -> dict[str, dict[str, int]]:
         funnel: dict[str, dict[str, int]] = {}
-        for stage, status, count in rows:
-            funnel.setdefault(stage.value if isinstance(stage, DealStage) else stage, {})[
-                status.value if isinstance(status, DealStatus) else status
-            ] = count
+        for row in await self.stats_repo.list_for_org(organization_id):
+            funnel.setdefault(row.stage.value, {})[row.status.value] = row.deal_count
         return funnel
 
+    @cache.memoize(stale_seconds=settings.analytics_stale_seconds, detach=_detached)
+    async def _deals_timeseries(
+        self,
+        organization_id: int,
+        revision: int,
+        *,
+        interval: TimeseriesInterval,
+        tz: str,
+        date_from: date | None,
+        date_to: date | None,
+    ) -> list[TimeseriesPoint]:
+        try:
+            zone = ZoneInfo(tz)
+        except (ZoneInfoNotFoundError, ValueError) as exc:
+            raise exceptions.ServiceError(f"Неизвестный часовой пояс: {tz}") from exc
+        date_to = date_to or datetime.now(zone).date()
+        date_from = date_from or date_to - timedelta(days=29)
+        if date_from > date_to:
+            raise exceptions.ServiceError("date_from должен быть не позже date_to")
+        if (date_to - date_from).days >= MAX_TIMESERIES_DAYS:
+            raise exceptions.ServiceError(f"Период не может превышать {MAX_TIMESERIES_DAYS} дней")
+
+        points: dict[date, TimeseriesPoint] = {}
+        bucket = _bucket_of(date_from, interval)
+        while bucket <= date_to:
+            points[bucket] = TimeseriesPoint(bucket=bucket)
+            bucket = _next_bucket(bucket, interval)
+
+        # свёртка почасовая в UTC: для поясов с целым смещением час целиком лежит в одних локальных
+        # сутках; в поясах вроде +05:30 пограничный час относим к суткам, в которые попадает его середина
+        rows = await self.hourly_stats_repo.list_range(
+            organization_id,
+            _utc_midnight(date_from, zone),
+            _utc_midnight(date_to + timedelta(days=1), zone),
+        )
+        for row in rows:
+            middle = row.bucket_start.replace(tzinfo=timezone.utc) + timedelta(minutes=30)
+            local_day = middle.astimezone(zone).date()
+            point = points.get(_bucket_of(local_day, interval))
+            if point is None or not date_from <= local_day <= date_to:
+                continue
+            point.created += row.created_count
+            point.won += row.won_count
+            point.lost += row.lost_count
+        return list(points.values())
 
@@ -1,13 +1,21 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import NoReturn
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import create_access_token, create_refresh_token, get_password_hash, verify_password
+from app.core.config import settings
+from app.core.hashing import HashingError, password_hasher
+from app.core.revocation import remember_revocation, revocation_store, to_timestamp
+from app.core.security import TokenError, create_access_token, create_refresh_token, decode_token
 from app.models.organization_member import OrganizationRole
+from app.models.revoked_token import RevocationKind
 from app.repositories.organization import OrganizationRepository
 from app.repositories.organization_member import OrganizationMemberRepository
+from app.repositories.revoked_token import RevokedTokenRepository
 from app.repositories.user import UserRepository
 from app.services import exceptions
 
@@ -25,11 +33,13 @@ class AuthService:
         user_repo: UserRepository | None = None,
         org_repo: OrganizationRepository | None = None,
         member_repo: OrganizationMemberRepository | None = None,
+        revoked_repo: RevokedTokenRepository | None = None,
     ) -> None:
         self.session = session
         self.user_repo = user_repo or UserRepository(session)
         self.org_repo = org_repo or OrganizationRepository(session)
         self.member_repo = member_repo or OrganizationMemberRepository(session)
+        self.revoked_repo = revoked_repo or RevokedTokenRepository(session)
 
     async def register(
         self, *, email: str, password: str, name: str, organization_name: str
@@ -39,10 +49,15 @@ class AuthService:
         if await self.org_repo.get_by_name(organization_name):
             raise exceptions.ConflictError("Организация с таким именем уже существует")
 
+        try:
+            hashed_password = await password_hasher.hash(password)
+        except HashingError as exc:
+            raise exceptions.ServiceUnavailableError(str(exc)) from exc
+
         user = await self.user_repo.create(
             {
                 "email": email,
-                "hashed_password": get_password_hash(password),
+                "hashed_password": hashed_password,
                 "name": name,
             }
         )
@@ -63,7 +78,13 @@ class AuthService:
 
     async def login(self, *, email: str, password: str) -> AuthResult:
         user = await self.user_repo.get_by_email(email)
-        if user is None or not verify_password(password, user.hashed_password):
+        if user is None:
+            raise exceptions.ServiceError("Неверные учетные данные", status_code=401)
+        try:
+            is_valid = await password_hasher.verify(password, user.hashed_password)
+        except HashingError as exc:
+            raise exceptions.ServiceUnavailableError(str(exc)) from exc
+        if not is_valid:
             raise exceptions.ServiceError("Неверные учетные данные", status_code=401)
 
         return AuthResult(
@@ -71,4 +92,84 @@ class AuthService:
             refresh_token=create_refresh_token(str(user.id)),
         )
 
+    async def refresh(self, *, refresh_token: str) -> AuthResult:
+        try:
+            payload = decode_token(refresh_token, expected_type="refresh")
+        except TokenError as exc:
+            raise exceptions.ServiceError(str(exc), status_code=401) from exc
+
+        jti, family_id, subject = payload.get("jti"), payload.get("fam"), payload.get("sub")
+        if not jti or not family_id or not subject:
+            raise exceptions.ServiceError("Refresh-токен без идентификатора", status_code=401)
+        user_id = int(subject)
+
+        if not revocation_store.loaded:
+            revocation_store.load(await self.revoked_repo.list_active(_utcnow()))
+        if revocation_store.is_revoked(jti):
+            await self._revoke_family(family_id, user_id)
+        if revocation_store.is_revoked(family_id):
+            raise exceptions.ServiceError("Refresh-токен отозван", status_code=401)
+
+        # в памяти другого воркера отзыва могло не быть, поэтому сверяемся с таблицей
+        revoked = await self.revoked_repo.find_revoked([jti, family_id])
+        if jti in revoked:
+            await self._revoke_family(family_id, user_id)
+        if family_id in revoked:
+            remember_revocation(family_id, to_timestamp(revoked[family_id]))
+            raise exceptions.ServiceError("Refresh-токен отозван", status_code=401)
+
+        if await self.user_repo.get(user_id) is None:
+            raise exceptions.ServiceError("Пользователь не найден", status_code=401)
+
+        expires_at = float(payload["exp"])
+        try:
+            await self.revoked_repo.create(
+                {
+                    "token_id": jti,
+                    "kind": RevocationKind.token,
+                    "user_id": user_id,
+                    "expires_at": _from_timestamp(expires_at),
+                }
+            )
+            await self.session.commit()
+        except IntegrityError:
+            await self.session.rollback()
+            await self._revoke_family(family_id, user_id)
+        remember_revocation(jti, expires_at)
+
+        return AuthResult(
+            access_token=create_access_token(subject),
+            refresh_token=create_refresh_token(subject, family_id=family_id),
+        )
+
+    async def _revoke_family(self, family_id: str, user_id: int) -> NoReturn:
+        """Повторное предъявление уже ротированного токена: отзываем всю цепочку."""
+        expires_at = _utcnow() + _family_ttl()
+        if not (await self.revoked_repo.find_revoked([family_id])):
+            await self.revoked_repo.create(
+                {
+                    "token_id": family_id,
+                    "kind": RevocationKind.family,
+                    "user_id": user_id,
+                    "expires_at": expires_at,
+                }
+            )
+            try:
+                await self.session.commit()
+            except IntegrityError:
+                await self.session.rollback()
+        remember_revocation(family_id, to_timestamp(expires_at))
+        raise exceptions.ServiceError("Повторное использование refresh-токена", status_code=401)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _from_timestamp(value: float) -> datetime:
+    return datetime.fromtimestamp(value, tz=timezone.utc).replace(tzinfo=None)
+
 
+def _family_ttl() -> timedelta:
+    # любой токен семейства, выпущенный до отзыва, истекает не позже этого срока
+    return timedelta(minutes=settings.refresh_token_expire_minutes)
@@ -4,8 +4,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.contact import Contact
 from app.models.organization_member import OrganizationRole
+from app.models.organization_revision import RevisionEntity
+from app.repositories.base import CountMode, Page
 from app.repositories.contact import ContactRepository
 from app.repositories.deal import DealRepository
+from app.repositories.organization_revision import OrganizationRevisionRepository
 from app.services import exceptions
 
 
@@ -15,10 +18,12 @@ class ContactService:
         session: AsyncSession,
         contact_repo: ContactRepository | None = None,
         deal_repo: DealRepository | None = None,
+        revision_repo: OrganizationRevisionRepository | None = None,
     ) -> None:
         self.session = session
         self.repo = contact_repo or ContactRepository(session)
         self.deal_repo = deal_repo or DealRepository(session)
+        self.revision_repo = revision_repo or OrganizationRevisionRepository(session)
 
     async def list_contacts(
         self,
@@ -29,15 +34,32 @@ class ContactService:
         search: str | None,
         page: int,
         page_size: int,
-    ) -> list[Contact]:
+        order_by: str = "created_at",
+        order: str = "asc",
+        cursor: str | None = None,
+        count: CountMode = CountMode.none,
+    ) -> Page[Contact]:
         offset = (page - 1) * page_size
-        return await self.repo.list_for_org(
-            organization_id,
-            owner_id=owner_id,
-            search=search,
-            limit=page_size,
-            offset=offset,
+        revision = (
+            await self.revision_repo.current(organization_id, RevisionEntity.contacts)
+            if count != CountMode.none
+            else None
         )
+        try:
+            return await self.repo.list_for_org(
+                organization_id,
+                owner_id=owner_id,
+                search=search,
+                order_by=order_by,
+                order=order,
+                limit=page_size,
+                offset=offset,
+                cursor=cursor,
+                count=count,
+                revision=revision,
+            )
+        except ValueError as exc:
+            raise exceptions.ServiceError(str(exc)) from exc
 
     async def create_contact(
         self,
@@ -57,6 +79,7 @@ class ContactService:
                 "phone": phone,
             }
         )
+        await self.revision_repo.bump(organization_id, RevisionEntity.contacts)
         await self.session.commit()
         return contact
 
@@ -79,6 +102,7 @@ class ContactService:
             raise exceptions.ConflictError("Нельзя удалить контакт с активными сделками")
 
         await self.repo.delete(contact_id)
+        await self.revision_repo.bump(organization_id, RevisionEntity.contacts)
         await self.session.commit()
 
 
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+import enum
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.repositories.organization_member import OrganizationMemberRepository
+from app.services import exceptions
+from app.services.analytics import AnalyticsService, DealSummary
+
+# опоздавшие расчёты дорабатывают в фоне; держим ссылки, чтобы задачи не собрал GC
+_background: set[asyncio.Task[DealSummary]] = set()
+
+
+def _forget(task: asyncio.Task[DealSummary]) -> None:
+    _background.discard(task)
+    if not task.cancelled():
+        task.exception()
+
+
+class OrganizationResultStatus(str, enum.Enum):
+    ok = "ok"
+    timeout = "timeout"
+    error = "error"
+
+
+@dataclass
+class OrganizationDealsSummary:
+    organization_id: int
+    organization_name: str
+    role: str
+    status: OrganizationResultStatus
+    summary: DealSummary | None = None
+    error: str | None = None
+
+
+@dataclass
+class DealsDashboard:
+    organizations: list[OrganizationDealsSummary]
+    # False, если хотя бы одна организация не успела или завершилась ошибкой
+    complete: bool
+
+
+class DashboardService:
+    """Сводка по сделкам во всех организациях пользователя за один запрос.
+
+    Членства читаются одним запросом, затем сводки организаций считаются параллельно,
+    каждая в собственной сессии из пула: одна AsyncSession не допускает конкурентных
+    запросов. Семафор ограничивает число одновременно занятых соединений. Организации,
+    не уложившиеся в общий дедлайн, возвращаются со статусом ``timeout``; их расчёт
+    дорабатывает в фоне и прогревает кэш аналитики для следующего запроса. Фоновых
+    расчётов в процессе не больше ``dashboard_max_background``, лишние отменяются.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        member_repo: OrganizationMemberRepository | None = None,
+        *,
+        max_concurrency: int | None = None,
+        timeout_seconds: float | None = None,
+    ) -> None:
+        self.session = session
+        self.member_repo = member_repo or OrganizationMemberRepository(session)
+        self.session_factory = async_sessionmaker(session.bind, expire_on_commit=False)
+        self.max_concurrency = max_concurrency or settings.dashboard_max_concurrency
+        self.timeout_seconds = timeout_seconds or settings.dashboard_timeout_seconds
+
+    async def deals_summary(self, user_id: int, *, last_days: int = 30) -> DealsDashboard:
+        memberships = await self.member_repo.list_organizations_for_user(user_id)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def summarize(organization_id: int) -> DealSummary:
+            async with semaphore, self.session_factory() as session:
+                return await AnalyticsService(session).deals_summary(organization_id, last_days=last_days)
+
+        tasks = [asyncio.create_task(summarize(organization.id)) for organization, _ in memberships]
+        if tasks:
+            await asyncio.wait(tasks, timeout=self.timeout_seconds)
+
+        organizations = []
+        for (organization, membership), task in zip(memberships, tasks, strict=True):
+            entry = OrganizationDealsSummary(
+                organization_id=organization.id,
+                organization_name=organization.name,
+                role=membership.role.value,
+                status=OrganizationResultStatus.error,
+            )
+            if not task.done():
+                if len(_background) < settings.dashboard_max_background:
+                    _background.add(task)
+                    task.add_done_callback(_forget)
+                else:
+                    task.cancel()
+                entry.status = OrganizationResultStatus.timeout
+                entry.error = "Превышено время ожидания"
+            elif isinstance(exc := task.exception(), exceptions.ServiceError):
+                entry.error = exc.message
+            elif exc is not None:
+                entry.error = "Не удалось посчитать сводку"
+            else:
+                entry.status = OrganizationResultStatus.ok
+                entry.summary = task.result()
+            organizations.append(entry)
+        return DealsDashboard(
+            organizations=organizations,
+            complete=all(entry.status == OrganizationResultStatus.ok for entry in organizations),
+        )
@@ -1,19 +1,39 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
 from decimal import Decimal
+from typing import Any
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.versions import publish_deal_version
 from app.models.activity import ActivityType
 from app.models.contact import Contact
 from app.models.deal import Deal, DealStage, DealStatus
 from app.models.organization_member import OrganizationRole
+from app.models.organization_revision import RevisionEntity
 from app.repositories.activity import ActivityRepository
+from app.repositories.analytics_sketch import AnalyticsSketchRepository
+from app.repositories.base import CountMode, Page
 from app.repositories.contact import ContactRepository
-from app.repositories.deal import DealRepository
+from app.repositories.deal import BOARD_SORT_KEYS, DealRepository
+from app.repositories.deal_hourly_stat import DealHourlyStatRepository
+from app.repositories.deal_stat import DealStatRepository
+from app.repositories.organization_revision import OrganizationRevisionRepository
+from app.repositories.pipeline_total import OPEN_STATUSES, PipelineTotalRepository
 from app.services import exceptions
 
 
+@dataclass
+class BoardColumn:
+    stage: DealStage
+    total_count: int
+    total_amount: Decimal
+    deals: list[Deal]
+    next_cursor: str | None
+
+
 class DealService:
     stage_order = [
         DealStage.qualification,
@@ -28,11 +48,21 @@ class DealService:
         deal_repo: DealRepository | None = None,
         contact_repo: ContactRepository | None = None,
         activity_repo: ActivityRepository | None = None,
+        revision_repo: OrganizationRevisionRepository | None = None,
+        stats_repo: DealStatRepository | None = None,
+        hourly_stats_repo: DealHourlyStatRepository | None = None,
+        pipeline_repo: PipelineTotalRepository | None = None,
+        sketch_repo: AnalyticsSketchRepository | None = None,
     ) -> None:
         self.session = session
         self.repo = deal_repo or DealRepository(session)
         self.contact_repo = contact_repo or ContactRepository(session)
         self.activity_repo = activity_repo or ActivityRepository(session)
+        self.revision_repo = revision_repo or OrganizationRevisionRepository(session)
+        self.stats_repo = stats_repo or DealStatRepository(session)
+        self.hourly_stats_repo = hourly_stats_repo or DealHourlyStatRepository(session)
+        self.pipeline_repo = pipeline_repo or PipelineTotalRepository(session)
+        self.sketch_repo = sketch_repo or AnalyticsSketchRepository(session)
 
     async def list_deals(
         self,
@@ -47,19 +77,81 @@ class DealService:
         order: str,
         limit: int,
         offset: int,
-    ) -> list[Deal]:
-        return await self.repo.list_for_org(
-            organization_id=organization_id,
+        cursor: str | None = None,
+        count: CountMode = CountMode.none,
+    ) -> Page[Deal]:
+        # подсчёт кэшируется под ревизией сделок, поэтому новая сделка сразу меняет total
+        revision = (
+            await self.revision_repo.current(organization_id, RevisionEntity.deals)
+            if count != CountMode.none
+            else None
+        )
+        try:
+            return await self.repo.list_for_org(
+                organization_id=organization_id,
+                status=status,
+                min_amount=min_amount,
+                max_amount=max_amount,
+                stage=stage,
+                owner_id=owner_id,
+                order_by=order_by,
+                order=order,
+                limit=limit,
+                offset=offset,
+                cursor=cursor,
+                count=count,
+                revision=revision,
+            )
+        except ValueError as exc:
+            raise exceptions.ServiceError(str(exc)) from exc
+
+    async def board(
+        self,
+        *,
+        organization_id: int,
+        status: list[DealStatus] | None,
+        owner_id: int | None,
+        order_by: str,
+        order: str,
+        limit: int,
+        cursor: str | None = None,
+    ) -> list[BoardColumn]:
+        """Колонки канбана по стадиям; с ``cursor`` — следующая страница одной колонки."""
+        if order_by not in BOARD_SORT_KEYS:
+            raise exceptions.ServiceError(f"Сортировка доски возможна только по: {', '.join(BOARD_SORT_KEYS)}")
+        stages = self.stage_order
+        after: tuple[Any, int] | None = None
+        if cursor is not None:
+            try:
+                after, payload = self.repo.decode_keyset(cursor, order_by=order_by, order=order)
+            except ValueError as exc:
+                raise exceptions.ServiceError(str(exc)) from exc
+            try:
+                stages = [DealStage(payload["stage"])]
+            except (ValueError, KeyError) as exc:
+                raise exceptions.ServiceError("Некорректный курсор") from exc
+
+        columns = await self.repo.board(
+            organization_id,
+            stages=stages,
             status=status,
-            min_amount=min_amount,
-            max_amount=max_amount,
-            stage=stage,
             owner_id=owner_id,
             order_by=order_by,
             order=order,
             limit=limit,
-            offset=offset,
+            after=after,
         )
+        board = []
+        for stage, column in columns.items():
+            next_cursor = None
+            if column.has_more:
+                next_cursor = self.repo.encode_keyset(
+                    column.deals[-1], order_by=order_by, order=order, stage=stage.value
+                )
+            board.append(
+                BoardColumn(stage, column.total_count, column.total_amount, column.deals, next_cursor)
+            )
+        return board
 
     async def _ensure_contact(self, contact_id: int, organization_id: int) -> Contact:
         contact = await self.contact_repo.get(contact_id)
@@ -82,6 +174,7 @@ class DealService:
         title: str,
         amount: Decimal,
         currency: str,
+        expected_close_date: date | None = None,
     ) -> Deal:
         await self._ensure_contact(contact_id, organization_id)
         self._ensure_can_assign_owner(role=role, owner_id=owner_id, actor_id=actor_id)
@@ -93,11 +186,40 @@ class DealService:
                 "title": title,
                 "amount": amount,
                 "currency": currency,
+                "expected_close_date": expected_close_date,
             }
         )
+        await self._apply_pipeline(organization_id, self._pipeline_entry(deal), sign=1)
+        await self.stats_repo.apply(organization_id, deal.status, deal.stage, count=1, amount=deal.amount)
+        now = datetime.now(timezone.utc)
+        await self.hourly_stats_repo.apply(organization_id, now, created=1)
+        await self.sketch_repo.record_contact(organization_id, contact_id, now)
+        await self.sketch_repo.record_amount(organization_id, now, deal.amount)
+        revision = await self.revision_repo.bump(organization_id, RevisionEntity.deals)
         await self.session.commit()
+        publish_deal_version(organization_id, revision)
         return deal
 
+    @staticmethod
+    def _pipeline_entry(deal: Deal) -> tuple[int, DealStage, date | None, Decimal] | None:
+        if deal.status not in OPEN_STATUSES:
+            return None
+        return deal.owner_id, deal.stage, deal.expected_close_date, deal.amount
+
+    async def _apply_pipeline(
+        self,
+        organization_id: int,
+        entry: tuple[int, DealStage, date | None, Decimal] | None,
+        *,
+        sign: int,
+    ) -> None:
+        if entry is None:
+            return
+        owner_id, stage, expected_close_date, amount = entry
+        await self.pipeline_repo.apply(
+            organization_id, owner_id, stage, expected_close_date, count=sign, amount=sign * amount
+        )
+
     def _check_status_rules(self, *, status: DealStatus | None, amount: Decimal | None) -> None:
         if status == DealStatus.won and (amount is None or amount <= 0):
             raise exceptions.ServiceError("Нельзя закрыть сделку со статусом won и amount <= 0")
@@ -126,7 +248,8 @@ class DealService:
         role: OrganizationRole,
         data: dict[str, object],
     ) -> Deal:
-        deal = await self.repo.get(deal_id)
+        # дельты свёрток считаются от старых значений, поэтому строка блокируется до коммита
+        deal = await self.repo.get_for_update(deal_id)
         if deal is None or deal.organization_id != organization_id:
             raise exceptions.NotFoundError("Сделка не найдена")
         if role == OrganizationRole.member and deal.owner_id != actor_id:
@@ -140,36 +263,68 @@ class DealService:
         if new_stage:
             self._check_stage_transition(current=deal.stage, new_stage=new_stage, role=role)
 
+        # UPDATE ... RETURNING обновляет тот же объект в identity map, поэтому старые значения снимаем заранее
+        old_status, old_stage, old_amount = deal.status, deal.stage, deal.amount
+        old_pipeline_entry = self._pipeline_entry(deal)
         updated = await self.repo.update(deal_id, data)
         if updated is None:
             raise exceptions.NotFoundError("Сделка не найдена")
 
-        if new_status and new_status != deal.status:
+        new_pipeline_entry = self._pipeline_entry(updated)
+        if new_pipeline_entry != old_pipeline_entry:
+            await self._apply_pipeline(organization_id, old_pipeline_entry, sign=-1)
+            await self._apply_pipeline(organization_id, new_pipeline_entry, sign=1)
+
+        if (updated.status, updated.stage, updated.amount) != (old_status, old_stage, old_amount):
+            await self.stats_repo.apply(organization_id, old_status, old_stage, count=-1, amount=-old_amount)
+            await self.stats_repo.apply(
+                organization_id, updated.status, updated.stage, count=1, amount=updated.amount
+            )
+
+        await self.sketch_repo.record_contact(organization_id, updated.contact_id, datetime.now(timezone.utc))
+        if updated.amount != old_amount:
+            # сумма учитывается в месяце создания сделки: старое значение вычитаем, новое добавляем
+            await self.sketch_repo.record_amount(organization_id, updated.created_at, old_amount, count=-1)
+            await self.sketch_repo.record_amount(organization_id, updated.created_at, updated.amount)
+
+        # won/lost почасовой свёртки — события закрытия, как и в её rebuild по status_changed:
+        # откат статуса ничего не вычитает, закрытие в тот час действительно было
+        if updated.status != old_status and updated.status in (DealStatus.won, DealStatus.lost):
+            await self.hourly_stats_repo.apply(
+                organization_id,
+                datetime.now(timezone.utc),
+                won=int(updated.status == DealStatus.won),
+                lost=int(updated.status == DealStatus.lost),
+            )
+
+        if new_status and new_status != old_status:
             await self.activity_repo.create(
                 {
                     "deal_id": deal_id,
                     "author_id": actor_id,
                     "type": ActivityType.status_changed,
                     "payload": {
-                        "old_status": deal.status,
+                        "old_status": old_status,
                         "new_status": new_status,
                     },
                 }
             )
-        if new_stage and new_stage != deal.stage:
+        if new_stage and new_stage != old_stage:
             await self.activity_repo.create(
                 {
                     "deal_id": deal_id,
                     "author_id": actor_id,
                     "type": ActivityType.stage_changed,
                     "payload": {
-                        "old_stage": deal.stage,
+                        "old_stage": old_stage,
                         "new_stage": new_stage,
                     },
                 }
             )
 
+        revision = await self.revision_repo.bump(organization_id, RevisionEntity.deals)
         await self.session.commit()
+        publish_deal_version(organization_id, revision)
         return updated
 
 
@@ -26,3 +26,5 @@ class ConflictError(ServiceError):
     status_code = 409
 
 
+class ServiceUnavailableError(ServiceError):
+    status_code = 503
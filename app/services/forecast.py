@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.deal import DealStage
+from app.models.organization_member import OrganizationRole
+from app.models.organization_revision import RevisionEntity
+from app.repositories.organization_revision import OrganizationRevisionRepository
+from app.repositories.pipeline_total import UNSCHEDULED_MONTH, PipelineTotalRepository
+from app.repositories.stage_probability import StageProbabilityRepository
+from app.services import exceptions
+
+DEFAULT_STAGE_PROBABILITIES: dict[DealStage, Decimal] = {
+    DealStage.qualification: Decimal("0.1"),
+    DealStage.proposal: Decimal("0.3"),
+    DealStage.negotiation: Decimal("0.6"),
+    DealStage.closed: Decimal("0.9"),
+}
+
+
+@dataclass
+class OwnerForecast:
+    owner_id: int
+    open_deals: int
+    pipeline: float
+    weighted: float
+
+
+@dataclass
+class MonthForecast:
+    month: date | None
+    open_deals: int
+    pipeline: float
+    weighted: float
+
+
+@dataclass
+class Forecast:
+    probabilities: dict[str, float]
+    open_deals: int
+    pipeline: float
+    weighted: float
+    by_owner: list[OwnerForecast]
+    by_month: list[MonthForecast]
+
+
+class ForecastService:
+    """Взвешенный прогноз по открытым сделкам: сумма amount × вероятность стадии.
+
+    Читает накопительные корзины pipeline_totals (владелец × стадия × месяц закрытия),
+    которые DealService сдвигает дельтами при каждом изменении сделки. Вероятность
+    применяется при чтении, поэтому её смена не требует пересчёта корзин.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        pipeline_repo: PipelineTotalRepository | None = None,
+        probability_repo: StageProbabilityRepository | None = None,
+        revision_repo: OrganizationRevisionRepository | None = None,
+    ) -> None:
+        self.session = session
+        self.pipeline_repo = pipeline_repo or PipelineTotalRepository(session)
+        self.probability_repo = probability_repo or StageProbabilityRepository(session)
+        self.revision_repo = revision_repo or OrganizationRevisionRepository(session)
+
+    async def probabilities(self, organization_id: int) -> dict[DealStage, Decimal]:
+        return {**DEFAULT_STAGE_PROBABILITIES, **await self.probability_repo.for_org(organization_id)}
+
+    async def set_probabilities(
+        self,
+        *,
+        organization_id: int,
+        role: OrganizationRole,
+        probabilities: dict[DealStage, Decimal],
+    ) -> dict[DealStage, Decimal]:
+        if role not in (OrganizationRole.owner, OrganizationRole.admin):
+            raise exceptions.PermissionDeniedError("Менять вероятности стадий могут только owner и admin")
+        if any(not Decimal(0) <= value <= Decimal(1) for value in probabilities.values()):
+            raise exceptions.ServiceError("Вероятность стадии должна быть в диапазоне от 0 до 1")
+        await self.probability_repo.upsert_many(organization_id, probabilities)
+        # прогноз отдаётся с ETag по ревизии сделок
+        await self.revision_repo.bump(organization_id, RevisionEntity.deals)
+        await self.session.commit()
+        return await self.probabilities(organization_id)
+
+    async def forecast(self, organization_id: int) -> Forecast:
+        probabilities = await self.probabilities(organization_id)
+        owners: dict[int, list[Decimal]] = defaultdict(lambda: [Decimal(0), Decimal(0), Decimal(0)])
+        months: dict[date, list[Decimal]] = defaultdict(lambda: [Decimal(0), Decimal(0), Decimal(0)])
+        for row in await self.pipeline_repo.list_for_org(organization_id):
+            amount = Decimal(row.amount_total)
+            weighted = amount * probabilities[row.stage]
+            for bucket in (owners[row.owner_id], months[row.close_month]):
+                bucket[0] += row.deal_count
+                bucket[1] += amount
+                bucket[2] += weighted
+
+        def money(value: Decimal) -> float:
+            return float(round(value, 2))
+
+        return Forecast(
+            probabilities={stage.value: float(value) for stage, value in probabilities.items()},
+            open_deals=int(sum(count for count, _, _ in owners.values())),
+            pipeline=money(sum((amount for _, amount, _ in owners.values()), Decimal(0))),
+            weighted=money(sum((weighted for _, _, weighted in owners.values()), Decimal(0))),
+            by_owner=[
+                OwnerForecast(owner_id, int(count), money(amount), money(weighted))
+                for owner_id, (count, amount, weighted) in sorted(owners.items())
+            ],
+            by_month=[
+                MonthForecast(
+                    None if month == UNSCHEDULED_MONTH else month, int(count), money(amount), money(weighted)
+                )
+                # сделки без даты закрытия — в конце списка
+                for month, (count, amount, weighted) in sorted(
+                    months.items(), key=lambda item: (item[0] == UNSCHEDULED_MONTH, item[0])
+                )
+            ],
+        )
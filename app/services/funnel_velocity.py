@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.quantiles import LogHistogram
+from app.models.activity import ActivityType
+from app.models.deal import DealStatus
+from app.repositories.activity import ActivityRepository
+from app.repositories.deal import DealRepository
+from app.repositories.funnel_checkpoint import FunnelCheckpointRepository
+from app.services.deals import DealService
+
+STAGE_ORDER = DealService.stage_order
+# относительная ошибка медианы и p90 не больше 2,5%
+HISTOGRAM_GROWTH = 1.05
+
+
+@dataclass
+class StageVelocity:
+    stage: str
+    entered: int
+    advanced: int
+    conversion_rate: float
+    won: int
+    lost: int
+    median_seconds: float | None
+    p90_seconds: float | None
+    completed_stays: int
+
+
+@dataclass
+class FunnelVelocity:
+    stages: list[StageVelocity]
+    transitions: dict[str, dict[str, int]]
+    processed_through_activity_id: int
+
+
+class _State:
+    """Накопленные счётчики организации; сериализуется в JSON чекпоинта."""
+
+    def __init__(self, data: dict[str, Any] | None = None) -> None:
+        data = data or {}
+        self.entered: Counter[str] = Counter(data.get("entered", {}))
+        self.won: Counter[str] = Counter(data.get("won", {}))
+        self.lost: Counter[str] = Counter(data.get("lost", {}))
+        self.transitions: dict[str, Counter[str]] = {
+            source: Counter(targets) for source, targets in data.get("transitions", {}).items()
+        }
+        self.durations: dict[str, LogHistogram] = {
+            stage: LogHistogram.from_dict(counts, HISTOGRAM_GROWTH)
+            for stage, counts in data.get("durations", {}).items()
+        }
+
+    def record_stay(self, stage: str, started_at: datetime, ended_at: datetime) -> None:
+        seconds = max((ended_at - started_at).total_seconds(), 0.0)
+        self.durations.setdefault(stage, LogHistogram(HISTOGRAM_GROWTH)).add(seconds)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "entered": dict(self.entered),
+            "won": dict(self.won),
+            "lost": dict(self.lost),
+            "transitions": {source: dict(targets) for source, targets in self.transitions.items()},
+            "durations": {stage: histogram.to_dict() for stage, histogram in self.durations.items()},
+        }
+
+
+class FunnelVelocityService:
+    """Конверсия между стадиями и время в стадии по журналу активностей.
+
+    Активности читаются потоковым курсором, упорядоченным по сделке, поэтому в памяти
+    живёт состояние только одной сделки и гистограммы фиксированного размера. После
+    прохода счётчики и позиция сохраняются в чекпоинт организации, и следующий пересчёт
+    читает только новые активности. Самые свежие ``settle_seconds`` секунд журнала
+    откладываются: id транзакций, закоммиченных позже, могут оказаться меньше уже
+    обработанных.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        activity_repo: ActivityRepository | None = None,
+        deal_repo: DealRepository | None = None,
+        checkpoint_repo: FunnelCheckpointRepository | None = None,
+        *,
+        settle_seconds: int | None = None,
+    ) -> None:
+        self.session = session
+        self.activity_repo = activity_repo or ActivityRepository(session)
+        self.deal_repo = deal_repo or DealRepository(session)
+        self.checkpoint_repo = checkpoint_repo or FunnelCheckpointRepository(session)
+        self.settle_seconds = (
+            settings.funnel_velocity_settle_seconds if settle_seconds is None else settle_seconds
+        )
+
+    async def refresh(self, organization_id: int) -> tuple[_State, int]:
+        checkpoint = await self.checkpoint_repo.get_for_org(organization_id)
+        after_id = checkpoint.last_activity_id if checkpoint else 0
+        last_deal_id = checkpoint.last_deal_id if checkpoint else 0
+        state = _State(checkpoint.state if checkpoint else None)
+
+        settled_before = (datetime.now(timezone.utc) - timedelta(seconds=self.settle_seconds)).replace(
+            tzinfo=None
+        )
+        until_id = await self.activity_repo.last_settled_id(organization_id, created_before=settled_before)
+        created, new_last_deal_id = await self.deal_repo.count_created_after(
+            organization_id, after_id=last_deal_id, created_before=settled_before
+        )
+        if until_id <= after_id and created == 0:
+            return state, after_id
+
+        # новые сделки создаются в первой стадии воронки
+        state.entered[STAGE_ORDER[0].value] += created
+        deal_id: int | None = None
+        stage = ""
+        entered_at = datetime.min
+        async for row in self.activity_repo.stream_stage_history(
+            organization_id, after_id=after_id, until_id=until_id
+        ):
+            if row.deal_id != deal_id:
+                deal_id = row.deal_id
+                if row.prior_payload is not None:
+                    stage, entered_at = row.prior_payload["new_stage"], row.prior_created_at
+                else:
+                    stage, entered_at = STAGE_ORDER[0].value, row.deal_created_at
+            payload = row.payload or {}
+            if row.type == ActivityType.stage_changed:
+                new_stage = payload["new_stage"]
+                state.record_stay(stage, entered_at, row.created_at)
+                state.transitions.setdefault(stage, Counter())[new_stage] += 1
+                state.entered[new_stage] += 1
+                stage, entered_at = new_stage, row.created_at
+            elif payload.get("new_status") == DealStatus.won.value:
+                state.won[stage] += 1
+            elif payload.get("new_status") == DealStatus.lost.value:
+                state.lost[stage] += 1
+
+        until_id = max(until_id, after_id)
+        advanced = await self.checkpoint_repo.advance(
+            organization_id,
+            expected_activity_id=after_id,
+            last_activity_id=until_id,
+            last_deal_id=new_last_deal_id,
+            state=state.to_dict(),
+        )
+        await self.session.commit()
+        if not advanced:
+            # чекпоинт сдвинул параллельный пересчёт: берём его результат, наш не записан
+            checkpoint = await self.checkpoint_repo.get_for_org(organization_id)
+            if checkpoint is not None:
+                await self.session.refresh(checkpoint)
+                return _State(checkpoint.state), checkpoint.last_activity_id
+        return state, until_id
+
+    async def velocity(self, organization_id: int) -> FunnelVelocity:
+        state, processed_through = await self.refresh(organization_id)
+        stages = []
+        for index, stage in enumerate(STAGE_ORDER):
+            later = {later_stage.value for later_stage in STAGE_ORDER[index + 1 :]}
+            outgoing = state.transitions.get(stage.value, Counter())
+            advanced = sum(count for target, count in outgoing.items() if target in later)
+            entered = state.entered[stage.value]
+            durations = state.durations.get(stage.value, LogHistogram(HISTOGRAM_GROWTH))
+            stages.append(
+                StageVelocity(
+                    stage=stage.value,
+                    entered=entered,
+                    advanced=advanced,
+                    conversion_rate=round(advanced / entered, 4) if entered else 0.0,
+                    won=state.won[stage.value],
+                    lost=state.lost[stage.value],
+                    median_seconds=durations.quantile(0.5),
+                    p90_seconds=durations.quantile(0.9),
+                    completed_stays=len(durations),
+                )
+            )
+        return FunnelVelocity(
+            stages=stages,
+            transitions={source: dict(targets) for source, targets in state.transitions.items()},
+            processed_through_activity_id=processed_through,
+        )
@@ -10,16 +10,13 @@ from app.models.organization_member import OrganizationMember, OrganizationRole
 from app.repositories.organization import OrganizationRepository
 from app.repositories.organization_member import OrganizationMemberRepository
 from app.services import exceptions
+from app.services.principals import invalidate_principal
 
 
-@dataclass
+@dataclass(frozen=True)
 class OrganizationContext:
-    organization: Organization
-    membership: OrganizationMember
-
-    @property
-    def role(self) -> OrganizationRole:
-        return self.membership.role
+    organization_id: int
+    role: OrganizationRole
 
     def can_manage(self) -> bool:
         return self.role in {OrganizationRole.owner, OrganizationRole.admin, OrganizationRole.manager}
@@ -40,11 +37,8 @@ class OrganizationService:
         self.member_repo = member_repo or OrganizationMemberRepository(session)
 
     async def get_user_organizations(self, user_id: int) -> Sequence[Organization]:
-        memberships = await self.member_repo.list(filters=[OrganizationMember.user_id == user_id])
-        organization_ids = [m.organization_id for m in memberships]
-        if not organization_ids:
-            return []
-        return await self.org_repo.list(filters=[Organization.id.in_(organization_ids)])
+        rows = await self.member_repo.list_organizations_for_user(user_id)
+        return [organization for organization, _ in rows]
 
     async def ensure_membership(self, *, organization_id: int, user_id: int) -> OrganizationContext:
         organization = await self.org_repo.get(organization_id)
@@ -53,6 +47,44 @@ class OrganizationService:
         membership = await self.member_repo.get_for_user(organization_id=organization_id, user_id=user_id)
         if membership is None:
             raise exceptions.PermissionDeniedError("Нет доступа к организации")
-        return OrganizationContext(organization=organization, membership=membership)
+        return OrganizationContext(organization_id=organization.id, role=membership.role)
+
+    async def _get_managed_member(
+        self, *, organization_id: int, actor_role: OrganizationRole, user_id: int
+    ) -> OrganizationMember:
+        if actor_role not in (OrganizationRole.owner, OrganizationRole.admin):
+            raise exceptions.PermissionDeniedError("Управлять участниками могут только owner и admin")
+        membership = await self.member_repo.get_for_user(organization_id=organization_id, user_id=user_id)
+        if membership is None:
+            raise exceptions.NotFoundError("Участник не найден")
+        if membership.role == OrganizationRole.owner and actor_role != OrganizationRole.owner:
+            raise exceptions.PermissionDeniedError("Изменять владельца может только owner")
+        return membership
 
+    async def change_member_role(
+        self,
+        *,
+        organization_id: int,
+        actor_role: OrganizationRole,
+        user_id: int,
+        role: OrganizationRole,
+    ) -> OrganizationMember:
+        membership = await self._get_managed_member(
+            organization_id=organization_id, actor_role=actor_role, user_id=user_id
+        )
+        if role == OrganizationRole.owner and actor_role != OrganizationRole.owner:
+            raise exceptions.PermissionDeniedError("Назначить владельца может только owner")
+        membership.role = role
+        await self.session.commit()
+        invalidate_principal(user_id, organization_id)
+        return membership
 
+    async def remove_member(
+        self, *, organization_id: int, actor_role: OrganizationRole, user_id: int
+    ) -> None:
+        await self._get_managed_member(
+            organization_id=organization_id, actor_role=actor_role, user_id=user_id
+        )
+        await self.member_repo.remove_user(organization_id=organization_id, user_id=user_id)
+        await self.session.commit()
+        invalidate_principal(user_id, organization_id)
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.invalidation import invalidation_bus
+from app.models.organization_member import OrganizationRole
+from app.repositories.organization_member import OrganizationMemberRepository
+from app.repositories.user import UserRepository
+
+principal_cache = LRUCache(
+    max_entries=settings.principal_cache_size,
+    ttl_seconds=settings.principal_cache_ttl_seconds,
+    namespace="principals",
+)
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    id: int
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Снимок того, от чьего имени идёт запрос: только идентификаторы и роль.
+
+    Один экземпляр из кэша отдаётся конкурентным запросам, поэтому ORM-объекты сюда
+    не попадают. ``organization_id`` пуст, если организация не запрошена или не найдена,
+    ``role`` — если пользователь в ней не состоит.
+    """
+
+    user_id: int
+    organization_id: int | None = None
+    role: OrganizationRole | None = None
+
+
+PRINCIPALS_CHANNEL = "principals"
+
+
+def _drop_principal(key: list[int | None]) -> None:
+    user_id, organization_id = key
+    if organization_id is None:
+        principal_cache.delete_where(
+            lambda cached_key: isinstance(cached_key, tuple) and cached_key[0] == user_id
+        )
+    else:
+        principal_cache.delete((user_id, organization_id))
+
+
+invalidation_bus.subscribe(PRINCIPALS_CHANNEL, _drop_principal)
+
+
+def invalidate_principal(user_id: int, organization_id: int | None = None) -> None:
+    invalidation_bus.publish(PRINCIPALS_CHANNEL, [user_id, organization_id])
+
+
+class PrincipalResolver:
+    def __init__(
+        self,
+        session: AsyncSession,
+        user_repo: UserRepository | None = None,
+        member_repo: OrganizationMemberRepository | None = None,
+    ) -> None:
+        self.session = session
+        self.user_repo = user_repo or UserRepository(session)
+        self.member_repo = member_repo or OrganizationMemberRepository(session)
+
+    async def resolve(self, *, user_id: int, organization_id: int | None) -> Principal | None:
+        key = (user_id, organization_id)
+        cached: Principal | None = principal_cache.get(key)
+        if cached is not None:
+            return cached
+
+        if organization_id is None:
+            user = await self.user_repo.get(user_id)
+            if user is None:
+                return None
+            principal = Principal(user_id=user.id)
+        else:
+            row = await self.member_repo.get_principal(user_id=user_id, organization_id=organization_id)
+            if row is None:
+                return None
+            user, organization, membership = row
+            principal = Principal(
+                user_id=user.id,
+                organization_id=organization.id if organization is not None else None,
+                role=membership.role if membership is not None else None,
+            )
+            if principal.role is None:
+                # отказ в доступе не кэшируем: членство может появиться в любой момент
+                return principal
+
+        principal_cache.set(key, principal)
+        return principal
@@ -0,0 +1,286 @@
+"""Определения тяжёлых отчётов для фоновых задач.
+
+Каждый отчёт — запрос, который читается потоком, и чистая функция ``aggregate``:
+она сворачивает пачку строк в частичный итог ``{ключ: [счётчики]}`` и выполняется
+в пуле процессов, поэтому должна быть модульной функцией без доступа к БД.
+Частичные итоги складываются поэлементно, ``finalize`` превращает сумму в JSON.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Callable, Hashable, Sequence
+
+from sqlalchemy import Select, func, select
+
+from app.models.contact import Contact
+from app.models.deal import Deal, DealStatus
+from app.models.report_job import ReportKind
+from app.services import exceptions
+
+Partial = dict[Hashable, list[int]]
+
+MAX_COHORT_MONTHS = 60
+
+
+@dataclass(frozen=True)
+class ReportDefinition:
+    normalize: Callable[[dict[str, Any]], dict[str, Any]]
+    query: Callable[[int, dict[str, Any]], Select[Any]]
+    aggregate: Callable[[Sequence[tuple[Any, ...]], dict[str, Any]], Partial]
+    finalize: Callable[[Partial, dict[str, Any]], dict[str, Any]]
+
+
+def merge_partials(target: Partial, other: Partial) -> Partial:
+    for key, values in other.items():
+        current = target.get(key)
+        if current is None:
+            target[key] = list(values)
+        else:
+            for index, value in enumerate(values):
+                current[index] += value
+    return target
+
+
+def _cents(amount: Any) -> int:
+    return int(round(amount * 100))
+
+
+def _month_index(moment: datetime | date) -> int:
+    return moment.year * 12 + moment.month - 1
+
+
+def _month_label(index: int) -> str:
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def _ratio(part: int, whole: int) -> float:
+    return round(part / whole, 4) if whole else 0.0
+
+
+def _parse_date(params: dict[str, Any], name: str) -> date | None:
+    value = params.get(name)
+    if value is None:
+        return None
+    try:
+        return value if isinstance(value, date) else date.fromisoformat(str(value))
+    except ValueError as exc:
+        raise exceptions.ServiceError(f"Параметр {name} должен быть датой в формате YYYY-MM-DD") from exc
+
+
+def _parse_int(params: dict[str, Any], name: str, default: int, low: int, high: int) -> int:
+    value = params.get(name, default)
+    if isinstance(value, bool) or not isinstance(value, int) or not low <= value <= high:
+        raise exceptions.ServiceError(f"Параметр {name} должен быть целым числом от {low} до {high}")
+    return value
+
+
+def _reject_unknown(params: dict[str, Any], allowed: set[str]) -> None:
+    unknown = sorted(set(params) - allowed)
+    if unknown:
+        raise exceptions.ServiceError(f"Неизвестные параметры отчёта: {', '.join(unknown)}")
+
+
+# --- когорты: контакты по месяцу создания → сделки won ---
+
+
+def _cohort_normalize(params: dict[str, Any]) -> dict[str, Any]:
+    _reject_unknown(params, {"months"})
+    return {"months": _parse_int(params, "months", 12, 1, MAX_COHORT_MONTHS)}
+
+
+def _cohort_start(months: int) -> datetime:
+    index = _month_index(datetime.now(timezone.utc)) - months + 1
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def _cohort_query(organization_id: int, params: dict[str, Any]) -> Select[Any]:
+    # моментом выигрыша считается updated_at сделки: статус won финальный
+    wins = (
+        select(
+            Deal.contact_id,
+            func.min(Deal.updated_at).label("first_won_at"),
+            func.sum(Deal.amount).label("won_amount"),
+        )
+        .where(Deal.organization_id == organization_id, Deal.status == DealStatus.won)
+        .group_by(Deal.contact_id)
+        .subquery()
+    )
+    return (
+        select(Contact.created_at, wins.c.first_won_at, wins.c.won_amount)
+        .outerjoin(wins, wins.c.contact_id == Contact.id)
+        .where(
+            Contact.organization_id == organization_id,
+            Contact.created_at >= _cohort_start(params["months"]),
+        )
+    )
+
+
+def cohort_aggregate(rows: Sequence[tuple[Any, ...]], params: dict[str, Any]) -> Partial:
+    # [контакты, сконвертированы, сумма won в центах, конверсии по смещению 0..months-1]
+    width = 3 + params["months"]
+    partial: Partial = {}
+    for created_at, first_won_at, won_amount in rows:
+        cohort = _month_index(created_at)
+        counters = partial.setdefault(cohort, [0] * width)
+        counters[0] += 1
+        if first_won_at is None:
+            continue
+        counters[1] += 1
+        counters[2] += _cents(won_amount)
+        offset = min(max(_month_index(first_won_at) - cohort, 0), params["months"] - 1)
+        counters[3 + offset] += 1
+    return partial
+
+
+def _cohort_finalize(partial: Partial, params: dict[str, Any]) -> dict[str, Any]:
+    cohorts = []
+    # ключи когорт — номера месяцев, см. cohort_aggregate
+    for cohort in sorted(key for key in partial if isinstance(key, int)):
+        contacts, converted, won_cents, *by_offset = partial[cohort]
+        cumulative, running = [], 0
+        for count in by_offset:
+            running += count
+            cumulative.append(running)
+        cohorts.append(
+            {
+                "cohort": _month_label(cohort),
+                "contacts": contacts,
+                "converted": converted,
+                "conversion_rate": _ratio(converted, contacts),
+                "won_amount": won_cents / 100,
+                # накопительно: сколько контактов когорты выиграли сделку к N-му месяцу жизни
+                "converted_by_month": cumulative,
+            }
+        )
+    return {"months": params["months"], "cohorts": cohorts}
+
+
+# --- рейтинг владельцев сделок ---
+
+
+def _leaderboard_normalize(params: dict[str, Any]) -> dict[str, Any]:
+    _reject_unknown(params, {"date_from", "date_to"})
+    date_from, date_to = _parse_date(params, "date_from"), _parse_date(params, "date_to")
+    if date_from and date_to and date_from > date_to:
+        raise exceptions.ServiceError("date_from должен быть не позже date_to")
+    return {
+        "date_from": date_from.isoformat() if date_from else None,
+        "date_to": date_to.isoformat() if date_to else None,
+    }
+
+
+def _leaderboard_query(organization_id: int, params: dict[str, Any]) -> Select[Any]:
+    stmt = select(Deal.owner_id, Deal.status, Deal.amount, Deal.created_at, Deal.updated_at).where(
+        Deal.organization_id == organization_id
+    )
+    if params["date_from"]:
+        stmt = stmt.where(Deal.created_at >= datetime.combine(date.fromisoformat(params["date_from"]), time()))
+    if params["date_to"]:
+        end = date.fromisoformat(params["date_to"]) + timedelta(days=1)
+        stmt = stmt.where(Deal.created_at < datetime.combine(end, time()))
+    return stmt
+
+
+def leaderboard_aggregate(rows: Sequence[tuple[Any, ...]], params: dict[str, Any]) -> Partial:
+    # [сделки, won, lost, сумма won в центах, сумма длительности закрытых сделок в секундах]
+    partial: Partial = {}
+    for owner_id, status, amount, created_at, updated_at in rows:
+        counters = partial.setdefault(owner_id, [0, 0, 0, 0, 0])
+        counters[0] += 1
+        if status == DealStatus.won:
+            counters[1] += 1
+            counters[3] += _cents(amount)
+        elif status == DealStatus.lost:
+            counters[2] += 1
+        if status in (DealStatus.won, DealStatus.lost):
+            counters[4] += int((updated_at - created_at).total_seconds())
+    return partial
+
+
+def _leaderboard_finalize(partial: Partial, params: dict[str, Any]) -> dict[str, Any]:
+    ordered = sorted(partial.items(), key=lambda item: (-item[1][3], -item[1][1], item[0]))
+    owners = []
+    for rank, (owner_id, (deals, won, lost, won_cents, cycle_seconds)) in enumerate(ordered, start=1):
+        closed = won + lost
+        owners.append(
+            {
+                "rank": rank,
+                "owner_id": owner_id,
+                "deals": deals,
+                "won": won,
+                "lost": lost,
+                "win_rate": _ratio(won, closed),
+                "won_amount": won_cents / 100,
+                "average_won_amount": round(won_cents / won / 100, 2) if won else 0.0,
+                "average_cycle_days": round(cycle_seconds / closed / 86400, 2) if closed else None,
+            }
+        )
+    return {**params, "owners": owners}
+
+
+# --- год к году по месяцам ---
+
+
+def _yoy_normalize(params: dict[str, Any]) -> dict[str, Any]:
+    _reject_unknown(params, {"year"})
+    return {"year": _parse_int(params, "year", datetime.now(timezone.utc).year, 2000, 2100)}
+
+
+def _yoy_query(organization_id: int, params: dict[str, Any]) -> Select[Any]:
+    year = params["year"]
+    return select(Deal.created_at, Deal.status, Deal.amount).where(
+        Deal.organization_id == organization_id,
+        Deal.created_at >= datetime(year - 1, 1, 1),
+        Deal.created_at < datetime(year + 1, 1, 1),
+    )
+
+
+def yoy_aggregate(rows: Sequence[tuple[Any, ...]], params: dict[str, Any]) -> Partial:
+    # [создано, won, сумма won в центах] по (год, месяц) создания сделки
+    partial: Partial = {}
+    for created_at, status, amount in rows:
+        counters = partial.setdefault((created_at.year, created_at.month), [0, 0, 0])
+        counters[0] += 1
+        if status == DealStatus.won:
+            counters[1] += 1
+            counters[2] += _cents(amount)
+    return partial
+
+
+def _yoy_finalize(partial: Partial, params: dict[str, Any]) -> dict[str, Any]:
+    year = params["year"]
+
+    def change(current: int, previous: int) -> float | None:
+        return round((current - previous) / previous, 4) if previous else None
+
+    months = []
+    for month in range(1, 13):
+        current = partial.get((year, month), [0, 0, 0])
+        previous = partial.get((year - 1, month), [0, 0, 0])
+        months.append(
+            {
+                "month": month,
+                "created": current[0],
+                "created_previous": previous[0],
+                "created_change": change(current[0], previous[0]),
+                "won": current[1],
+                "won_previous": previous[1],
+                "won_amount": current[2] / 100,
+                "won_amount_previous": previous[2] / 100,
+                "won_amount_change": change(current[2], previous[2]),
+            }
+        )
+    return {"year": year, "months": months}
+
+
+REPORTS: dict[ReportKind, ReportDefinition] = {
+    ReportKind.cohort_conversion: ReportDefinition(
+        _cohort_normalize, _cohort_query, cohort_aggregate, _cohort_finalize
+    ),
+    ReportKind.owner_leaderboard: ReportDefinition(
+        _leaderboard_normalize, _leaderboard_query, leaderboard_aggregate, _leaderboard_finalize
+    ),
+    ReportKind.year_over_year: ReportDefinition(_yoy_normalize, _yoy_query, yoy_aggregate, _yoy_finalize),
+}
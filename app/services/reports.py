@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Literal
+
+import orjson
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from app.core.config import settings
+from app.models.report_job import ReportJob, ReportKind, ReportStatus
+from app.repositories.report_job import ACTIVE_STATUSES, ReportJobRepository
+from app.services import exceptions
+from app.services.report_builders import REPORTS, Partial, merge_partials
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class ReportRunner:
+    """Выполняет задачи отчётов в фоне процесса приложения.
+
+    Строки читаются из БД потоком пачками по ``batch_size``; каждая пачка сворачивается
+    функцией ``aggregate`` отчёта в пуле процессов, пока следующая пачка ещё читается.
+    Одновременно в пуле не больше ``2 × max_workers`` пачек, поэтому память ограничена
+    независимо от размера организации, а event loop не занят подсчётом.
+    """
+
+    def __init__(
+        self,
+        *,
+        executor: Literal["thread", "process"] = "process",
+        max_workers: int = 2,
+        batch_size: int = 5_000,
+        timeout_seconds: float = 600,
+        result_ttl_seconds: float = 24 * 3600,
+    ) -> None:
+        self._executor_kind = executor
+        self._max_workers = max_workers
+        self.batch_size = batch_size
+        self.timeout_seconds = timeout_seconds
+        self.result_ttl_seconds = result_ttl_seconds
+        self._executor: Executor | None = None
+        self._tasks: dict[int, asyncio.Task[None]] = {}
+
+    @classmethod
+    def from_settings(cls) -> ReportRunner:
+        return cls(
+            executor=settings.report_executor,
+            max_workers=settings.report_workers,
+            batch_size=settings.report_batch_size,
+            timeout_seconds=settings.report_timeout_seconds,
+            result_ttl_seconds=settings.report_result_ttl_seconds,
+        )
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self._executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="reports")
+        return self._executor
+
+    def schedule(self, job_id: int, bind: AsyncEngine | AsyncConnection) -> None:
+        task = asyncio.create_task(self._run(job_id, bind))
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job_id, None))
+
+    async def join(self) -> None:
+        """Дожидается всех запущенных задач: для тестов и мягкой остановки."""
+        while self._tasks:
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    async def _build(self, session: AsyncSession, job: ReportJob) -> dict[str, Any]:
+        definition = REPORTS[job.kind]
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        total: Partial = {}
+        pending: set[asyncio.Future[Partial]] = set()
+
+        async def collect(return_when: str) -> None:
+            nonlocal pending
+            done, pending = await asyncio.wait(pending, return_when=return_when)
+            for future in done:
+                merge_partials(total, future.result())
+
+        stmt = definition.query(job.organization_id, job.params)
+        result = await session.stream(stmt.execution_options(yield_per=self.batch_size))
+        async for rows in result.partitions():
+            batch = [tuple(row) for row in rows]
+            pending.add(loop.run_in_executor(executor, definition.aggregate, batch, job.params))
+            if len(pending) >= 2 * self._max_workers:
+                await collect(asyncio.FIRST_COMPLETED)
+        if pending:
+            await collect(asyncio.ALL_COMPLETED)
+        return definition.finalize(total, job.params)
+
+    async def _run(self, job_id: int, bind: AsyncEngine | AsyncConnection) -> None:
+        async with AsyncSession(bind, expire_on_commit=False) as session:
+            repo = ReportJobRepository(session)
+            job = await repo.update(job_id, {"status": ReportStatus.running, "started_at": _utcnow()})
+            await session.commit()
+            if job is None:
+                return
+            try:
+                report = await asyncio.wait_for(self._build(session, job), self.timeout_seconds)
+            except Exception as exc:  # noqa: BLE001 - ошибка сохраняется в задаче и видна клиенту
+                await session.rollback()
+                if isinstance(exc, asyncio.TimeoutError):
+                    error = "Превышено время построения отчёта"
+                elif isinstance(exc, exceptions.ServiceError):
+                    error = exc.message
+                else:
+                    error = "Не удалось построить отчёт"
+                now = _utcnow()
+                await repo.finish(
+                    job_id,
+                    status=ReportStatus.failed,
+                    error=error,
+                    now=now,
+                    expires_at=now + timedelta(seconds=self.result_ttl_seconds),
+                )
+            else:
+                now = _utcnow()
+                await repo.finish(
+                    job_id,
+                    status=ReportStatus.done,
+                    result=report,
+                    now=now,
+                    expires_at=now + timedelta(seconds=self.result_ttl_seconds),
+                )
+            await session.commit()
+
+    def shutdown(self) -> None:
+        for task in self._tasks.values():
+            task.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+report_runner = ReportRunner.from_settings()
+
+
+class ReportJobService:
+    def __init__(
+        self,
+        session: AsyncSession,
+        job_repo: ReportJobRepository | None = None,
+        runner: ReportRunner | None = None,
+    ) -> None:
+        self.session = session
+        self.repo = job_repo or ReportJobRepository(session)
+        self.runner = runner or report_runner
+
+    @staticmethod
+    def _params_hash(kind: ReportKind, params: dict[str, Any]) -> str:
+        return hashlib.sha256(orjson.dumps([kind.value, params], option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+    async def submit(
+        self, *, organization_id: int, user_id: int, kind: ReportKind, params: dict[str, Any]
+    ) -> tuple[ReportJob, bool]:
+        """Ставит отчёт в очередь; возвращает задачу и признак того, что она создана сейчас.
+
+        Если такой же отчёт уже выполняется или готов и не истёк, возвращается он.
+        """
+        params = REPORTS[kind].normalize(params)
+        params_hash = self._params_hash(kind, params)
+        now = _utcnow()
+        existing = await self.repo.find_reusable(organization_id, kind, params_hash, now=now)
+        if existing is not None and existing.status in ACTIVE_STATUSES:
+            started = existing.started_at or existing.created_at
+            if started > now - timedelta(seconds=self.runner.timeout_seconds * 2):
+                return existing, False
+            # процесс, выполнявший задачу, завершился: освобождаем ключ дедупликации
+            await self.repo.finish(
+                existing.id,
+                status=ReportStatus.failed,
+                error="Задача прервана",
+                now=now,
+                expires_at=now + timedelta(seconds=self.runner.result_ttl_seconds),
+            )
+        elif existing is not None:
+            return existing, False
+
+        try:
+            job = await self.repo.create(
+                {
+                    "organization_id": organization_id,
+                    "requested_by_id": user_id,
+                    "kind": kind,
+                    "params": params,
+                    "params_hash": params_hash,
+                    "status": ReportStatus.pending,
+                }
+            )
+            await self.session.commit()
+        except IntegrityError:
+            # параллельный запрос успел поставить тот же отчёт
+            await self.session.rollback()
+            existing = await self.repo.find_reusable(organization_id, kind, params_hash, now=now)
+            if existing is None:
+                raise
+            return existing, False
+        self.runner.schedule(job.id, self.session.bind)
+        return job, True
+
+    async def get(self, *, organization_id: int, job_id: int) -> ReportJob:
+        job = await self.repo.get_for_org(job_id, organization_id)
+        if job is None or (job.expires_at is not None and job.expires_at <= _utcnow()):
+            raise exceptions.NotFoundError("Отчёт не найден или срок его хранения истёк")
+        return job
+
+    async def result(self, *, organization_id: int, job_id: int) -> ReportJob:
+        """Возвращает готовую задачу вместе с результатом; 409, пока отчёт не построен."""
+        job = await self.get(organization_id=organization_id, job_id=job_id)
+        if job.status == ReportStatus.failed:
+            raise exceptions.ConflictError(f"Отчёт завершился ошибкой: {job.error}")
+        if job.status != ReportStatus.done or job.result is None:
+            raise exceptions.ConflictError("Отчёт ещё не готов")
+        return job
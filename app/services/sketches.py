@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.quantiles import LogHistogram
+from app.core.sketches import HyperLogLog
+from app.models.analytics_sketch import SketchKind
+from app.repositories.analytics_sketch import (
+    AMOUNT_GROWTH,
+    HLL_PRECISION,
+    AnalyticsSketchRepository,
+    month_start,
+)
+from app.services import exceptions
+
+DEFAULT_SKETCH_MONTHS = 12
+MAX_SKETCH_MONTHS = 120
+
+
+@dataclass
+class MonthlyActiveContacts:
+    month: date
+    estimate: int
+
+
+@dataclass
+class ActiveContacts:
+    month_from: date
+    month_to: date
+    # уникальные контакты за весь период, а не сумма месяцев: месячные скетчи объединяются
+    total: int
+    months: list[MonthlyActiveContacts]
+    relative_error: float
+
+
+@dataclass
+class AmountQuantiles:
+    month_from: date
+    month_to: date
+    deals: int
+    quantiles: dict[str, float | None]
+    relative_error: float
+
+
+def _shift_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+class SketchAnalyticsService:
+    """Приближённая аналитика для крупных организаций по месячным скетчам.
+
+    Записи сделок и активностей только добавляют наблюдения, а ``mini-crm fold-sketches``
+    периодически сворачивает их в месячные скетчи. Запрос читает не больше
+    ``MAX_SKETCH_MONTHS`` скетчей и досчитывает ещё не свёрнутые наблюдения.
+    ``relative_error`` в ответе — стандартная ошибка оценки для HyperLogLog и
+    гарантированная граница для квантилей.
+    """
+
+    def __init__(self, session: AsyncSession, sketch_repo: AnalyticsSketchRepository | None = None) -> None:
+        self.session = session
+        self.sketch_repo = sketch_repo or AnalyticsSketchRepository(session)
+
+    @staticmethod
+    def _month_range(month_from: date | None, month_to: date | None) -> tuple[date, date]:
+        month_to = month_start(month_to or datetime.now(timezone.utc))
+        month_from = month_start(month_from) if month_from else _shift_months(month_to, 1 - DEFAULT_SKETCH_MONTHS)
+        if month_from > month_to:
+            raise exceptions.ServiceError("month_from должен быть не позже month_to")
+        if _shift_months(month_from, MAX_SKETCH_MONTHS) <= month_to:
+            raise exceptions.ServiceError(f"Период не может превышать {MAX_SKETCH_MONTHS} месяцев")
+        return month_from, month_to
+
+    async def active_contacts(
+        self, organization_id: int, *, month_from: date | None = None, month_to: date | None = None
+    ) -> ActiveContacts:
+        month_from, month_to = self._month_range(month_from, month_to)
+        total = HyperLogLog(HLL_PRECISION)
+        months: list[MonthlyActiveContacts] = []
+        for month, sketch in await self.sketch_repo.monthly(
+            organization_id, SketchKind.active_contacts, month_from, month_to
+        ):
+            months.append(MonthlyActiveContacts(month=month, estimate=sketch.count()))
+            total.merge(sketch)
+        return ActiveContacts(
+            month_from=month_from,
+            month_to=month_to,
+            total=total.count(),
+            months=months,
+            relative_error=round(total.relative_error, 4),
+        )
+
+    async def amount_quantiles(
+        self,
+        organization_id: int,
+        *,
+        quantiles: list[float],
+        month_from: date | None = None,
+        month_to: date | None = None,
+    ) -> AmountQuantiles:
+        if any(not 0 <= q <= 1 for q in quantiles):
+            raise exceptions.ServiceError("Квантиль должен быть в диапазоне от 0 до 1")
+        month_from, month_to = self._month_range(month_from, month_to)
+        merged = LogHistogram(AMOUNT_GROWTH)
+        for _, sketch in await self.sketch_repo.monthly(
+            organization_id, SketchKind.deal_amounts, month_from, month_to
+        ):
+            merged.merge(sketch)
+        return AmountQuantiles(
+            month_from=month_from,
+            month_to=month_to,
+            deals=len(merged),
+            quantiles={
+                f"p{q * 100:g}": None if (value := merged.quantile(q)) is None else round(value, 2)
+                for q in sorted(set(quantiles))
+            },
+            relative_error=round(merged.relative_error, 4),
+        )
@@ -4,10 +4,14 @@ from datetime import date
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.models.deal import Deal
 from app.models.organization_member import OrganizationRole
+from app.models.organization_revision import RevisionEntity
 from app.models.task import Task
+from app.repositories.base import Page
 from app.repositories.deal import DealRepository
+from app.repositories.organization_revision import OrganizationRevisionRepository
 from app.repositories.task import TaskRepository
 from app.services import exceptions
 
@@ -18,10 +22,12 @@ class TaskService:
         session: AsyncSession,
         task_repo: TaskRepository | None = None,
         deal_repo: DealRepository | None = None,
+        revision_repo: OrganizationRevisionRepository | None = None,
     ) -> None:
         self.session = session
         self.repo = task_repo or TaskRepository(session)
         self.deal_repo = deal_repo or DealRepository(session)
+        self.revision_repo = revision_repo or OrganizationRevisionRepository(session)
 
     async def _ensure_deal(self, deal_id: int, organization_id: int) -> Deal:
         deal = await self.deal_repo.get(deal_id)
@@ -58,10 +64,39 @@ class TaskService:
                 "due_date": due_date,
             }
         )
+        await self.revision_repo.bump(organization_id, RevisionEntity.tasks)
         await self.session.commit()
         return task
 
-    async def list_tasks(self, *, organization_id: int, **filters) -> list[Task]:
-        return await self.repo.list_filtered(organization_id=organization_id, **filters)
+    async def list_tasks(
+        self,
+        *,
+        organization_id: int,
+        deal_id: int | None = None,
+        owner_id: int | None = None,
+        only_open: bool = False,
+        due_before: date | None = None,
+        due_after: date | None = None,
+        order_by: str = "due_date",
+        order: str = "asc",
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> Page[Task]:
+        limit = min(limit or settings.list_default_limit, settings.list_max_limit)
+        try:
+            return await self.repo.list_filtered(
+                organization_id=organization_id,
+                deal_id=deal_id,
+                owner_id=owner_id,
+                only_open=only_open,
+                due_before=due_before,
+                due_after=due_after,
+                order_by=order_by,
+                order=order,
+                limit=limit,
+                cursor=cursor,
+            )
+        except ValueError as exc:
+            raise exceptions.ServiceError(str(exc)) from exc
 
 
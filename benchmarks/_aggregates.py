@@ -0,0 +1,80 @@
+"""Сводка по сделкам за один проход: набор условных агрегатов в одном SELECT."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import ColumnElement, Select, case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.deal import Deal, DealStatus
+
+
+class AggregateQuery:
+    """Собирает набор метрик в один SELECT с условными агрегатами.
+
+    Каждая метрика — агрегат над ``CASE WHEN условие THEN значение END``, поэтому
+    все они считаются за один проход по строкам и одинаково работают в PostgreSQL
+    и SQLite (в отличие от ``FILTER``, которого нет в старых SQLite).
+    """
+
+    def __init__(self) -> None:
+        self._columns: list[ColumnElement[Any]] = []
+
+    @staticmethod
+    def _when(value: ColumnElement[Any] | int, where: ColumnElement[bool] | None) -> Any:
+        return value if where is None else case((where, value))
+
+    def count(self, label: str, where: ColumnElement[bool] | None = None) -> AggregateQuery:
+        self._columns.append(func.count(self._when(1, where)).label(label))
+        return self
+
+    def sum(
+        self, label: str, column: ColumnElement[Any], where: ColumnElement[bool] | None = None
+    ) -> AggregateQuery:
+        self._columns.append(func.sum(self._when(column, where)).label(label))
+        return self
+
+    def avg(
+        self, label: str, column: ColumnElement[Any], where: ColumnElement[bool] | None = None
+    ) -> AggregateQuery:
+        self._columns.append(func.avg(self._when(column, where)).label(label))
+        return self
+
+    def select(self, *conditions: ColumnElement[bool]) -> Select[Any]:
+        return select(*self._columns).where(*conditions)
+
+
+@dataclass
+class DealSummaryMetrics:
+    count_by_status: dict[DealStatus, int]
+    amount_by_status: dict[DealStatus, Decimal]
+    average_won_amount: Decimal
+    new_deals: int
+
+
+async def summary_metrics(
+    session: AsyncSession, organization_id: int, *, last_days: int
+) -> DealSummaryMetrics:
+    cutoff = datetime.now(timezone.utc) - timedelta(days=last_days)
+    query = AggregateQuery()
+    for status in DealStatus:
+        query.count(f"count_{status.value}", Deal.status == status)
+        query.sum(f"amount_{status.value}", Deal.amount, Deal.status == status)
+    query.avg("avg_won", Deal.amount, Deal.status == DealStatus.won)
+    query.count("new_deals", Deal.created_at >= cutoff)
+
+    result = await session.execute(query.select(Deal.organization_id == organization_id))
+    row = result.one()._mapping
+    counts = {status: int(row[f"count_{status.value}"]) for status in DealStatus}
+    return DealSummaryMetrics(
+        count_by_status={status: count for status, count in counts.items() if count},
+        amount_by_status={
+            status: Decimal(row[f"amount_{status.value}"] or 0) for status in DealStatus if counts[status]
+        },
+        average_won_amount=Decimal(row["avg_won"] or 0),
+        new_deals=int(row["new_deals"]),
+    )
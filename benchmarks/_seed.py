@@ -0,0 +1,97 @@
+"""Общие данные для бенчмарков: одна организация с владельцем, контактами и сделками."""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+
+from app.db.base import Base
+from app.models.contact import Contact
+from app.models.deal import Deal, DealStage, DealStatus
+from app.models.organization import Organization
+from app.models.organization_member import OrganizationMember, OrganizationRole
+from app.models.user import User
+from app.repositories.analytics_sketch import AnalyticsSketchRepository
+from app.repositories.deal_hourly_stat import DealHourlyStatRepository
+from app.repositories.deal_stat import DealStatRepository
+from app.repositories.pipeline_total import PipelineTotalRepository
+
+BATCH = 10_000
+
+
+@dataclass
+class Seeded:
+    engine: AsyncEngine
+    user_id: int
+    organization_id: int
+
+
+async def seed(
+    deals: int,
+    *,
+    contacts: int = 1_000,
+    organizations: int = 1,
+    url: str = "sqlite+aiosqlite:///:memory:",
+) -> Seeded:
+    engine = create_async_engine(url, echo=False)
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(User), [{"id": 1, "email": "bench@example.com", "hashed_password": "x", "name": "Bench"}])
+        await conn.execute(
+            insert(Organization), [{"id": org_id, "name": f"Bench {org_id}"} for org_id in range(1, organizations + 1)]
+        )
+        await conn.execute(
+            insert(OrganizationMember),
+            [
+                {"organization_id": org_id, "user_id": 1, "role": OrganizationRole.owner}
+                for org_id in range(1, organizations + 1)
+            ],
+        )
+        await conn.execute(
+            insert(Contact),
+            [
+                {
+                    "id": contact_id,
+                    "organization_id": (contact_id - 1) % organizations + 1,
+                    "owner_id": 1,
+                    "name": f"Contact {contact_id}",
+                    "email": f"contact{contact_id}@example.com",
+                    "phone": f"+7900{contact_id:07d}",
+                    "created_at": now - timedelta(minutes=contact_id),
+                }
+                for contact_id in range(1, contacts + 1)
+            ],
+        )
+        statuses, stages = list(DealStatus), list(DealStage)
+        for start in range(0, deals, BATCH):
+            rows = []
+            for index in range(start, min(start + BATCH, deals)):
+                created_at = now - timedelta(minutes=rng.randrange(0, 60 * 24 * 365))
+                rows.append(
+                    {
+                        "organization_id": index % organizations + 1,
+                        "contact_id": index % contacts + 1,
+                        "owner_id": 1,
+                        "title": f"Deal {index}",
+                        "amount": rng.randrange(100, 100_000),
+                        "currency": "USD",
+                        "status": rng.choice(statuses),
+                        "stage": rng.choice(stages),
+                        "created_at": created_at,
+                        "updated_at": created_at,
+                    }
+                )
+            await conn.execute(insert(Deal), rows)
+    async with AsyncSession(engine) as session:
+        await DealStatRepository(session).rebuild()
+        await DealHourlyStatRepository(session).rebuild()
+        await PipelineTotalRepository(session).rebuild()
+        await AnalyticsSketchRepository(session).rebuild()
+        await session.commit()
+    return Seeded(engine=engine, user_id=1, organization_id=1)
@@ -0,0 +1,54 @@
+"""Латентность попадания в кэш для каждого бэкенда на значении размера сводки аналитики.
+
+Запуск: python -m benchmarks.bench_cache_backends
+"""
+
+from __future__ import annotations
+
+import tempfile
+import time
+from pathlib import Path
+
+from app.core.cache import CacheBackend, LRUCache
+from app.core.cache_backends import SharedFileCache
+from app.services.analytics import DealSummary
+
+ITERATIONS = 50_000
+KEYS = 1_000
+
+
+def _summary(index: int) -> DealSummary:
+    return DealSummary(
+        count_by_status={"new": index, "in_progress": 12, "won": 7, "lost": 3},
+        amount_by_status={"new": 1200.5, "in_progress": 9900.0, "won": 15400.0, "lost": 0.0},
+        average_won_amount=2200.0,
+        new_deals_last_n_days=index % 30,
+    )
+
+
+def _measure(cache: CacheBackend) -> float:
+    for index in range(KEYS):
+        cache.set(("deals_summary", index, 30), _summary(index))
+    started = time.perf_counter()
+    for step in range(ITERATIONS):
+        cache.get(("deals_summary", step % KEYS, 30))
+    return (time.perf_counter() - started) / ITERATIONS * 1_000_000
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        backends: list[CacheBackend] = [
+            LRUCache(max_entries=KEYS * 2, ttl_seconds=60, namespace="bench-memory"),
+            SharedFileCache(
+                Path(directory) / "cache.sqlite3",
+                max_entries=KEYS * 2,
+                ttl_seconds=60,
+                namespace="bench-shared",
+            ),
+        ]
+        for cache in backends:
+            print(f"{type(cache).__name__:16} {_measure(cache):8.2f} мкс/попадание")
+
+
+if __name__ == "__main__":
+    main()
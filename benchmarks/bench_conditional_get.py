@@ -0,0 +1,60 @@
+"""Стоимость опроса GET /deals с If-None-Match и без него.
+
+Запуск: python -m benchmarks.bench_conditional_get
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.security import create_access_token
+from app.db import session as db_session
+from app.main import app
+from benchmarks._seed import seed
+
+DEALS = 20_000
+ITERATIONS = 200
+URLS = ["/api/v1/deals?page_size=100", "/api/v1/analytics/deals/funnel"]
+
+
+async def main() -> None:
+    seeded = await seed(DEALS)
+    # подмена фабрики, а не dependency_overrides: иначе FastAPI заново разбирает зависимости на каждый запрос
+    db_session.async_session_factory = async_sessionmaker(seeded.engine, expire_on_commit=False)
+
+    statements = 0
+
+    def count(*_: object) -> None:
+        nonlocal statements
+        statements += 1
+
+    event.listen(seeded.engine.sync_engine, "before_cursor_execute", count)
+    headers = {
+        "Authorization": f"Bearer {create_access_token(str(seeded.user_id))}",
+        "X-Organization-Id": str(seeded.organization_id),
+    }
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        for url in URLS:
+            etag = (await client.get(url, headers=headers)).headers["ETag"]
+            for label, extra in (("200", {}), ("304", {"If-None-Match": etag})):
+                statements = 0
+                size = 0
+                started = time.perf_counter()
+                for _ in range(ITERATIONS):
+                    response = await client.get(url, headers={**headers, **extra})
+                    size += len(response.content)
+                elapsed = (time.perf_counter() - started) / ITERATIONS * 1000
+                print(
+                    f"{url:36} {label}: {elapsed:7.2f} мс/запрос, "
+                    f"{statements / ITERATIONS:.1f} SQL/запрос, {size // ITERATIONS} байт"
+                )
+    await seeded.engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
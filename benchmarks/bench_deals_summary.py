@@ -0,0 +1,73 @@
+"""Сводка по сделкам: три агрегата, один проход с условными агрегатами и чтение свёртки deal_stats.
+
+Запуск: python -m benchmarks.bench_deals_summary [число_сделок]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from typing import Awaitable, Callable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.deal import DealRepository
+from app.services.analytics import AnalyticsService
+from benchmarks._aggregates import summary_metrics
+from benchmarks._seed import seed
+
+DEALS = 1_000_000
+ITERATIONS = 5
+LAST_DAYS = 30
+
+
+async def _three_queries(repo: DealRepository, organization_id: int) -> object:
+    return (
+        await repo.count_by_status(organization_id),
+        await repo.amount_stats_by_status(organization_id),
+        await repo.count_newer_than(organization_id, LAST_DAYS),
+    )
+
+
+async def _single_scan(repo: DealRepository, organization_id: int) -> object:
+    return await summary_metrics(repo.session, organization_id, last_days=LAST_DAYS)
+
+
+async def _rollup(repo: DealRepository, organization_id: int) -> object:
+    # без memoize: нужен сам запрос к свёртке, а не попадание в кэш
+    return await AnalyticsService._deals_summary.__wrapped__(
+        AnalyticsService(repo.session, deal_repo=repo), organization_id, 0, last_days=LAST_DAYS
+    )
+
+
+async def main(deals: int) -> None:
+    seeded = await seed(deals)
+    statements = 0
+
+    def count(*_: object) -> None:
+        nonlocal statements
+        statements += 1
+
+    event.listen(seeded.engine.sync_engine, "before_cursor_execute", count)
+    variants: dict[str, Callable[[DealRepository, int], Awaitable[object]]] = {
+        "три запроса": _three_queries,
+        "один проход": _single_scan,
+        "свёртка": _rollup,
+    }
+    async with AsyncSession(seeded.engine) as session:
+        repo = DealRepository(session)
+        for label, variant in variants.items():
+            await variant(repo, seeded.organization_id)
+            statements = 0
+            started = time.perf_counter()
+            for _ in range(ITERATIONS):
+                await variant(repo, seeded.organization_id)
+            elapsed = (time.perf_counter() - started) / ITERATIONS * 1000
+            print(f"{label:12}: {elapsed:9.1f} мс/сводка, {statements / ITERATIONS:.0f} SQL, {deals} сделок")
+    await seeded.engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else DEALS))
@@ -0,0 +1,37 @@
+"""Стоимость проверки access-токена на запрос: без кэша и с кэшем проверенных JWT.
+
+Запуск: python -m benchmarks.bench_token_cache
+"""
+
+from __future__ import annotations
+
+import time
+
+from app.core.security import create_access_token, get_subject, verified_token_cache
+
+ITERATIONS = 20_000
+
+
+def _measure(token: str, *, use_cache: bool) -> float:
+    started = time.perf_counter()
+    for _ in range(ITERATIONS):
+        if not use_cache:
+            verified_token_cache.clear()
+        get_subject(token)
+    return (time.perf_counter() - started) / ITERATIONS * 1_000_000
+
+
+def main() -> None:
+    token = create_access_token("42")
+    cold = _measure(token, use_cache=False)
+    verified_token_cache.clear()
+    verified_token_cache.reset_stats()
+    warm = _measure(token, use_cache=True)
+    print(f"без кэша:  {cold:8.2f} мкс/запрос")
+    print(f"с кэшем:   {warm:8.2f} мкс/запрос  (x{cold / warm:.1f})")
+    stats = verified_token_cache.stats()
+    print(f"hits={stats.hits} misses={stats.misses}")
+
+
+if __name__ == "__main__":
+    main()
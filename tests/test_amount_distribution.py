@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.contact import Contact
+from app.models.deal import Deal, DealStatus
+from app.models.organization import Organization
+from app.models.organization_revision import RevisionEntity
+from app.models.user import User
+from app.repositories.organization_revision import OrganizationRevisionRepository
+from app.services.amount_distribution import AmountDistributionService, columns_cache
+
+pytest.importorskip("numpy")
+
+
+@pytest.mark.asyncio
+async def test_amount_distribution_in_cents_with_owner_breakdown(session: AsyncSession):
+    alice = User(email="amounts-a@example.com", hashed_password="hashed", name="Alice")
+    bob = User(email="amounts-b@example.com", hashed_password="hashed", name="Bob")
+    org = Organization(name="Amounts Org")
+    contact = Contact(organization=org, owner=alice, name="Contact", email=None, phone=None)
+    session.add_all([alice, bob, org, contact])
+    await session.flush()
+    amounts = [
+        (alice, "10.10", DealStatus.won),
+        (alice, "20.20", DealStatus.won),
+        (alice, "1000.00", DealStatus.lost),
+        (bob, "0.05", DealStatus.won),
+        (bob, "5.00", DealStatus.new),
+    ]
+    for owner, amount, status in amounts:
+        session.add(
+            Deal(
+                organization_id=org.id,
+                contact_id=contact.id,
+                owner_id=owner.id,
+                title=amount,
+                amount=Decimal(amount),
+                status=status,
+            )
+        )
+    await session.commit()
+
+    service = AmountDistributionService(session)
+    columns = await service.load_columns(org.id)
+    assert columns.amount_cents.dtype.kind == "i"
+    assert sorted(columns.amount_cents.tolist()) == [5, 500, 1010, 2020, 100000]
+    assert await service.load_columns(org.id) is columns
+    assert columns_cache.stats().bytes >= columns.nbytes
+
+    everything = await service.distribution(org.id, bins=4)
+    assert everything.deal_count == 5
+    assert everything.total == pytest.approx(1035.35)
+    assert everything.percentiles["p50"] == pytest.approx(10.10)
+    assert sum(everything.histogram_counts) == 5
+    by_owner = {item.owner_id: item for item in everything.by_owner}
+    assert by_owner[alice.id].median == pytest.approx(20.20)
+    assert by_owner[bob.id].median == pytest.approx(2.525, abs=0.01)
+
+    won = await service.distribution(org.id, status=[DealStatus.won])
+    assert won.deal_count == 3
+    assert {item.owner_id: item.total for item in won.by_owner} == {alice.id: 30.30, bob.id: 0.05}
+
+    # другой воркер добавил сделку и поднял ревизию, но датаграмма сюда не дошла
+    session.add(
+        Deal(
+            organization_id=org.id,
+            contact_id=contact.id,
+            owner_id=bob.id,
+            title="late",
+            amount=Decimal("7.00"),
+            status=DealStatus.new,
+        )
+    )
+    await OrganizationRevisionRepository(session).bump(org.id, RevisionEntity.deals)
+    await session.commit()
+    refreshed = await service.load_columns(org.id)
+    assert refreshed is not columns
+    assert len(refreshed) == 6
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import pytest
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio
+async def test_refresh_rotation_and_reuse_detection(client: AsyncClient):
+    response = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "refresh@example.com",
+            "password": "StrongPass123",
+            "name": "Refresher",
+            "organization_name": "Refresh Org",
+        },
+    )
+    assert response.status_code == 201, response.text
+    first = response.json()["refresh_token"]
+
+    rotated = await client.post("/api/v1/auth/refresh", json={"refresh_token": first})
+    assert rotated.status_code == 200, rotated.text
+    second = rotated.json()["refresh_token"]
+    assert second != first
+
+    me = await client.get(
+        "/api/v1/organizations/me",
+        headers={"Authorization": f"Bearer {rotated.json()['access_token']}"},
+    )
+    assert me.status_code == 200
+
+    reused = await client.post("/api/v1/auth/refresh", json={"refresh_token": first})
+    assert reused.status_code == 401
+
+    # повторное использование отзывает всю цепочку, включая свежий токен
+    revoked = await client.post("/api/v1/auth/refresh", json={"refresh_token": second})
+    assert revoked.status_code == 401
+
+    access_as_refresh = await client.post(
+        "/api/v1/auth/refresh", json={"refresh_token": rotated.json()["access_token"]}
+    )
+    assert access_as_refresh.status_code == 401
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.core.cache import MISSING, LRUCache, cache_stats
+from app.core.cache_backends import SharedFileCache
+
+
+def test_lru_eviction_and_falsy_values():
+    cache = LRUCache(max_entries=2, namespace="test-lru")
+    cache.set("a", 0)
+    cache.set("b", None)
+    assert cache.get("a", MISSING) == 0
+    cache.set("c", [])
+    assert cache.get("b", MISSING) is MISSING
+    assert cache.get("a", MISSING) == 0
+    assert cache.get("c", MISSING) == []
+
+    stats = cache_stats()["test-lru"]
+    assert stats.evictions == 1
+    assert stats.size == 2
+    assert stats.hits == 3 and stats.misses == 1
+
+
+def test_max_bytes_and_sweep():
+    cache = LRUCache(max_bytes=100, namespace="test-bytes", sizeof=len)
+    cache.set("a", "x" * 60)
+    cache.set("b", "y" * 60)
+    assert "a" not in cache and "b" in cache
+    assert cache.stats().bytes == 60
+
+    cache.set("short", "z", ttl=-1)
+    assert cache.sweep() == 1
+    assert cache.stats().expirations == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_coroutine_keeps_falsy_results():
+    cache = LRUCache(max_entries=10, namespace="test-async")
+    calls: list[int] = []
+
+    @cache.cached
+    async def load(organization_id: int) -> dict[str, int]:
+        calls.append(organization_id)
+        return {}
+
+    assert await load(1) == {}
+    assert await load(1) == {}
+    assert calls == [1]
+
+
+@pytest.mark.asyncio
+async def test_memoize_single_flight_and_stale_while_revalidate():
+    cache = LRUCache(max_entries=10, ttl_seconds=0.05, namespace="test-memoize")
+    calls: list[int] = []
+
+    @cache.memoize(stale_seconds=10)
+    async def load(organization_id: int) -> int:
+        calls.append(organization_id)
+        await asyncio.sleep(0.01)
+        return len(calls)
+
+    results = await asyncio.gather(*(load(1) for _ in range(20)))
+    assert results == [1] * 20
+    assert calls == [1]
+
+    await asyncio.sleep(0.06)
+    assert await load(1) == 1  # устаревшее значение отдаётся сразу
+    await asyncio.sleep(0.03)
+    assert calls == [1, 1]
+    assert await load(1) == 2
+
+
+@pytest.mark.asyncio
+async def test_memoize_computes_misses_on_a_detached_owner():
+    cache = LRUCache(max_entries=10, ttl_seconds=60, namespace="test-memoize-detach")
+    owners: list[str] = []
+
+    @asynccontextmanager
+    async def detached(service: Service):
+        yield Service("detached")
+
+    class Service:
+        def __init__(self, name: str) -> None:
+            self.name = name
+
+        @cache.memoize(detach=detached)
+        async def load(self, organization_id: int) -> int:
+            owners.append(self.name)
+            return organization_id
+
+    # вычисление по промаху не должно идти на ресурсах запроса, который его начал
+    assert await Service("request").load(1) == 1
+    assert await Service("request").load(1) == 1
+    assert owners == ["detached"]
+
+
+def test_shared_file_cache_is_visible_to_other_workers(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    writer = SharedFileCache(path, max_entries=2, ttl_seconds=60, namespace="test-shared")
+    reader = SharedFileCache(path, max_entries=2, ttl_seconds=60, namespace="test-shared")
+
+    writer.set(("summary", 1), {"won": 0})
+    assert reader.get(("summary", 1), MISSING) == {"won": 0}
+
+    writer.set(("summary", 2), None)
+    writer.set(("summary", 3), [])
+    writer.sweep()
+    assert len(reader) == 2
+    assert reader.get(("summary", 1), MISSING) is MISSING
+
+    reader.delete_where(lambda key: key[1] == 2)
+    assert writer.get(("summary", 2), MISSING) is MISSING
+
+
+@pytest.mark.asyncio
+async def test_shared_file_cache_memoize_runs_io_off_the_event_loop(tmp_path, monkeypatch):
+    cache = SharedFileCache(
+        tmp_path / "cache.sqlite3", max_entries=10, ttl_seconds=60, namespace="test-shared-async"
+    )
+    threads: list[str] = []
+    original = asyncio.to_thread
+
+    async def to_thread(func, /, *args, **kwargs):
+        threads.append(getattr(func, "__name__", None) or func.func.__name__)
+        return await original(func, *args, **kwargs)
+
+    monkeypatch.setattr(asyncio, "to_thread", to_thread)
+
+    @cache.memoize()
+    async def load(organization_id: int) -> dict[str, int]:
+        return {"won": organization_id}
+
+    assert await load(7) == {"won": 7}
+    assert await load(7) == {"won": 7}
+    assert threads == ["get", "set", "get"]
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import pytest
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio
+async def test_list_returns_304_until_organization_changes(client: AsyncClient):
+    response = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "etag@example.com",
+            "password": "StrongPass123",
+            "name": "Etag",
+            "organization_name": "Etag Org",
+        },
+    )
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    organization_id = (await client.get("/api/v1/organizations/me", headers=headers)).json()[0]["id"]
+    headers["X-Organization-Id"] = str(organization_id)
+
+    await client.post("/api/v1/contacts", json={"name": "First"}, headers=headers)
+    first = await client.get("/api/v1/contacts", headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    cached = await client.get("/api/v1/contacts", headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert cached.content == b""
+
+    other_page = await client.get("/api/v1/contacts?page=2", headers={**headers, "If-None-Match": etag})
+    assert other_page.status_code == 200
+
+    await client.post("/api/v1/contacts", json={"name": "Second"}, headers=headers)
+    changed = await client.get("/api/v1/contacts", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert len(changed.json()) == 2
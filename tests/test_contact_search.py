@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.contact import Contact
+from app.models.organization import Organization
+from app.models.organization_member import OrganizationRole
+from app.models.user import User
+from app.repositories.base import CountMode
+from app.services.contacts import ContactService
+from app.services.exceptions import ServiceError
+
+
+@pytest.mark.asyncio
+async def test_contact_search_is_ranked_and_served_by_fts(session: AsyncSession):
+    owner = User(email="search@example.com", hashed_password="hashed", name="Search")
+    org, other_org = Organization(name="Search Org"), Organization(name="Search Other Org")
+    session.add_all([owner, org, other_org])
+    await session.flush()
+    session.add_all(
+        [
+            Contact(
+                organization_id=org.id,
+                owner_id=owner.id,
+                name="Мария Иванова, отдел закупок головного офиса в Новосибирске",
+                email="maria@example.com",
+            ),
+            Contact(organization_id=org.id, owner_id=owner.id, name="Пётр Сидоров", email="petr@example.com"),
+            Contact(organization_id=org.id, owner_id=owner.id, name="Иван", phone="+7 900 111-22-33"),
+            Contact(organization_id=other_org.id, owner_id=owner.id, name="Иван Чужой"),
+        ]
+    )
+    await session.commit()
+
+    service = ContactService(session)
+
+    async def search(query: str, **params):
+        return await service.list_contacts(
+            organization_id=org.id,
+            role=OrganizationRole.owner,
+            owner_id=None,
+            search=query,
+            page=1,
+            page_size=10,
+            **params,
+        )
+
+    statements: list[str] = []
+
+    def capture(*args):
+        statements.append(args[2])
+
+    sync_engine = session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", capture)
+    try:
+        page = await search("ИВАН")
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", capture)
+    # короткое точное совпадение выше длинного имени, чужая организация не видна
+    assert [contact.name for contact in page.items][0] == "Иван"
+    assert len(page.items) == 2
+    assert "contacts_fts MATCH" in statements[0]
+
+    assert [contact.name for contact in (await search("111-22")).items] == ["Иван"]
+    assert [contact.name for contact in (await search("petr@")).items] == ["Пётр Сидоров"]
+    # строка короче триграммы ищется через ILIKE
+    assert [contact.name for contact in (await search("Пё")).items] == ["Пётр Сидоров"]
+    assert (await search('"ив" OR *', count=CountMode.exact)).total == 0
+
+    contact = page.items[0]
+    contact.name = "Иннокентий"
+    await session.commit()
+    assert [contact.name for contact in (await search("Иннок")).items] == ["Иннокентий"]
+
+    with pytest.raises(ServiceError):
+        await search("Иван", cursor="eyJpZCI6MX0")
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import asyncio
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.contact import Contact
+from app.models.organization import Organization
+from app.models.organization_member import OrganizationMember, OrganizationRole
+from app.models.user import User
+from app.services import dashboard
+from app.services.analytics import AnalyticsService
+from app.services.dashboard import DashboardService, OrganizationResultStatus
+from app.services.deals import DealService
+
+
+@pytest.mark.asyncio
+async def test_dashboard_returns_partial_results_on_timeout(session: AsyncSession, monkeypatch):
+    user = User(email="dashboard@example.com", hashed_password="hashed", name="Manager")
+    organizations = [Organization(name=f"Dashboard Org {index}") for index in range(3)]
+    session.add_all([user, *organizations])
+    await session.flush()
+    for index, organization in enumerate(organizations):
+        contact = Contact(organization_id=organization.id, owner_id=user.id, name="Contact", email=None, phone=None)
+        session.add_all(
+            [
+                OrganizationMember(organization_id=organization.id, user_id=user.id, role=OrganizationRole.manager),
+                contact,
+            ]
+        )
+        await session.flush()
+        for amount in range(index + 1):
+            await DealService(session).create_deal(
+                organization_id=organization.id,
+                contact_id=contact.id,
+                owner_id=user.id,
+                actor_id=user.id,
+                role=OrganizationRole.manager,
+                title=f"Deal {amount}",
+                amount=Decimal(100),
+                currency="USD",
+            )
+
+    slow_id = organizations[1].id
+    original = AnalyticsService.deals_summary
+
+    async def deals_summary(self, organization_id, **kwargs):
+        if organization_id == slow_id:
+            await asyncio.sleep(0.5)
+        return await original(self, organization_id, **kwargs)
+
+    monkeypatch.setattr(AnalyticsService, "deals_summary", deals_summary)
+    service = DashboardService(session, max_concurrency=2, timeout_seconds=0.2)
+    result = await service.deals_summary(user.id)
+
+    assert [entry.organization_id for entry in result.organizations] == [org.id for org in organizations]
+    assert not result.complete
+    assert [entry.status for entry in result.organizations] == [
+        OrganizationResultStatus.ok,
+        OrganizationResultStatus.timeout,
+        OrganizationResultStatus.ok,
+    ]
+    assert result.organizations[0].summary.count_by_status == {"new": 1}
+    assert result.organizations[2].summary.count_by_status == {"new": 3}
+    assert result.organizations[1].summary is None
+
+    # опоздавший расчёт дорабатывает в фоне и не роняет цикл событий
+    await asyncio.gather(*dashboard._background)
+
+    # сверх лимита фоновых расчётов опоздавшие отменяются, а не копятся
+    monkeypatch.setattr(dashboard.settings, "dashboard_max_background", 0)
+    result = await service.deals_summary(user.id)
+    assert result.organizations[1].status == OrganizationResultStatus.timeout
+    assert not dashboard._background
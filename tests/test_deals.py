@@ -1,15 +1,23 @@
 from __future__ import annotations
 
+from decimal import Decimal
+
 import pytest
+from sqlalchemy import event, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.activity import Activity, ActivityType
 from app.models.contact import Contact
 from app.models.deal import Deal, DealStage, DealStatus
 from app.models.organization import Organization
 from app.models.organization_member import OrganizationMember, OrganizationRole
 from app.models.user import User
+from app.repositories.base import CountMode
+from app.repositories.deal_stat import DealStatRepository
+from app.services.analytics import AnalyticsService
 from app.services.deals import DealService
 from app.services.exceptions import ServiceError
+from benchmarks._aggregates import summary_metrics
 
 
 @pytest.mark.asyncio
@@ -45,3 +53,357 @@ async def test_stage_revert_forbidden_for_manager(session: AsyncSession):
         )
 
 
+@pytest.mark.asyncio
+async def test_analytics_refreshes_right_after_deal_update(session: AsyncSession):
+    owner = User(email="versions@example.com", hashed_password="hashed", name="Owner")
+    org = Organization(name="Versions Org")
+    contact = Contact(organization=org, owner=owner, name="Contact", email=None, phone=None)
+    session.add_all([owner, org, contact])
+    await session.commit()
+
+    deals = DealService(session)
+    analytics = AnalyticsService(session)
+    deal = await deals.create_deal(
+        organization_id=org.id,
+        contact_id=contact.id,
+        owner_id=owner.id,
+        actor_id=owner.id,
+        role=OrganizationRole.owner,
+        title="Deal",
+        amount=Decimal("250"),
+        currency="USD",
+    )
+    assert (await analytics.deals_summary(org.id)).count_by_status == {"new": 1}
+
+    await deals.update_deal(
+        deal_id=deal.id,
+        organization_id=org.id,
+        actor_id=owner.id,
+        role=OrganizationRole.owner,
+        data={"status": DealStatus.won},
+    )
+    summary = await analytics.deals_summary(org.id)
+    assert summary.count_by_status == {"won": 1}
+    assert summary.average_won_amount == 250.0
+
+
+@pytest.mark.asyncio
+async def test_single_scan_baseline_matches_rollup_summary(session: AsyncSession):
+    # однопроходная сводка — база бенчмарка; в API её заменила свёртка deal_stats
+    owner = User(email="single-scan@example.com", hashed_password="hashed", name="Owner")
+    org = Organization(name="Single Scan Org")
+    contact = Contact(organization=org, owner=owner, name="Contact", email=None, phone=None)
+    session.add_all([owner, org, contact])
+    await session.flush()
+    for amount, status in ((100, DealStatus.won), (300, DealStatus.won), (50, DealStatus.lost), (70, DealStatus.new)):
+        session.add(
+            Deal(
+                organization_id=org.id,
+                contact_id=contact.id,
+                owner_id=owner.id,
+                title=f"Deal {amount}",
+                amount=Decimal(amount),
+                currency="USD",
+                status=status,
+            )
+        )
+    await DealStatRepository(session).rebuild(org.id)
+    await session.commit()
+
+    statements: list[str] = []
+
+    def count(*args):
+        statements.append(args[2])
+
+    sync_engine = session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", count)
+    try:
+        metrics = await summary_metrics(session, org.id, last_days=30)
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", count)
+
+    assert len(statements) == 1
+    assert metrics.count_by_status == {DealStatus.new: 1, DealStatus.won: 2, DealStatus.lost: 1}
+    assert metrics.amount_by_status[DealStatus.won] == Decimal(400)
+    assert metrics.average_won_amount == Decimal(200)
+    assert metrics.new_deals == 4
+
+    summary = await AnalyticsService(session).deals_summary(org.id, last_days=30)
+    assert summary.count_by_status == {status.value: n for status, n in metrics.count_by_status.items()}
+    assert summary.amount_by_status == {
+        status.value: float(total) for status, total in metrics.amount_by_status.items()
+    }
+    assert summary.average_won_amount == float(metrics.average_won_amount)
+    assert summary.new_deals_last_n_days == metrics.new_deals
+
+
+@pytest.mark.asyncio
+async def test_deal_stats_follow_create_and_update(session: AsyncSession):
+    owner = User(email="rollup@example.com", hashed_password="hashed", name="Owner")
+    org = Organization(name="Rollup Org")
+    contact = Contact(organization=org, owner=owner, name="Contact", email=None, phone=None)
+    session.add_all([owner, org, contact])
+    await session.commit()
+
+    deals = DealService(session)
+    created = [
+        await deals.create_deal(
+            organization_id=org.id,
+            contact_id=contact.id,
+            owner_id=owner.id,
+            actor_id=owner.id,
+            role=OrganizationRole.owner,
+            title=f"Deal {amount}",
+            amount=Decimal(amount),
+            currency="USD",
+        )
+        for amount in (100, 300)
+    ]
+    await deals.update_deal(
+        deal_id=created[0].id,
+        organization_id=org.id,
+        actor_id=owner.id,
+        role=OrganizationRole.owner,
+        data={"status": DealStatus.won, "stage": DealStage.closed, "amount": Decimal(150)},
+    )
+
+    stats = DealStatRepository(session)
+    assert await stats.verify(org.id) == []
+    buckets = {(row.status, row.stage): (row.deal_count, row.amount_total) for row in await stats.list_for_org(org.id)}
+    assert buckets == {
+        (DealStatus.new, DealStage.qualification): (1, Decimal(300)),
+        (DealStatus.won, DealStage.closed): (1, Decimal(150)),
+    }
+    activities = await session.execute(select(Activity.type).where(Activity.deal_id == created[0].id))
+    assert sorted(activities.scalars().all()) == [ActivityType.stage_changed, ActivityType.status_changed]
+
+    summary = await AnalyticsService(session).deals_summary(org.id)
+    assert summary.count_by_status == {"new": 1, "won": 1}
+    assert summary.amount_by_status == {"new": 300.0, "won": 150.0}
+    assert summary.average_won_amount == 150.0
+    funnel = await AnalyticsService(session).deals_funnel(org.id)
+    assert funnel == {"qualification": {"new": 1}, "closed": {"won": 1}}
+
+
+@pytest.mark.asyncio
+async def test_board_returns_top_deals_per_stage_with_cursors(session: AsyncSession):
+    owner = User(email="board@example.com", hashed_password="hashed", name="Owner")
+    org = Organization(name="Board Org")
+    contact = Contact(organization=org, owner=owner, name="Contact", email=None, phone=None)
+    session.add_all([owner, org, contact])
+    await session.flush()
+    # все сделки создаются в одну секунду: порядок держится на id как втором ключе
+    session.add_all(
+        [
+            Deal(
+                organization_id=org.id,
+                contact_id=contact.id,
+                owner_id=owner.id,
+                title=f"Deal {index}",
+                amount=Decimal(100 + index),
+                stage=DealStage.proposal if index >= 5 else DealStage.qualification,
+            )
+            for index in range(7)
+        ]
+    )
+    await session.commit()
+
+    service = DealService(session)
+    statements: list[str] = []
+
+    def count(*args):
+        statements.append(args[2])
+
+    sync_engine = session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", count)
+    try:
+        board = await service.board(
+            organization_id=org.id, status=None, owner_id=None, order_by="created_at", order="desc", limit=2
+        )
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", count)
+    assert len(statements) == 1
+
+    columns = {column.stage: column for column in board}
+    assert [column.stage for column in board] == service.stage_order
+    qualification = columns[DealStage.qualification]
+    assert (qualification.total_count, qualification.total_amount) == (5, Decimal(510))
+    assert columns[DealStage.proposal].next_cursor is None
+    assert len(columns[DealStage.proposal].deals) == 2
+    assert columns[DealStage.negotiation].total_count == 0
+
+    seen = [deal.title for deal in qualification.deals]
+    cursor = qualification.next_cursor
+    while cursor:
+        [column] = await service.board(
+            organization_id=org.id,
+            status=None,
+            owner_id=None,
+            order_by="created_at",
+            order="desc",
+            limit=2,
+            cursor=cursor,
+        )
+        assert column.total_count == 5
+        seen.extend(deal.title for deal in column.deals)
+        cursor = column.next_cursor
+    assert seen == [f"Deal {index}" for index in (4, 3, 2, 1, 0)]
+
+    with pytest.raises(ServiceError):
+        await service.board(
+            organization_id=org.id,
+            status=None,
+            owner_id=None,
+            order_by="amount",
+            order="desc",
+            limit=2,
+            cursor=qualification.next_cursor,
+        )
+
+
+@pytest.mark.asyncio
+async def test_deal_list_keyset_pagination(session: AsyncSession):
+    owner = User(email="keyset@example.com", hashed_password="hashed", name="Keyset")
+    org = Organization(name="Keyset Org")
+    contact = Contact(organization=org, owner=owner, name="Contact", email=None, phone=None)
+    session.add_all([owner, org, contact])
+    await session.flush()
+    # повторяющиеся суммы: без id во втором ключе курсор терял бы или дублировал строки
+    session.add_all(
+        [
+            Deal(
+                organization_id=org.id,
+                contact_id=contact.id,
+                owner_id=owner.id,
+                title=f"Deal {index}",
+                amount=Decimal(100 * (index % 3)),
+            )
+            for index in range(8)
+        ]
+    )
+    await session.commit()
+
+    service = DealService(session)
+    filters = dict(status=None, min_amount=None, max_amount=None, stage=None, owner_id=None)
+    seen: list[Deal] = []
+    cursor = None
+    while True:
+        page = await service.list_deals(
+            organization_id=org.id,
+            **filters,
+            order_by="amount",
+            order="desc",
+            limit=3,
+            offset=0,
+            cursor=cursor,
+        )
+        seen.extend(page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert [(deal.amount, deal.id) for deal in seen] == sorted(
+        ((deal.amount, deal.id) for deal in seen), reverse=True
+    )
+    assert len({deal.id for deal in seen}) == 8
+
+    first = await service.list_deals(
+        organization_id=org.id, **filters, order_by="created_at", order="asc", limit=5, offset=0
+    )
+    rest = await service.list_deals(
+        organization_id=org.id,
+        **filters,
+        order_by="created_at",
+        order="asc",
+        limit=5,
+        offset=0,
+        cursor=first.next_cursor,
+    )
+    assert [deal.title for deal in first.items + rest.items] == [f"Deal {index}" for index in range(8)]
+    assert rest.next_cursor is None
+
+    with pytest.raises(ServiceError):
+        await service.list_deals(
+            organization_id=org.id, **filters, order_by="contact", order="asc", limit=5, offset=0
+        )
+    with pytest.raises(ServiceError):
+        await service.list_deals(
+            organization_id=org.id,
+            **filters,
+            order_by="amount",
+            order="asc",
+            limit=5,
+            offset=0,
+            cursor=first.next_cursor,
+        )
+
+
+@pytest.mark.asyncio
+async def test_deal_list_counting_strategies(session: AsyncSession):
+    owner = User(email="counting@example.com", hashed_password="hashed", name="Counting")
+    org = Organization(name="Counting Org")
+    contact = Contact(organization=org, owner=owner, name="Contact", email=None, phone=None)
+    session.add_all([owner, org, contact])
+    await session.flush()
+    session.add_all(
+        [
+            Deal(organization_id=org.id, contact_id=contact.id, owner_id=owner.id, title=f"Deal {index}", amount=10)
+            for index in range(5)
+        ]
+    )
+    await session.commit()
+
+    service = DealService(session)
+    filters = dict(status=None, min_amount=None, max_amount=None, stage=None, owner_id=None)
+    statements: list[str] = []
+
+    def count(*args):
+        statements.append(args[2])
+
+    async def list_page(mode: CountMode, *, limit: int = 2, offset: int = 0):
+        statements.clear()
+        return await service.list_deals(
+            organization_id=org.id,
+            **filters,
+            order_by="created_at",
+            order="desc",
+            limit=limit,
+            offset=offset,
+            count=mode,
+        )
+
+    sync_engine = session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", count)
+    try:
+        page = await list_page(CountMode.none)
+        assert (page.total, page.has_more, len(statements)) == (None, True, 1)
+
+        # ревизия сделок, страница и COUNT
+        page = await list_page(CountMode.exact)
+        assert (page.total, page.total_estimated, len(statements)) == (5, False, 3)
+        # повторный подсчёт с теми же фильтрами берётся из кэша
+        page = await list_page(CountMode.exact, offset=2)
+        assert (page.total, len(statements)) == (5, 2)
+
+        # новая сделка увеличивает ревизию, и закэшированный итог больше не используется
+        await service.create_deal(
+            organization_id=org.id,
+            contact_id=contact.id,
+            owner_id=owner.id,
+            actor_id=owner.id,
+            role=OrganizationRole.owner,
+            title="Deal 5",
+            amount=Decimal(10),
+            currency="USD",
+        )
+        page = await list_page(CountMode.exact, offset=2)
+        assert page.total == 6
+
+        # на SQLite оценки планировщика нет — считается точно
+        page = await list_page(CountMode.estimated)
+        assert (page.total, page.total_estimated) == (6, False)
+
+        # последняя страница от начала выборки: итог известен без COUNT
+        page = await list_page(CountMode.exact, limit=10)
+        assert (page.total, page.has_more, len(statements)) == (6, False, 2)
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", count)
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.contact import Contact
+from app.models.deal import DealStage, DealStatus
+from app.models.organization import Organization
+from app.models.organization_member import OrganizationRole
+from app.models.user import User
+from app.repositories.pipeline_total import PipelineTotalRepository
+from app.services.deals import DealService
+from app.services.exceptions import PermissionDeniedError
+from app.services.forecast import ForecastService
+
+
+async def _snapshot(session: AsyncSession, organization_id: int) -> list[tuple]:
+    rows = await PipelineTotalRepository(session).list_for_org(organization_id)
+    return sorted((row.owner_id, row.stage, row.close_month, row.deal_count, row.amount_total) for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_forecast_follows_deal_deltas_and_probabilities(session: AsyncSession):
+    owner = User(email="forecast@example.com", hashed_password="hashed", name="Owner")
+    org = Organization(name="Forecast Org")
+    contact = Contact(organization=org, owner=owner, name="Contact", email=None, phone=None)
+    session.add_all([owner, org, contact])
+    await session.commit()
+
+    deals = DealService(session)
+
+    async def create(amount: int, close: date | None):
+        return await deals.create_deal(
+            organization_id=org.id,
+            contact_id=contact.id,
+            owner_id=owner.id,
+            actor_id=owner.id,
+            role=OrganizationRole.owner,
+            title=f"Deal {amount}",
+            amount=Decimal(amount),
+            currency="USD",
+            expected_close_date=close,
+        )
+
+    first = await create(1000, date(2026, 11, 15))
+    second = await create(500, None)
+    lost = await create(300, date(2026, 11, 1))
+
+    async def update(deal_id: int, **data):
+        await deals.update_deal(
+            deal_id=deal_id, organization_id=org.id, actor_id=owner.id, role=OrganizationRole.owner, data=data
+        )
+
+    await update(first.id, stage=DealStage.negotiation)
+    await update(second.id, amount=Decimal(800), expected_close_date=date(2026, 12, 3))
+    await update(lost.id, status=DealStatus.lost)
+
+    service = ForecastService(session)
+    forecast = await service.forecast(org.id)
+    # 1000 × 0.6 (negotiation) + 800 × 0.1 (qualification)
+    assert forecast.open_deals == 2
+    assert forecast.pipeline == 1800.0
+    assert forecast.weighted == 680.0
+    assert [(item.month, item.weighted) for item in forecast.by_month] == [
+        (date(2026, 11, 1), 600.0),
+        (date(2026, 12, 1), 80.0),
+    ]
+    assert [(item.owner_id, item.open_deals) for item in forecast.by_owner] == [(owner.id, 2)]
+
+    with pytest.raises(PermissionDeniedError):
+        await service.set_probabilities(
+            organization_id=org.id,
+            role=OrganizationRole.member,
+            probabilities={DealStage.negotiation: Decimal(1)},
+        )
+    await service.set_probabilities(
+        organization_id=org.id,
+        role=OrganizationRole.admin,
+        probabilities={DealStage.negotiation: Decimal("0.5")},
+    )
+    assert (await service.forecast(org.id)).weighted == 580.0
+
+    incremental = await _snapshot(session, org.id)
+    await PipelineTotalRepository(session).rebuild(org.id)
+    await session.commit()
+    assert await _snapshot(session, org.id) == incremental
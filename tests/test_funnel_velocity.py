@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.quantiles import LogHistogram
+from app.models.activity import Activity, ActivityType
+from app.models.contact import Contact
+from app.models.deal import Deal, DealStage, DealStatus
+from app.models.organization import Organization
+from app.models.user import User
+from app.services.funnel_velocity import FunnelVelocityService
+
+
+def test_log_histogram_quantiles_within_relative_error():
+    histogram = LogHistogram(1.05)
+    for value in range(1, 1001):
+        histogram.add(float(value))
+    assert histogram.quantile(0.5) == pytest.approx(500, rel=0.025)
+    assert histogram.quantile(0.9) == pytest.approx(900, rel=0.025)
+    assert LogHistogram(1.05).quantile(0.5) is None
+
+
+def _stage_change(deal: Deal, at: datetime, old: DealStage, new: DealStage) -> Activity:
+    return Activity(
+        deal_id=deal.id,
+        type=ActivityType.stage_changed,
+        payload={"old_stage": old.value, "new_stage": new.value},
+        created_at=at,
+    )
+
+
+@pytest.mark.asyncio
+async def test_velocity_counts_conversions_and_resumes_from_checkpoint(session: AsyncSession):
+    owner = User(email="velocity@example.com", hashed_password="hashed", name="Owner")
+    org = Organization(name="Velocity Org")
+    contact = Contact(organization=org, owner=owner, name="Contact", email=None, phone=None)
+    session.add_all([owner, org, contact])
+    await session.flush()
+    start = datetime(2026, 1, 1)
+    deals = [
+        Deal(
+            organization_id=org.id,
+            contact_id=contact.id,
+            owner_id=owner.id,
+            title=f"Deal {index}",
+            amount=Decimal(100),
+            created_at=start,
+        )
+        for index in range(3)
+    ]
+    session.add_all(deals)
+    await session.flush()
+    # две сделки уходят из qualification за 1 и 3 часа, третья там же проигрывается
+    session.add_all(
+        [
+            _stage_change(deals[0], start + timedelta(hours=1), DealStage.qualification, DealStage.proposal),
+            _stage_change(deals[1], start + timedelta(hours=3), DealStage.qualification, DealStage.negotiation),
+            Activity(
+                deal_id=deals[2].id,
+                type=ActivityType.status_changed,
+                payload={"old_status": "new", "new_status": DealStatus.lost.value},
+                created_at=start + timedelta(hours=5),
+            ),
+        ]
+    )
+    await session.commit()
+
+    service = FunnelVelocityService(session, settle_seconds=0)
+    velocity = await service.velocity(org.id)
+    qualification, proposal = velocity.stages[0], velocity.stages[1]
+    assert (qualification.entered, qualification.advanced, qualification.lost) == (3, 2, 1)
+    assert qualification.conversion_rate == pytest.approx(2 / 3, abs=1e-4)
+    assert qualification.completed_stays == 2
+    assert qualification.median_seconds == pytest.approx(3600, rel=0.025)
+    assert velocity.transitions == {"qualification": {"proposal": 1, "negotiation": 1}}
+
+    # второй проход читает только новую активность и продолжает стадию с момента входа в неё
+    first_checkpoint = velocity.processed_through_activity_id
+    session.add(_stage_change(deals[0], start + timedelta(hours=11), DealStage.proposal, DealStage.negotiation))
+    await session.commit()
+    velocity = await service.velocity(org.id)
+    assert velocity.processed_through_activity_id > first_checkpoint
+    assert velocity.stages[0].entered == 3
+    proposal = velocity.stages[1]
+    assert (proposal.entered, proposal.advanced, proposal.completed_stays) == (1, 1, 1)
+    assert proposal.median_seconds == pytest.approx(10 * 3600, rel=0.025)
+    assert velocity.stages[2].entered == 2
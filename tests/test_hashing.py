@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.hashing import HashingOverloadedError, HashingTimeoutError, PasswordHasher
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_run_in_pool():
+    hasher = PasswordHasher(max_workers=2)
+    try:
+        hashed = await hasher.hash("StrongPass123")
+        assert await hasher.verify("StrongPass123", hashed)
+        assert not await hasher.verify("WrongPass123", hashed)
+        metrics = hasher.metrics()
+        assert metrics.completed == 3
+        assert metrics.in_flight == 0
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_queue_limit_and_timeout():
+    hasher = PasswordHasher(max_workers=1, max_pending=1, timeout_seconds=0.05)
+    gate = threading.Event()
+    try:
+        with pytest.raises(HashingTimeoutError):
+            await hasher._run(gate.wait)
+        # воркер всё ещё занят, поэтому слот не освобождён
+        with pytest.raises(HashingOverloadedError):
+            await hasher._run(gate.wait)
+        gate.set()
+        await asyncio.sleep(0.05)
+        assert hasher.metrics().in_flight == 0
+        assert hasher.metrics().rejected == 1
+        assert hasher.metrics().timed_out == 1
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_health_exposes_hashing_pool_metrics(client: AsyncClient):
+    response = await client.get("/health")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "ok"
+    hashing = body["password_hashing"]
+    assert {"in_flight", "max_pending", "rejected", "timed_out", "avg_latency_ms"} <= hashing.keys()
+    assert "analytics" in body["caches"]
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.db.base import Base
+from app.models.contact import Contact
+from app.models.deal import Deal, DealStage, DealStatus
+from app.models.organization import Organization
+from app.models.user import User
+from app.repositories.contact import ContactRepository
+from app.repositories.deal import DealRepository
+
+# пустая одноразовая база PostgreSQL: тест создаёт и удаляет в ней все таблицы
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+
+
+async def _query_plan(
+    session: AsyncSession, call: Callable[[], Awaitable[Any]], *, explain: str = "EXPLAIN QUERY PLAN"
+) -> str:
+    """План для запроса, который репозиторий реально отправил в базу."""
+    captured: list[tuple[str, Any]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    sync_engine = session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", capture)
+    try:
+        await call()
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", capture)
+    [(statement, parameters)] = captured
+    connection = await session.connection()
+    rows = await connection.exec_driver_sql(f"{explain} {statement}", parameters)
+    return "\n".join(row[-1] for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_hot_tenant_queries_use_composite_indexes(session: AsyncSession):
+    owner = User(email="indexes@example.com", hashed_password="hashed", name="Indexes")
+    session.add(owner)
+    organizations = [Organization(name=f"Index Org {index}") for index in range(4)]
+    session.add_all(organizations)
+    await session.flush()
+    contacts = [
+        Contact(organization_id=org.id, owner_id=owner.id, name=f"Contact {index}")
+        for org in organizations
+        for index in range(10)
+    ]
+    session.add_all(contacts)
+    await session.flush()
+    statuses, stages = list(DealStatus), list(DealStage)
+    session.add_all(
+        [
+            Deal(
+                organization_id=contact.organization_id,
+                contact_id=contact.id,
+                owner_id=owner.id,
+                title=f"Deal {index}",
+                amount=index,
+                status=statuses[index % len(statuses)],
+                stage=stages[index % len(stages)],
+            )
+            for contact in contacts
+            for index in range(5)
+        ]
+    )
+    await session.commit()
+    connection = await session.connection()
+    await connection.exec_driver_sql("ANALYZE")
+
+    org_id, contact_id = organizations[0].id, contacts[0].id
+    deals, contact_repo = DealRepository(session), ContactRepository(session)
+    # на SQLite ключ сортировки по DateTime идёт через strftime (см. BaseRepository.sort_key),
+    # поэтому здесь проверяется путь фильтрации: без других фильтров планировщик вправе взять
+    # любой индекс с organization_id впереди. Порядок по индексу проверяет тест на PostgreSQL
+    deal_tenant_indexes = {"ix_deals_org_created", "ix_deals_org_status", "ix_deals_org_stage", "ix_deals_org_owner"}
+    contact_tenant_indexes = {"ix_contacts_org_created", "ix_contacts_org_owner"}
+    expectations = [
+        ({"ix_deals_org_created"}, lambda: deals.count_newer_than(org_id, 30)),
+        (deal_tenant_indexes, lambda: deals.list_for_org(org_id)),
+        ({"ix_deals_org_status"}, lambda: deals.list_for_org(org_id, status=[DealStatus.won])),
+        ({"ix_deals_org_stage"}, lambda: deals.list_for_org(org_id, stage=DealStage.proposal)),
+        ({"ix_deals_org_owner"}, lambda: deals.list_for_org(org_id, owner_id=owner.id)),
+        ({"ix_deals_contact_id"}, lambda: deals.has_contact_deals(contact_id)),
+        (contact_tenant_indexes, lambda: contact_repo.list_for_org(org_id)),
+        ({"ix_contacts_org_owner"}, lambda: contact_repo.list_for_org(org_id, owner_id=owner.id)),
+    ]
+    for index_names, call in expectations:
+        plan = await _query_plan(session, call)
+        used = {
+            line.split(" INDEX ", 1)[1].split(" ", 1)[0] for line in plan.splitlines() if " INDEX " in line
+        }
+        assert used and used <= index_names, plan
+
+
+@pytest.mark.skipif(not POSTGRES_URL, reason="нужен TEST_POSTGRES_URL с пустой базой PostgreSQL")
+@pytest.mark.asyncio
+async def test_default_lists_walk_tenant_indexes_in_order_on_postgresql():
+    engine = create_async_engine(POSTGRES_URL)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            owner = User(email="pg-indexes@example.com", hashed_password="hashed", name="Indexes")
+            org = Organization(name="PG Index Org")
+            contact = Contact(organization=org, owner=owner, name="Contact")
+            session.add_all([owner, org, contact])
+            await session.flush()
+            session.add(Deal(organization_id=org.id, contact_id=contact.id, owner_id=owner.id, title="Deal", amount=1))
+            await session.commit()
+
+            # на крошечной таблице планировщик предпочёл бы seq scan; важно, что индекс отдаёт порядок
+            connection = await session.connection()
+            await connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+            for index_name, call in (
+                ("ix_deals_org_created", lambda: DealRepository(session).list_for_org(org.id)),
+                ("ix_contacts_org_created", lambda: ContactRepository(session).list_for_org(org.id)),
+            ):
+                plan = await _query_plan(session, call, explain="EXPLAIN")
+                assert f"using {index_name} on" in plan and "Sort" not in plan, plan
+    finally:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
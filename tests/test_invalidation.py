@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.core.invalidation import InvalidationBus
+from app.core.versions import VersionCounter
+
+
+@pytest.mark.asyncio
+async def test_bus_coalesces_and_fans_out_to_other_workers(tmp_path):
+    publisher = InvalidationBus(tmp_path, batch_window_seconds=0.01, name="worker-a")
+    subscriber = InvalidationBus(tmp_path, batch_window_seconds=0.01, name="worker-b")
+    local: list[int] = []
+    remote: list[int] = []
+    publisher.subscribe("deal_versions", local.append)
+    subscriber.subscribe("deal_versions", remote.append)
+    await publisher.start()
+    await subscriber.start()
+    try:
+        for _ in range(100):
+            publisher.publish("deal_versions", 1)
+        publisher.publish("deal_versions", 2)
+        assert len(local) == 101
+
+        await asyncio.sleep(0.05)
+        assert sorted(remote) == [1, 2]
+        assert publisher.sent_datagrams == 1
+    finally:
+        await publisher.stop()
+        await subscriber.stop()
+    assert not list(tmp_path.glob("*.sock"))
+
+
+def test_deal_versions_converge_on_absolute_revisions():
+    counter = VersionCounter()
+    # порядок доставки и дубли не важны: остаётся наибольшая ревизия
+    for revision in (3, 5, 4, 5):
+        counter.observe(7, revision)
+    assert counter.get(7) == 5
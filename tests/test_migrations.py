@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import io
+import os
+import sqlite3
+from pathlib import Path
+
+import pytest
+from alembic.config import Config
+
+from alembic import command
+from app.core.config import settings
+
+# пустая одноразовая база PostgreSQL: тест прогоняет в ней миграции и откатывает их
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+
+BEFORE_SKETCH_OBSERVATIONS = "20261018_0012"
+SKETCH_OBSERVATIONS = "20261018_0013"
+TABLE = "analytics_sketch_observations"
+
+
+def _alembic_config(monkeypatch: pytest.MonkeyPatch, url: str, **kwargs) -> Config:
+    # без alembic.ini: fileConfig в env.py перенастроил бы логирование всего прогона тестов
+    monkeypatch.setattr(settings, "database_url", url)
+    config = Config(**kwargs)
+    config.set_main_option("script_location", str(Path(__file__).parents[1] / "alembic"))
+    return config
+
+
+def test_sketch_observations_reuse_existing_enum_offline(monkeypatch: pytest.MonkeyPatch):
+    output = io.StringIO()
+    config = _alembic_config(
+        monkeypatch, "postgresql+asyncpg://user@localhost/crm", output_buffer=output
+    )
+
+    command.upgrade(config, f"{BEFORE_SKETCH_OBSERVATIONS}:{SKETCH_OBSERVATIONS}", sql=True)
+
+    sql = output.getvalue()
+    assert "CREATE TABLE analytics_sketch_observations" in sql
+    assert "kind sketchkind NOT NULL" in sql
+    # тип создан миграцией 0008
+    assert "CREATE TYPE" not in sql
+
+
+def test_sketch_observations_upgrade_from_previous_head(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+):
+    path = tmp_path / "crm.db"
+    config = _alembic_config(monkeypatch, f"sqlite+aiosqlite:///{path}")
+
+    command.upgrade(config, BEFORE_SKETCH_OBSERVATIONS)
+    command.upgrade(config, SKETCH_OBSERVATIONS)
+
+    with sqlite3.connect(path) as conn:
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_info({TABLE})")}
+        indexes = {row[1] for row in conn.execute(f"PRAGMA index_list({TABLE})")}
+    assert columns == {"id", "organization_id", "kind", "bucket_start", "value", "count"}
+    assert "ix_analytics_sketch_observations_bucket" in indexes
+
+
+@pytest.mark.skipif(POSTGRES_URL is None, reason="TEST_POSTGRES_URL не задан")
+def test_sketch_observations_upgrade_on_postgres(monkeypatch: pytest.MonkeyPatch):
+    config = _alembic_config(monkeypatch, POSTGRES_URL or "")
+
+    command.upgrade(config, BEFORE_SKETCH_OBSERVATIONS)
+    try:
+        command.upgrade(config, SKETCH_OBSERVATIONS)
+    finally:
+        command.downgrade(config, "base")
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.activity import Activity, ActivityType
+from app.models.contact import Contact
+from app.models.deal import Deal
+from app.models.organization import Organization
+from app.models.task import Task
+from app.models.user import User
+from app.services.activities import ActivityService
+from app.services.tasks import TaskService
+
+
+@pytest.mark.asyncio
+async def test_task_and_activity_lists_are_bounded_and_cursor_paginated(
+    session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+):
+    owner = User(email="bounded@example.com", hashed_password="hashed", name="Bounded")
+    org = Organization(name="Bounded Org")
+    contact = Contact(organization=org, owner=owner, name="Contact", email=None, phone=None)
+    session.add_all([owner, org, contact])
+    await session.flush()
+    deal = Deal(organization_id=org.id, contact_id=contact.id, owner_id=owner.id, title="Deal", amount=10)
+    session.add(deal)
+    await session.flush()
+    today = date.today()
+    session.add_all(
+        [
+            Task(
+                deal_id=deal.id,
+                owner_id=owner.id,
+                title=f"Task {index}",
+                due_date=today + timedelta(days=index % 3),
+            )
+            for index in range(7)
+        ]
+        + [
+            Activity(deal_id=deal.id, author_id=owner.id, type=ActivityType.comment, payload={"n": index})
+            for index in range(7)
+        ]
+    )
+    await session.commit()
+    monkeypatch.setattr(settings, "list_max_limit", 3)
+
+    tasks = TaskService(session)
+    seen: list[Task] = []
+    cursor = None
+    while True:
+        page = await tasks.list_tasks(organization_id=org.id, owner_id=owner.id, limit=1_000, cursor=cursor)
+        # клиент просил 1000, сервер отдаёт не больше потолка
+        assert len(page.items) <= 3
+        seen.extend(page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert [(task.due_date, task.id) for task in seen] == sorted((task.due_date, task.id) for task in seen)
+    assert len({task.id for task in seen}) == 7
+
+    activities = ActivityService(session)
+    first = await activities.list_for_deal(deal_id=deal.id, organization_id=org.id)
+    assert [activity.payload["n"] for activity in first.items] == [6, 5, 4]
+    rest = await activities.list_for_deal(
+        deal_id=deal.id, organization_id=org.id, limit=2, cursor=first.next_cursor
+    )
+    assert [activity.payload["n"] for activity in rest.items] == [3, 2]
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.organization import Organization
+from app.models.organization_member import OrganizationMember, OrganizationRole
+from app.models.user import User
+from app.services.exceptions import PermissionDeniedError
+from app.services.organizations import OrganizationService
+from app.services.principals import PrincipalResolver
+
+
+@pytest.mark.asyncio
+async def test_principal_resolved_in_one_query_and_cached(session: AsyncSession):
+    user = User(email="principal@example.com", hashed_password="hashed", name="Principal")
+    org = Organization(name="Principal Org")
+    session.add_all([user, org])
+    await session.flush()
+    session.add(OrganizationMember(organization_id=org.id, user_id=user.id, role=OrganizationRole.manager))
+    await session.commit()
+
+    statements: list[str] = []
+
+    def count(*args):
+        statements.append(args[2])
+
+    sync_engine = session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", count)
+    try:
+        resolver = PrincipalResolver(session)
+        principal = await resolver.resolve(user_id=user.id, organization_id=org.id)
+        assert principal is not None and principal.organization_id == org.id
+        assert principal.role == OrganizationRole.manager
+        assert len(statements) == 1
+
+        await resolver.resolve(user_id=user.id, organization_id=org.id)
+        assert len(statements) == 1
+
+        await OrganizationService(session).change_member_role(
+            organization_id=org.id, actor_role=OrganizationRole.owner, user_id=user.id, role=OrganizationRole.admin
+        )
+        statements.clear()
+        principal = await resolver.resolve(user_id=user.id, organization_id=org.id)
+        assert principal is not None and principal.role == OrganizationRole.admin
+        assert len(statements) == 1
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", count)
+
+
+@pytest.mark.asyncio
+async def test_owner_manages_members(client: AsyncClient, session: AsyncSession):
+    response = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "members-owner@example.com",
+            "password": "StrongPass123",
+            "name": "Owner",
+            "organization_name": "Members Org",
+        },
+    )
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    [organization] = (await client.get("/api/v1/organizations/me", headers=headers)).json()
+    org_headers = {**headers, "X-Organization-Id": str(organization["id"])}
+
+    member = User(email="members-member@example.com", hashed_password="hashed", name="Member")
+    session.add(member)
+    await session.flush()
+    session.add(OrganizationMember(organization_id=organization["id"], user_id=member.id, role=OrganizationRole.member))
+    await session.commit()
+
+    response = await client.patch(
+        f"/api/v1/organizations/members/{member.id}", json={"role": "admin"}, headers=org_headers
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["role"] == "admin"
+
+    # admin не может назначать владельцев
+    with pytest.raises(PermissionDeniedError):
+        await OrganizationService(session).change_member_role(
+            organization_id=organization["id"],
+            actor_role=OrganizationRole.admin,
+            user_id=member.id,
+            role=OrganizationRole.owner,
+        )
+
+    response = await client.delete(f"/api/v1/organizations/members/{member.id}", headers=org_headers)
+    assert response.status_code == 204
+    response = await client.delete(f"/api/v1/organizations/members/{member.id}", headers=org_headers)
+    assert response.status_code == 404
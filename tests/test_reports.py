@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.contact import Contact
+from app.models.deal import DealStatus
+from app.models.organization import Organization
+from app.models.organization_member import OrganizationRole
+from app.models.report_job import ReportKind, ReportStatus
+from app.models.user import User
+from app.services.deals import DealService
+from app.services.exceptions import ConflictError, ServiceError
+from app.services.reports import ReportJobService, ReportRunner
+
+
+@pytest.mark.asyncio
+async def test_report_jobs_run_in_pool_and_deduplicate(session: AsyncSession):
+    owner = User(email="reports-owner@example.com", hashed_password="hashed", name="Owner")
+    seller = User(email="reports-seller@example.com", hashed_password="hashed", name="Seller")
+    org = Organization(name="Reports Org")
+    contacts = [
+        Contact(organization=org, owner=owner, name=f"Contact {index}", email=None, phone=None)
+        for index in range(3)
+    ]
+    session.add_all([owner, seller, org, *contacts])
+    await session.commit()
+
+    deals = DealService(session)
+    for contact, deal_owner, amount, status in (
+        (contacts[0], owner, 100, DealStatus.won),
+        (contacts[0], owner, 50, DealStatus.won),
+        (contacts[1], seller, 500, DealStatus.won),
+        (contacts[1], seller, 70, DealStatus.lost),
+        (contacts[2], seller, 30, None),
+    ):
+        deal = await deals.create_deal(
+            organization_id=org.id,
+            contact_id=contact.id,
+            owner_id=deal_owner.id,
+            actor_id=owner.id,
+            role=OrganizationRole.owner,
+            title=f"Deal {amount}",
+            amount=Decimal(amount),
+            currency="USD",
+        )
+        if status is not None:
+            await deals.update_deal(
+                deal_id=deal.id,
+                organization_id=org.id,
+                actor_id=owner.id,
+                role=OrganizationRole.owner,
+                data={"status": status},
+            )
+
+    # пачки по две строки: частичные итоги из нескольких процессов должны сложиться
+    runner = ReportRunner(executor="process", max_workers=2, batch_size=2)
+    service = ReportJobService(session, runner=runner)
+    try:
+        job, created = await service.submit(
+            organization_id=org.id, user_id=owner.id, kind=ReportKind.cohort_conversion, params={}
+        )
+        duplicate, duplicate_created = await service.submit(
+            organization_id=org.id, user_id=seller.id, kind=ReportKind.cohort_conversion, params={"months": 12}
+        )
+        assert created and not duplicate_created
+        assert duplicate.id == job.id
+        with pytest.raises(ConflictError):
+            await service.result(organization_id=org.id, job_id=job.id)
+        # in-memory SQLite отдаёт всем сессиям одно соединение: закрытие сессии одной задачи
+        # откатило бы незакоммиченное завершение другой, поэтому отчёты строятся по очереди
+        await runner.join()
+
+        leaderboard, _ = await service.submit(
+            organization_id=org.id, user_id=owner.id, kind=ReportKind.owner_leaderboard, params={}
+        )
+        await runner.join()
+    finally:
+        runner.shutdown()
+
+    done = await service.result(organization_id=org.id, job_id=job.id)
+    assert done.status == ReportStatus.done
+    [cohort] = done.result["cohorts"]
+    assert cohort["cohort"] == datetime.now(timezone.utc).strftime("%Y-%m")
+    assert (cohort["contacts"], cohort["converted"], cohort["won_amount"]) == (3, 2, 650.0)
+    assert cohort["converted_by_month"][0] == 2
+
+    owners = (await service.result(organization_id=org.id, job_id=leaderboard.id)).result["owners"]
+    assert [(row["owner_id"], row["won"], row["lost"], row["won_amount"]) for row in owners] == [
+        (seller.id, 1, 1, 500.0),
+        (owner.id, 2, 0, 150.0),
+    ]
+    assert owners[0]["win_rate"] == 0.5
+
+    # готовый и не истёкший результат переиспользуется без нового расчёта
+    again, again_created = await service.submit(
+        organization_id=org.id, user_id=owner.id, kind=ReportKind.cohort_conversion, params={"months": 12}
+    )
+    assert again.id == job.id and not again_created
+
+    with pytest.raises(ServiceError):
+        await service.submit(
+            organization_id=org.id, user_id=owner.id, kind=ReportKind.year_over_year, params={"year": "soon"}
+        )
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+
+from app.core.security import TokenError, create_token, decode_token, verified_token_cache
+
+
+def test_verified_token_cache_keeps_type_check_and_expiry():
+    token = create_token("7", expires_delta=timedelta(minutes=5), token_type="refresh")
+    hits = verified_token_cache.stats().hits
+
+    assert decode_token(token, expected_type="refresh")["sub"] == "7"
+    with pytest.raises(TokenError):
+        decode_token(token, expected_type="access")
+    assert verified_token_cache.stats().hits == hits + 1
+
+    expired = create_token("7", expires_delta=timedelta(seconds=-1), token_type="access")
+    with pytest.raises(TokenError):
+        decode_token(expired)
+    with pytest.raises(TokenError):
+        decode_token(expired)
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.quantiles import LogHistogram
+from app.core.sketches import HyperLogLog
+from app.models.contact import Contact
+from app.models.organization import Organization
+from app.models.organization_member import OrganizationRole
+from app.models.user import User
+from app.repositories.analytics_sketch import AnalyticsSketchRepository
+from app.services.activities import ActivityService
+from app.services.deals import DealService
+from app.services.sketches import SketchAnalyticsService
+
+
+def test_hyperloglog_merges_within_error_bound():
+    first, second = HyperLogLog(), HyperLogLog()
+    for contact_id in range(30_000):
+        first.add(contact_id)
+    for contact_id in range(20_000, 50_000):
+        second.add(contact_id)
+    first.merge(HyperLogLog.from_bytes(second.to_bytes()))
+    assert first.count() == pytest.approx(50_000, rel=3 * first.relative_error)
+
+
+def test_log_histogram_round_trip_and_removal():
+    histogram = LogHistogram(1.02)
+    for value in range(1, 1001):
+        histogram.add(value)
+    histogram.add(1000, -1)
+    restored = LogHistogram.from_bytes(histogram.to_bytes())
+    assert len(restored) == 999
+    assert restored.quantile(0.5) == pytest.approx(500, rel=restored.relative_error)
+
+
+def test_log_histogram_keeps_zero_and_fractions_apart():
+    histogram = LogHistogram(1.02)
+    for value in (0, 0.5, 1, 100):
+        histogram.add(value)
+    restored = LogHistogram.from_bytes(histogram.to_bytes())
+    assert restored.quantile(0) == 0.0
+    assert restored.quantile(1 / 3) == pytest.approx(0.5, rel=restored.relative_error)
+    assert restored.quantile(2 / 3) == pytest.approx(1, rel=restored.relative_error)
+    assert restored.quantile(1) == pytest.approx(100, rel=restored.relative_error)
+
+
+@pytest.mark.asyncio
+async def test_sketches_follow_writes_and_rebuild(session: AsyncSession):
+    owner = User(email="sketches@example.com", hashed_password="hashed", name="Owner")
+    org = Organization(name="Sketches Org")
+    contacts = [
+        Contact(organization=org, owner=owner, name=f"Contact {index}", email=None, phone=None)
+        for index in range(3)
+    ]
+    session.add_all([owner, org, *contacts])
+    await session.commit()
+
+    deals = DealService(session)
+    created = []
+    for index, amount in enumerate((100, 200, 300, 400)):
+        created.append(
+            await deals.create_deal(
+                organization_id=org.id,
+                contact_id=contacts[index % 2].id,
+                owner_id=owner.id,
+                actor_id=owner.id,
+                role=OrganizationRole.owner,
+                title=f"Deal {amount}",
+                amount=Decimal(amount),
+                currency="USD",
+            )
+        )
+    await deals.update_deal(
+        deal_id=created[0].id,
+        organization_id=org.id,
+        actor_id=owner.id,
+        role=OrganizationRole.owner,
+        data={"amount": Decimal(1000)},
+    )
+    third_contact_deal = await deals.create_deal(
+        organization_id=org.id,
+        contact_id=contacts[2].id,
+        owner_id=owner.id,
+        actor_id=owner.id,
+        role=OrganizationRole.owner,
+        title="Deal 500",
+        amount=Decimal(500),
+        currency="USD",
+    )
+    await ActivityService(session).add_comment(
+        deal_id=third_contact_deal.id,
+        organization_id=org.id,
+        author_id=owner.id,
+        payload={"text": "Созвонились"},
+    )
+
+    service = SketchAnalyticsService(session)
+    active = await service.active_contacts(org.id)
+    assert active.total == 3
+    assert active.months[-1].month == datetime.now(timezone.utc).date().replace(day=1)
+
+    quantiles = await service.amount_quantiles(org.id, quantiles=[0, 0.5, 1])
+    assert quantiles.deals == 5
+    assert quantiles.quantiles["p0"] == pytest.approx(200, rel=quantiles.relative_error)
+    assert quantiles.quantiles["p50"] == pytest.approx(400, rel=quantiles.relative_error)
+    assert quantiles.quantiles["p100"] == pytest.approx(1000, rel=quantiles.relative_error)
+
+    # записи только добавляют наблюдения; свёртка не меняет ответа
+    repo = AnalyticsSketchRepository(session)
+    assert await repo.fold(org.id) > 0
+    await session.commit()
+    assert await repo.fold(org.id) == 0
+    assert await service.amount_quantiles(org.id, quantiles=[0, 0.5, 1]) == quantiles
+    assert (await service.active_contacts(org.id)).total == 3
+
+    await repo.rebuild(org.id)
+    await session.commit()
+    assert await service.amount_quantiles(org.id, quantiles=[0, 0.5, 1]) == quantiles
+    assert (await service.active_contacts(org.id)).total == 3